@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+# Kept after the preferred hasher so existing hashes still verify. A user whose hash was made
+# by any of them is rehashed with the preferred hasher on their next login.
+LEGACY_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with the costs of the PASSWORD_HASH_COSTS['argon2'] setting."""
+
+    def __init__(self):
+        costs = settings.PASSWORD_HASH_COSTS['argon2']
+        self.time_cost = costs['time_cost']
+        self.memory_cost = costs['memory_cost']
+        self.parallelism = costs['parallelism']
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt with the costs of the PASSWORD_HASH_COSTS['scrypt'] setting."""
+
+    def __init__(self):
+        costs = settings.PASSWORD_HASH_COSTS['scrypt']
+        self.work_factor = costs['work_factor']
+        self.block_size = costs['block_size']
+        self.parallelism = costs['parallelism']
+        # Enough memory for the configured costs, which OpenSSL's 32 MiB default may not be
+        self.maxmem = 256 * self.work_factor * self.block_size
+
+
+def argon2_available() -> bool:
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def password_hashers(policy: str, use_argon2: bool = None) -> list[str]:
+    """
+    Returns the PASSWORD_HASHERS of a hasher policy.
+
+    `production` prefers Argon2 (when argon2-cffi is installed, scrypt otherwise) with tuned
+    costs. `fast` prefers MD5, which is only acceptable for test and benchmark databases.
+    Both can still verify the hashes of every other hasher, so a policy change upgrades
+    users on their next login.
+
+    Args:
+        policy (str): `production` or `fast`.
+        use_argon2 (bool): Whether Argon2 is preferred over scrypt; detected when not given.
+
+    Returns:
+        list[str]: The hasher paths, the preferred one first.
+
+    Raises:
+        ValueError: If the policy is unknown.
+    """
+    if use_argon2 is None:
+        use_argon2 = argon2_available()
+    tuned = ['accounts.hashers.TunedScryptPasswordHasher']
+    if use_argon2:
+        tuned.insert(0, 'accounts.hashers.TunedArgon2PasswordHasher')
+
+    if policy == 'production':
+        return tuned + LEGACY_HASHERS
+    if policy == 'fast':
+        return ['django.contrib.auth.hashers.MD5PasswordHasher'] + tuned + LEGACY_HASHERS
+    raise ValueError(f'Unknown password hasher policy: {policy}')
@@ -0,0 +1,58 @@
+import csv
+import json
+
+FORMATS = ('csv', 'jsonl')
+
+
+class InvalidRow(ValueError):
+    """Raised for a row that cannot be imported; the message names its line."""
+
+
+def detect_format(path: str, format_name: str = None) -> str:
+    """Returns the explicit format, or the one matching the file extension."""
+    if format_name:
+        return format_name
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    raise ValueError(f'Cannot tell the format of {path}; pass --format.')
+
+
+def read_rows(file, format_name: str):
+    """
+    Yields the rows of a CSV or JSON Lines file as (line number, dictionary) pairs, one at
+    a time. Raises InvalidRow, naming the line, for a JSON line that is not a valid object.
+    """
+    if format_name == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise InvalidRow(f'Line {number}: invalid JSON ({exc}).')
+            if not isinstance(row, dict):
+                raise InvalidRow(f'Line {number}: expected a JSON object.')
+            yield number, row
+
+
+class RowWriter:
+    """Writes dictionaries with the given columns as CSV or JSON Lines."""
+
+    def __init__(self, file, format_name: str, columns):
+        self.file = file
+        self.columns = columns
+        self.csv = csv.DictWriter(file, fieldnames=columns) if format_name == 'csv' else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, row: dict):
+        if self.csv:
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + '\n')
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ._formats import FORMATS, RowWriter, detect_format
+
+User = get_user_model()
+
+# Export columns, and the field each is read from
+COLUMNS = {
+    'name': 'name',
+    'email': 'email',
+    'password_hash': 'password',
+    'headline': 'profile__headline',
+    'bio': 'profile__bio',
+    'education': 'profile__education',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports users and their profiles to a CSV or JSON Lines file (or stdout with "-"), in the '
+        'format read by import_users. Users are streamed in chunks, so memory use stays flat.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to write, or "-" for stdout.')
+        parser.add_argument('--format', choices=FORMATS, help='File format; detected from the extension by default.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Users fetched per database round trip.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            format_name = detect_format(path, options['format'] or ('jsonl' if path == '-' else None))
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        rows = (
+            User.objects.order_by('id')
+            .values_list(*COLUMNS.values())
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        file = self.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        exported = 0
+        started = time.perf_counter()
+        try:
+            writer = RowWriter(file, format_name, list(COLUMNS))
+            for values in rows:
+                writer.write({column: value or '' for column, value in zip(COLUMNS, values)})
+                exported += 1
+                if exported % options['chunk_size'] == 0:
+                    self.stderr.write(f'Exported {exported} users.')
+        finally:
+            if file is not self.stdout:
+                file.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {exported} users in {elapsed:.1f}s ({exported / elapsed if elapsed else 0:.0f} rows/s).'
+        ))
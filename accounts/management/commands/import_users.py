@@ -0,0 +1,121 @@
+import itertools
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from accounts.services import AccountService
+from ._formats import FORMATS, InvalidRow, detect_format, read_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports users, with their profiles, from a CSV or JSON Lines file (or stdin with "-"). '
+        'Rows have `name` and `email`, a `password` or a `password_hash`, and optionally '
+        '`headline`, `bio` and `education`. The file is streamed in batches; plain passwords '
+        'are hashed in a process pool and each batch is written with bulk inserts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or "-" for stdin.')
+        parser.add_argument('--format', choices=FORMATS, help='File format; detected from the extension by default.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users hashed and inserted per batch.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Hashing processes; one per CPU by default, 0 to hash in this process.')
+        parser.add_argument('--skip-existing', action='store_true',
+                            help='Skip rows whose email is already taken, or repeated, instead of failing.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            format_name = detect_format(path, options['format'] or ('jsonl' if path == '-' else None))
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        try:
+            file = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc.strerror}.')
+        pool = None
+        imported = skipped = 0
+        started = time.perf_counter()
+        try:
+            pool = None if options['workers'] == 0 else ProcessPoolExecutor(options['workers'], initializer=django.setup)
+            rows = self.validate(read_rows(file, format_name))
+            while batch := list(itertools.islice(rows, options['batch_size'])):
+                if options['skip_existing']:
+                    skipped += len(batch)
+                    batch = self.without_taken_emails(batch)
+                    skipped -= len(batch)
+                self.hash_passwords(batch, pool)
+                try:
+                    AccountService.create_accounts(batch, batch_size=options['batch_size'])
+                except IntegrityError as exc:
+                    raise CommandError(
+                        f'Batch after {imported} imported users failed ({exc}); '
+                        f'use --skip-existing for taken or repeated emails.'
+                    )
+                imported += len(batch)
+                elapsed = time.perf_counter() - started
+                self.stderr.write(f'Imported {imported} users ({imported / elapsed:.0f} rows/s).')
+        except InvalidRow as exc:
+            raise CommandError(f'{exc} {imported} users were imported before it.')
+        finally:
+            if file is not sys.stdin:
+                file.close()
+            if pool:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} users and skipped {skipped} with taken or repeated emails in {elapsed:.1f}s '
+            f'({imported / elapsed if elapsed else 0:.0f} rows/s).'
+        ))
+
+    @staticmethod
+    def without_taken_emails(batch) -> list:
+        """
+        Returns the rows of a batch whose email is not taken yet, keeping only the first row
+        of an email repeated within the batch. Rows repeating an email of an earlier batch
+        find it taken.
+        """
+        taken = set(User.objects.filter(email__in=[row['email'] for row in batch]).values_list('email', flat=True))
+        rows = []
+        for row in batch:
+            if row['email'] not in taken:
+                taken.add(row['email'])
+                rows.append(row)
+        return rows
+
+    @staticmethod
+    def validate(numbered_rows):
+        """
+        Yields the rows that have a name, an email and a password or password hash.
+        Raises InvalidRow at the first row that does not.
+        """
+        for number, row in numbered_rows:
+            missing = [field for field in ('name', 'email') if not row.get(field)]
+            if not row.get('password') and not row.get('password_hash'):
+                missing.append('password or password_hash')
+            if missing:
+                raise InvalidRow(f'Line {number}: missing {", ".join(missing)}.')
+            yield row
+
+    @staticmethod
+    def hash_passwords(batch, pool):
+        """Sets the `password_hash` of the rows that only have a plain password."""
+        pending = [row for row in batch if not row.get('password_hash')]
+        passwords = [row['password'] for row in pending]
+        if pool:
+            hashes = pool.map(make_password, passwords, chunksize=max(1, len(passwords) // 32))
+        else:
+            hashes = map(make_password, passwords)
+        for row, password_hash in zip(pending, hashes):
+            row['password_hash'] = password_hash
@@ -1,8 +1,9 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from .messages import message_handler
 from django.http import HttpResponse
-from profiles.services import ProfileService
+from profiles.models import Profile
 
 User = get_user_model()
 
@@ -11,7 +12,10 @@ class AccountService:
     @staticmethod
     def create_account(name: str, email: str, password: str) -> bool:
         """
-        Creates a new user account in the system's database.
+        Creates a new user account in the system's database, with its default profile.
+
+        The password is hashed before the transaction starts, and the user and profile are
+        then inserted in a single transaction.
 
         Args:
             name (str): The user's name.
@@ -19,17 +23,57 @@ class AccountService:
             password (str): The user's password.
 
         Returns:
-            User: The created User object.
+            bool: True once the account is created.
         """
-        user = User.objects.create(
-            name=name,
-            email=email,
-            password=make_password(password)
-        )
-        user.save()
-        ProfileService.create_default_profile(user)
+        password_hash = make_password(password)
+        with transaction.atomic():
+            user = User.objects.create(name=name, email=email, password=password_hash)
+            Profile.objects.create(user=user)
         return True
 
+    @staticmethod
+    def create_accounts(accounts, batch_size: int = 1000) -> list:
+        """
+        Creates many user accounts at once, with their profiles, using bulk inserts
+        in a single transaction.
+
+        Args:
+            accounts: Dictionaries with the `name` and `email` of each user, and either its
+                `password`, or its `password_hash` when it was hashed beforehand. The optional
+                `headline`, `bio` and `education` fill the profile.
+            batch_size (int): The number of rows inserted per statement.
+
+        Returns:
+            list[User]: The created users.
+
+        Raises:
+            IntegrityError: If an email is already taken; no account is created then.
+        """
+        accounts = list(accounts)
+        users = [
+            User(
+                name=account['name'],
+                email=account['email'],
+                password=account.get('password_hash') or make_password(account['password'])
+            )
+            for account in accounts
+        ]
+        with transaction.atomic():
+            users = User.objects.bulk_create(users, batch_size=batch_size)
+            Profile.objects.bulk_create(
+                [
+                    Profile(
+                        user=user,
+                        headline=account.get('headline') or '',
+                        bio=account.get('bio') or '',
+                        education=account.get('education') or ''
+                    )
+                    for user, account in zip(users, accounts)
+                ],
+                batch_size=batch_size
+            )
+        return users
+
     @staticmethod
     def delete_account(user):
         """
@@ -57,7 +101,7 @@ class AccountService:
             HttpResponse: A success message after password change.
         """
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
         return message_handler.get('password_changed', False)
 
     @staticmethod
@@ -0,0 +1,50 @@
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from accounts.models import User
+from accounts.services import AccountService
+from profiles.models import Profile
+
+
+class CreateAccountTests(TestCase):
+    def test_create_account_inserts_user_and_profile_once(self):
+        """Test that signup inserts the user and profile, with no other writes."""
+        with CaptureQueriesContext(connection) as context:
+            AccountService.create_account('Test User', 'testuser@ws.com', 'passwordTest!')
+
+        writes = [query['sql'].split()[0] for query in context.captured_queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(writes, ['INSERT', 'INSERT'])
+        user = User.objects.get(email='testuser@ws.com')
+        self.assertTrue(user.check_password('passwordTest!'))
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+    def test_create_account_with_taken_email(self):
+        """Test that a taken email raises and creates no account."""
+        User.objects.create_user(email='taken@ws.com', password='passwordTest!', name='Taken')
+        with self.assertRaises(IntegrityError):
+            AccountService.create_account('Test User', 'taken@ws.com', 'passwordTest!')
+        self.assertEqual(User.objects.filter(email='taken@ws.com').count(), 1)
+
+
+class CreateAccountsTests(TestCase):
+    def test_bulk_creates_users_and_profiles(self):
+        """Test that accounts are created with a constant number of inserts, hashing or keeping hashes."""
+        accounts = [{'name': f'User {i}', 'email': f'user{i}@ws.com', 'password': 'passwordTest!'} for i in range(5)]
+        accounts.append({'name': 'Hashed', 'email': 'hashed@ws.com', 'password_hash': make_password('hashedTest!')})
+
+        with self.assertNumQueries(4):  # savepoint, users, profiles, release
+            users = AccountService.create_accounts(accounts, batch_size=10)
+
+        self.assertEqual(len(users), 6)
+        self.assertEqual(Profile.objects.filter(user__in=users).count(), 6)
+        self.assertTrue(User.objects.get(email='user3@ws.com').check_password('passwordTest!'))
+        self.assertTrue(User.objects.get(email='hashed@ws.com').check_password('hashedTest!'))
+
+    def test_duplicate_email_creates_nothing(self):
+        """Test that one taken email rolls back the whole batch."""
+        User.objects.create_user(email='user1@ws.com', password='passwordTest!', name='Taken')
+        accounts = [{'name': f'User {i}', 'email': f'user{i}@ws.com', 'password': 'passwordTest!'} for i in range(3)]
+        with self.assertRaises(IntegrityError):
+            AccountService.create_accounts(accounts)
+        self.assertEqual(User.objects.count(), 1)
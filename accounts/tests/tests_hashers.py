@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase
+from django.urls import reverse
+from accounts.hashers import password_hashers
+
+SCRYPT_ONLY = ['accounts.hashers.TunedScryptPasswordHasher']
+
+
+class PasswordHasherPolicyTests(TestCase):
+    def setUp(self):
+        """Set up a test user whose password was hashed by Django's default PBKDF2 hasher."""
+        self.User = get_user_model()
+        self.password = 'passwordTest!'
+        self.user = self.User.objects.create(
+            name='Test User',
+            email='testuser@ws.com',
+            password=make_password(self.password, hasher='pbkdf2_sha256')
+        )
+
+    def login(self):
+        self.client.post(reverse('login_api'), {'email': self.user.email, 'password': self.password})
+        self.client.logout()
+        self.user.refresh_from_db()
+
+    def test_policies(self):
+        """Test that each policy prefers its hasher and still verifies the others."""
+        production = password_hashers('production', use_argon2=True)
+        self.assertEqual(production[:2], [
+            'accounts.hashers.TunedArgon2PasswordHasher', 'accounts.hashers.TunedScryptPasswordHasher'
+        ])
+        self.assertEqual(password_hashers('production', use_argon2=False)[0], SCRYPT_ONLY[0])
+        self.assertEqual(password_hashers('fast', use_argon2=True)[0], 'django.contrib.auth.hashers.MD5PasswordHasher')
+        self.assertIn('django.contrib.auth.hashers.PBKDF2PasswordHasher', production)
+        with self.assertRaises(ValueError):
+            password_hashers('plaintext')
+
+    def test_login_rehashes_with_preferred_hasher(self):
+        """Test that logging in upgrades a PBKDF2 hash to the preferred hasher."""
+        self.login()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, 'md5')
+
+    def test_login_rehashes_when_costs_change(self):
+        """Test that logging in rehashes a password made with outdated scrypt costs."""
+        costs = {'work_factor': 2 ** 10, 'block_size': 8, 'parallelism': 1}
+        with self.settings(PASSWORD_HASHERS=SCRYPT_ONLY, PASSWORD_HASH_COSTS={'scrypt': costs}):
+            self.user.set_password(self.password)
+            self.user.save()
+        self.assertIn('$1024$', self.user.password)
+
+        with self.settings(PASSWORD_HASHERS=SCRYPT_ONLY, PASSWORD_HASH_COSTS={'scrypt': {**costs, 'work_factor': 2 ** 11}}):
+            self.login()
+        self.assertIn('$2048$', self.user.password)
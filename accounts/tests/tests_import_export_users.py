@@ -0,0 +1,110 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from accounts.models import User
+from accounts.services import AccountService
+from profiles.models import Profile
+
+
+class ImportExportUsersTests(TestCase):
+    def setUp(self):
+        """Set up a temporary directory for the exported and imported files."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_jsonl(self, name, rows):
+        with open(self.path(name), 'w') as file:
+            file.writelines(json.dumps(row) + '\n' for row in rows)
+        return self.path(name)
+
+    def import_users(self, path, **options):
+        call_command('import_users', path, stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_import_hashes_in_process_pool(self):
+        """Test that plain passwords are hashed by worker processes and profiles are filled."""
+        rows = [{'name': f'User {i}', 'email': f'user{i}@ws.com', 'password': f'password{i}!', 'bio': 'Hi'}
+                for i in range(5)]
+        self.import_users(self.write_jsonl('users.jsonl', rows), workers=2, batch_size=2)
+
+        self.assertEqual(User.objects.count(), 5)
+        self.assertTrue(User.objects.get(email='user4@ws.com').check_password('password4!'))
+        self.assertEqual(Profile.objects.filter(bio='Hi').count(), 5)
+
+    def test_export_then_import_round_trip(self):
+        """Test that an export imports back with the same hashes and profiles, in both formats."""
+        AccountService.create_accounts([
+            {'name': f'User {i}', 'email': f'user{i}@ws.com', 'password': 'passwordTest!', 'headline': f'H{i}'}
+            for i in range(3)
+        ])
+        originals = dict(User.objects.values_list('email', 'password'))
+
+        for name in ('users.csv', 'users.jsonl'):
+            call_command('export_users', self.path(name), chunk_size=2, stderr=StringIO())
+            User.objects.all().delete()
+            self.import_users(self.path(name), workers=0)
+            self.assertEqual(dict(User.objects.values_list('email', 'password')), originals)
+            self.assertEqual(Profile.objects.get(user__email='user2@ws.com').headline, 'H2')
+
+        with open(self.path('users.csv'), newline='') as file:
+            self.assertEqual(next(csv.reader(file)),
+                             ['name', 'email', 'password_hash', 'headline', 'bio', 'education'])
+
+    def test_taken_emails(self):
+        """Test that taken emails fail the import, unless they are skipped."""
+        User.objects.create(name='Taken', email='user0@ws.com', password=make_password('passwordTest!'))
+        path = self.write_jsonl('users.jsonl', [
+            {'name': f'User {i}', 'email': f'user{i}@ws.com', 'password': 'passwordTest!'} for i in range(3)
+        ])
+        with self.assertRaises(CommandError):
+            self.import_users(path, workers=0)
+        self.assertEqual(User.objects.count(), 1)
+
+        self.import_users(path, workers=0, skip_existing=True)
+        self.assertEqual(User.objects.count(), 3)
+
+    def test_repeated_emails(self):
+        """Test that an email repeated within a batch fails the import, unless repeats are skipped."""
+        path = self.write_jsonl('users.jsonl', [
+            {'name': f'User {i}', 'email': f'user{i % 2}@ws.com', 'password': 'passwordTest!'} for i in range(3)
+        ])
+        with self.assertRaises(CommandError):
+            self.import_users(path, workers=0)
+        self.assertEqual(User.objects.count(), 0)
+
+        out = StringIO()
+        call_command('import_users', path, workers=0, skip_existing=True, stdout=out, stderr=StringIO())
+        self.assertEqual(User.objects.get(email='user0@ws.com').name, 'User 0')
+        self.assertEqual(User.objects.count(), 2)
+        self.assertIn('Imported 2 users and skipped 1', out.getvalue())
+
+    def test_missing_file(self):
+        """Test that a missing file fails the import with a command error."""
+        with self.assertRaisesMessage(CommandError, 'Cannot open'):
+            self.import_users(self.path('missing.jsonl'), workers=2)
+
+    def test_invalid_rows(self):
+        """Test that a row without a password, or a malformed line, fails the import naming its line."""
+        rows = [{'name': 'User 0', 'email': 'user0@ws.com', 'password': 'passwordTest!'},
+                {'name': 'User 1', 'email': 'user1@ws.com'}]
+        with self.assertRaisesMessage(CommandError, 'Line 2: missing password or password_hash.'):
+            self.import_users(self.write_jsonl('users.jsonl', rows), workers=0)
+
+        with open(self.path('users.csv'), 'w', newline='') as file:
+            file.write('name,email,password\nUser 0,user0@ws.com,passwordTest!\n,user1@ws.com,passwordTest!\n')
+        with self.assertRaisesMessage(CommandError, 'Line 3: missing name.'):
+            self.import_users(self.path('users.csv'), workers=0)
+
+        with open(self.path('broken.jsonl'), 'w') as file:
+            file.write('{"name": "User 0"\n')
+        with self.assertRaisesMessage(CommandError, 'Line 1: invalid JSON'):
+            self.import_users(self.path('broken.jsonl'), workers=0)
+        self.assertEqual(User.objects.count(), 0)
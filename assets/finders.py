@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.utils import get_files
+from django.core.files.storage import FileSystemStorage
+
+
+class BundleFinder(BaseFinder):
+    """
+    Finds the bundles written by `build_assets` in ASSETS_BUILD_DIR, which may not exist
+    before the first build (unlike a STATICFILES_DIRS entry, which Django checks).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=settings.ASSETS_BUILD_DIR)
+
+    def find(self, path, find_all=False, **kwargs):
+        if self.storage.exists(path):
+            match = self.storage.path(path)
+            return [match] if find_all else match
+        return []
+
+    def list(self, ignore_patterns):
+        if self.storage.exists(''):
+            for path in get_files(self.storage, ignore_patterns):
+                yield path, self.storage
@@ -0,0 +1,67 @@
+import re
+
+# rcssmin and rjsmin minify harder when installed. The fallbacks below only drop comments
+# and collapse whitespace, where that cannot change what the code means.
+try:
+    from rcssmin import cssmin as _cssmin
+except ImportError:
+    _cssmin = None
+try:
+    from rjsmin import jsmin as _jsmin
+except ImportError:
+    _jsmin = None
+
+# Strings are kept; a run of whitespace and comments (except /*! ones) is a gap between tokens
+CSS_TOKENS = re.compile(r'''
+    (?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+    | (?P<gap>(?:\s|/\*(?!!).*?\*/)+)
+''', re.VERBOSE | re.DOTALL)
+
+# Comments taking whole lines; nothing else in a script can start a line with // or /*
+JS_COMMENT_LINES = re.compile(r'^[ \t]*(?://.*|/\*(?!!)(?:[^*]|\*(?!/))*\*/[ \t]*)$', re.MULTILINE)
+
+# Template literals, and strings continued with a backslash, can span lines whose whitespace counts
+JS_MULTILINE_STRING = re.compile(r'`|\\\r?\n')
+
+
+def minify_css(css: str) -> str:
+    """
+    Minifies a stylesheet: drops comments (except /*! ones) and collapses whitespace into
+    single spaces. Strings are kept as they are.
+
+    Args:
+        css (str): The stylesheet.
+
+    Returns:
+        str: The minified stylesheet.
+    """
+    if _cssmin is not None:
+        return _cssmin(css, keep_bang_comments=True)
+
+    def replace(match):
+        if match.lastgroup == 'string':
+            return match.group()
+        # A comment between two tokens does not separate them, whitespace does
+        return ' ' if any(char.isspace() for char in match.group()) else ''
+    return CSS_TOKENS.sub(replace, css).strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Minifies a script: drops the comments (except /*! ones) taking whole lines, indentation
+    and blank lines. Line breaks are kept, so automatic semicolon insertion is unchanged, and
+    scripts with template literals or line continuations are left as they are.
+
+    Args:
+        js (str): The script.
+
+    Returns:
+        str: The minified script.
+    """
+    if _jsmin is not None:
+        return _jsmin(js, keep_bang_comments=True)
+    if JS_MULTILINE_STRING.search(js):
+        return js
+
+    lines = (line.strip() for line in JS_COMMENT_LINES.sub('', js).splitlines())
+    return '\n'.join(line for line in lines if line)
@@ -0,0 +1,25 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from assets.builder import bundle_path
+
+register = template.Library()
+
+TAGS = {
+    'css': '<link rel="stylesheet" href="{}">',
+    'js': '<script src="{}" defer></script>',
+}
+
+
+@register.simple_tag
+def bundle(name, kind):
+    """
+    Links a bundle of the ASSET_BUNDLES setting. When ASSETS_BUNDLED is off (in development)
+    its source files are linked one by one instead, so they need no build step.
+
+    Usage: {% bundle 'home' 'css' %}
+    """
+    paths = [bundle_path(name, kind)] if settings.ASSETS_BUNDLED else settings.ASSET_BUNDLES[name][kind]
+    return format_html_join('\n', TAGS[kind], ((static(path),) for path in paths))
@@ -0,0 +1,163 @@
+import re
+import shutil
+import subprocess
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from .builder import build_bundle, find_source
+from .minify import minify_css, minify_js
+
+
+class MinifyTests(SimpleTestCase):
+    def test_minify_css(self):
+        """Test that comments go and whitespace collapses, while strings and descendant selectors stay."""
+        css = '/* header */\na :hover {\n    color: red;\n    content: "a  b";\n}\n/*! license */\n'
+
+        with mock.patch('assets.minify._cssmin', None):
+            self.assertEqual(minify_css(css), 'a :hover { color: red; content: "a  b"; } /*! license */')
+
+    def test_minify_js(self):
+        """Test that comments and indentation go, while strings, regexes and line breaks stay."""
+        js = '// counter\nvar url = "http://a//b";\n\nfunction f(x) {\n    /* twice */\n    return x.replace(/\\/\\//g, "/");\n}\n'
+
+        with mock.patch('assets.minify._jsmin', None):
+            minified = minify_js(js)
+
+        self.assertNotIn('counter', minified)
+        self.assertNotIn('twice', minified)
+        self.assertIn('"http://a//b"', minified)
+        self.assertIn('/\\/\\//g', minified)
+        self.assertNotIn('\n\n', minified)
+        self.assertNotIn('    ', minified)
+
+
+    def test_minify_js_keeps_multiline_strings(self):
+        """Test that a script whose strings may span lines is left as it is."""
+        js = 'var html = `\n    <p>\n`;\n// done\n'
+
+        with mock.patch('assets.minify._jsmin', None):
+            self.assertEqual(minify_js(js), js)
+
+
+@mock.patch('assets.minify._cssmin', None)
+@mock.patch('assets.minify._jsmin', None)
+class MinifyStaticFilesTests(SimpleTestCase):
+    """The fallback minifiers on the project's own stylesheets and scripts."""
+
+    @staticmethod
+    def sources(kind):
+        paths = {path for bundle in settings.ASSET_BUNDLES.values() for path in bundle.get(kind, [])}
+        return {path: find_source(path).read_text(encoding='utf-8') for path in sorted(paths)}
+
+    def test_stylesheets(self):
+        """Test that only comments and whitespace are removed from the stylesheets."""
+        for path, css in self.sources('css').items():
+            with self.subTest(path):
+                minified = minify_css(css)
+                self.assertLess(len(minified), len(css))
+                self.assertNotIn('\n', minified)
+                without_comments = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+                self.assertEqual(''.join(minified.split()), ''.join(without_comments.split()))
+
+    def test_scripts(self):
+        """Test that only comment lines and whitespace are removed from the scripts, line by line."""
+        for path, js in self.sources('js').items():
+            with self.subTest(path):
+                code_lines = [line.strip() for line in js.splitlines()
+                              if line.strip() and not line.strip().startswith('//')]
+                self.assertEqual(minify_js(js).splitlines(), code_lines)
+
+    @skipUnless(shutil.which('node'), 'Node.js checks the syntax of the scripts')
+    def test_script_bundles_parse(self):
+        """Test that every minified script bundle is still valid JavaScript."""
+        for name, bundle in settings.ASSET_BUNDLES.items():
+            with self.subTest(name), tempfile.NamedTemporaryFile('w', suffix='.js') as file:
+                file.write(build_bundle(name, 'js', bundle['js']))
+                file.flush()
+                result = subprocess.run(['node', '--check', file.name], capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class BuildBundleTests(SimpleTestCase):
+    def setUp(self):
+        """Point the static files finders to a temporary directory of sources."""
+        self.static_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.static_dir)
+        (self.static_dir / 'css').mkdir()
+        (self.static_dir / 'css' / 'a.css').write_text('body { background: url("../img/bg.png"); }\n')
+        (self.static_dir / 'css' / 'b.css').write_text("@import url('https://fonts.example/font.css');\np { margin: 0; }\n")
+        (self.static_dir / 'js').mkdir()
+        (self.static_dir / 'js' / 'a.js').write_text('var a = 1\n')
+        (self.static_dir / 'js' / 'b.js').write_text('(function () {})();\n')
+        settings_override = override_settings(
+            STATICFILES_DIRS=[self.static_dir],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_css_bundle(self):
+        """Test that @import rules move to the top and relative urls are rebased to the bundle."""
+        bundle = build_bundle('page', 'css', ['css/a.css', 'css/b.css'], minify=False)
+
+        self.assertTrue(bundle.startswith("@import url('https://fonts.example/font.css');"))
+        self.assertIn('url("../img/bg.png")', bundle)
+        self.assertEqual(bundle.count('@import'), 1)
+
+    def test_js_bundle_separates_sources(self):
+        """Test that a script without a trailing semicolon cannot merge into the next one."""
+        bundle = build_bundle('page', 'js', ['js/a.js', 'js/b.js'])
+
+        self.assertRegex(bundle, r'var a = 1\s*;\s*\(function')
+
+    def test_missing_source(self):
+        """Test that a missing source file raises."""
+        with self.assertRaises(FileNotFoundError):
+            build_bundle('page', 'css', ['css/missing.css'])
+
+    def test_build_assets_command(self):
+        """Test that the command writes every bundle to ASSETS_BUILD_DIR."""
+        build_dir = self.static_dir / 'build'
+        bundles = {'page': {'css': ['css/a.css', 'css/b.css'], 'js': ['js/a.js', 'js/b.js']}}
+        with override_settings(ASSET_BUNDLES=bundles, ASSETS_BUILD_DIR=build_dir):
+            call_command('build_assets', stdout=StringIO())
+
+        self.assertTrue((build_dir / 'bundles' / 'page.css').is_file())
+        self.assertTrue((build_dir / 'bundles' / 'page.js').is_file())
+
+    def test_build_assets_command_missing_source(self):
+        """Test that the command fails when a source file is missing."""
+        bundles = {'page': {'css': ['css/missing.css']}}
+        with override_settings(ASSET_BUNDLES=bundles, ASSETS_BUILD_DIR=self.static_dir / 'build'):
+            with self.assertRaises(CommandError):
+                call_command('build_assets', stdout=StringIO())
+
+
+@override_settings(ASSET_BUNDLES={'page': {'css': ['css/a.css', 'css/b.css'], 'js': ['js/a.js']}})
+class BundleTagTests(SimpleTestCase):
+    template = Template("{% load bundles %}{% bundle 'page' 'css' %}{% bundle 'page' 'js' %}")
+
+    @override_settings(ASSETS_BUNDLED=True)
+    def test_bundled(self):
+        """Test that a bundled page links one file per kind."""
+        html = self.template.render(Context())
+
+        self.assertEqual(html, '<link rel="stylesheet" href="/static/bundles/page.css">'
+                               '<script src="/static/bundles/page.js" defer></script>')
+
+    @override_settings(ASSETS_BUNDLED=False)
+    def test_unbundled(self):
+        """Test that an unbundled page links each source file."""
+        html = self.template.render(Context())
+
+        self.assertIn('href="/static/css/a.css"', html)
+        self.assertIn('href="/static/css/b.css"', html)
+        self.assertIn('<script src="/static/js/a.js" defer></script>', html)
+        self.assertNotIn('bundles/', html)
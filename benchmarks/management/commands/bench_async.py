@@ -0,0 +1,132 @@
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from benchmarks.management.commands.seed_dataset import WORDS
+from posts.models import Post
+from write_and_shine.stats import summarize
+
+User = get_user_model()
+
+# Each scenario's (sync, async) URL names, and how a request is made from a random post id
+SCENARIOS = {
+    'get_posts': ('get_posts', 'aget_posts'),
+    'search_post': ('search_post', 'asearch_post'),
+    'has_user_liked_post': ('has_user_liked_post', 'ahas_user_liked_post'),
+    'like_post': ('like_post', 'alike_post'),
+}
+
+
+def request_args(scenario, url_name, rng, post_ids):
+    """Returns the path and query parameters of one request of a scenario."""
+    if scenario == 'get_posts':
+        return reverse(url_name), None
+    if scenario == 'search_post':
+        return reverse(url_name), {'post_name': rng.choice(WORDS)}
+    return reverse(url_name, args=[rng.choice(post_ids)]), None
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the sync views, served by a thread pool as under WSGI, with their async variants, '
+        'served by concurrent tasks on one event loop as under an ASGI server, at the same '
+        'concurrency. Reports requests per second and latency percentiles. like_post writes to '
+        'the database. Run seed_dataset first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight at once.')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per scenario and path.')
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), dest='scenarios',
+                            help='Scenario to run; can be repeated. All of them by default.')
+        parser.add_argument('--host', default='localhost', help='Host header of the sync requests; must be in ALLOWED_HOSTS.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the requests.')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+
+    def handle(self, *args, **options):
+        post_ids = list(Post.objects.values_list('id', flat=True)[:1000])
+        user = User.objects.filter(profile__isnull=False).first()
+        if not post_ids or user is None:
+            raise CommandError('There is nothing to benchmark; run seed_dataset first.')
+
+        rng = random.Random(options['seed'])
+        concurrency = max(1, options['concurrency'])
+        results = {}
+        for scenario in options['scenarios'] or SCENARIOS:
+            sync_name, async_name = SCENARIOS[scenario]
+            # Both paths send the same requests
+            per_worker = -(-options['requests'] // concurrency)
+            plans = [[request_args(scenario, sync_name, rng, post_ids) for _ in range(per_worker)]
+                     for _ in range(concurrency)]
+            async_plans = [[request_args(scenario, async_name, rng, post_ids) for _ in range(per_worker)]
+                           for _ in range(concurrency)]
+            results[scenario] = {'sync': self.run_sync(plans, user, options['host'])}
+            # AsyncClient always sends the host "testserver"
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                results[scenario]['async'] = asyncio.run(self.run_async(async_plans, user))
+
+        if options['json']:
+            self.stdout.write(json.dumps({'concurrency': concurrency, 'scenarios': results}, indent=2))
+            return
+        for scenario, result in results.items():
+            for path, summary in result.items():
+                self.stdout.write(
+                    f"{scenario:>20} {path:>5}: {summary['per_second']:8.1f} req/s, "
+                    f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, errors {summary['errors']}"
+                )
+
+    @staticmethod
+    def report(latencies, errors, elapsed) -> dict:
+        return {**summarize(latencies), 'per_second': len(latencies) / elapsed if elapsed else 0.0,
+                'errors': errors}
+
+    def run_sync(self, plans, user, host) -> dict:
+        """Sends each plan's requests in order from its own thread, like WSGI worker threads."""
+        def worker(plan):
+            client = Client(HTTP_HOST=host)
+            client.force_login(user)
+            latencies, errors = [], 0
+            try:
+                for path, params in plan:
+                    started = time.perf_counter()
+                    response = client.get(path, params)
+                    latencies.append(time.perf_counter() - started)
+                    errors += response.status_code >= 400
+            finally:
+                connections.close_all()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(plans)) as executor:
+            outcomes = list(executor.map(worker, plans))
+        elapsed = time.perf_counter() - started
+        return self.report([s for latencies, _ in outcomes for s in latencies],
+                           sum(errors for _, errors in outcomes), elapsed)
+
+    async def run_async(self, plans, user) -> dict:
+        """Sends each plan's requests in order from its own task, all on one event loop."""
+        async def worker(plan):
+            client = AsyncClient()
+            await client.aforce_login(user)
+            latencies, errors = [], 0
+            for path, params in plan:
+                started = time.perf_counter()
+                response = await client.get(path, params)
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+            return latencies, errors
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(worker(plan) for plan in plans))
+        elapsed = time.perf_counter() - started
+        return self.report([s for latencies, _ in outcomes for s in latencies],
+                           sum(errors for _, errors in outcomes), elapsed)
@@ -0,0 +1,84 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.hashers import password_hashers
+from write_and_shine.stats import summarize
+
+User = get_user_model()
+
+PASSWORD = 'benchmarkPassword!'
+
+POLICIES = {
+    # Django's default hasher, before the policy existed
+    'pbkdf2': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],
+    'production': password_hashers('production'),
+    'fast': password_hashers('fast'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures signup and login throughput through the accounts endpoints under each password '
+        'hasher policy. The accounts it creates are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Signups and logins per policy.')
+        parser.add_argument('--policy', action='append', choices=list(POLICIES), dest='policies',
+                            help='Policy to measure; can be repeated. All of them by default.')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+
+    def handle(self, *args, **options):
+        results = {}
+        for policy in options['policies'] or POLICIES:
+            with override_settings(PASSWORD_HASHERS=POLICIES[policy]), transaction.atomic():
+                results[policy] = self.measure(options['iterations'], options['host'], policy)
+                transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for policy, result in results.items():
+            self.stdout.write(
+                f"{policy:>10}: signup {result['signup']['per_second']:8.1f}/s "
+                f"(p95 {result['signup']['p95_ms']:.1f} ms), "
+                f"login {result['login']['per_second']:8.1f}/s (p95 {result['login']['p95_ms']:.1f} ms)"
+            )
+
+    @staticmethod
+    def measure(iterations, host, policy) -> dict:
+        """
+        Signs up `iterations` accounts through the signup endpoint, then logs each of them in
+        and out through the login endpoint.
+        """
+        emails = [f'bench-auth-{policy}-{i}@example.com' for i in range(iterations)]
+        client = Client(HTTP_HOST=host)
+
+        signups = []
+        for email in emails:
+            started = time.perf_counter()
+            response = client.post(reverse('signup_api'), {'name': 'Bench', 'email': email, 'password': PASSWORD})
+            signups.append(time.perf_counter() - started)
+            if response.status_code != 302:
+                raise CommandError(f'Signing up {email} failed.')
+
+        logins = []
+        for email in emails:
+            started = time.perf_counter()
+            response = client.post(reverse('login_api'), {'email': email, 'password': PASSWORD})
+            logins.append(time.perf_counter() - started)
+            if response.status_code != 302:
+                raise CommandError(f'Logging in {email} failed.')
+            client.logout()
+
+        return {
+            name: {**summarize(samples), 'per_second': len(samples) / sum(samples) if samples else 0.0}
+            for name, samples in (('signup', signups), ('login', logins))
+        }
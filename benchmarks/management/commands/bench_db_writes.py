@@ -0,0 +1,129 @@
+import json
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from write_and_shine.db import sqlite_pragmas
+from write_and_shine.stats import summarize
+
+# SQLite's defaults: a rollback journal synced on every commit, and deferred transactions
+BASELINE_PRAGMAS = ['PRAGMA journal_mode=DELETE', 'PRAGMA synchronous=FULL']
+
+SCHEMA = """
+CREATE TABLE post (id INTEGER PRIMARY KEY, like_count INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE post_like (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL REFERENCES post (id),
+    UNIQUE (user_id, post_id)
+);
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures concurrent like-toggle throughput on a local SQLite file, with SQLite defaults '
+        '(baseline) and with the tuned pragmas of write_and_shine/db.py. Writers run the same '
+        'statements as InteractionRepository.toggle_like while readers scan the feed counters.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Number of writing threads.')
+        parser.add_argument('--readers', type=int, default=4, help='Number of reading threads.')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds each profile runs.')
+        parser.add_argument('--posts', type=int, default=100, help='Number of posts liked at random.')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+
+    def handle(self, *args, **options):
+        profiles = {
+            'baseline': (BASELINE_PRAGMAS, 'DEFERRED'),
+            'tuned': (sqlite_pragmas(), 'IMMEDIATE'),
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, (pragmas, begin) in profiles.items():
+                results[name] = self.run_profile(Path(directory) / f'{name}.sqlite3', pragmas, begin, options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            writes, reads = result['writes'], result['reads']
+            self.stdout.write(
+                f"{name:>8}: {result['writes_per_second']:8.1f} writes/s, {result['busy_errors']} busy errors, "
+                f"write p50/p95/p99 {writes['p50_ms']:.2f}/{writes['p95_ms']:.2f}/{writes['p99_ms']:.2f} ms, "
+                f"read p95 {reads['p95_ms']:.2f} ms"
+            )
+
+    @staticmethod
+    def connect(path, pragmas):
+        connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        for pragma in pragmas:
+            connection.execute(pragma)
+        return connection
+
+    def run_profile(self, path, pragmas, begin, options) -> dict:
+        """Runs the writers and readers against a fresh database file for the configured duration."""
+        setup = self.connect(path, pragmas)
+        setup.executescript(SCHEMA)
+        setup.executemany('INSERT INTO post (id) VALUES (?)', [(i,) for i in range(1, options['posts'] + 1)])
+        setup.close()
+
+        write_latencies, read_latencies, busy_errors = [], [], []
+        deadline = time.perf_counter() + options['duration']
+
+        def write(user_id):
+            connection = self.connect(path, pragmas)
+            while time.perf_counter() < deadline:
+                post_id = random.randint(1, options['posts'])
+                started = time.perf_counter()
+                try:
+                    connection.execute(f'BEGIN {begin}')
+                    removed = connection.execute(
+                        'DELETE FROM post_like WHERE user_id = ? AND post_id = ?', (user_id, post_id)
+                    ).rowcount
+                    if removed:
+                        connection.execute('UPDATE post SET like_count = like_count - 1 WHERE id = ?', (post_id,))
+                    else:
+                        connection.execute(
+                            'INSERT INTO post_like (user_id, post_id) VALUES (?, ?) ON CONFLICT DO NOTHING',
+                            (user_id, post_id)
+                        )
+                        connection.execute('UPDATE post SET like_count = like_count + 1 WHERE id = ?', (post_id,))
+                    connection.execute('COMMIT')
+                    write_latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    busy_errors.append(1)
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+            connection.close()
+
+        def read():
+            connection = self.connect(path, pragmas)
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    connection.execute('SELECT id, like_count FROM post ORDER BY id DESC LIMIT 10').fetchall()
+                    read_latencies.append(time.perf_counter() - started)
+                except sqlite3.OperationalError:
+                    busy_errors.append(1)
+            connection.close()
+
+        threads = [threading.Thread(target=write, args=(user_id,)) for user_id in range(options['writers'])]
+        threads += [threading.Thread(target=read) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'writes_per_second': len(write_latencies) / options['duration'],
+            'busy_errors': len(busy_errors),
+            'writes': summarize(write_latencies),
+            'reads': summarize(read_latencies),
+        }
@@ -0,0 +1,93 @@
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from benchmarks.management.commands.seed_dataset import WORDS
+from posts.models import Post
+from write_and_shine.stats import percentile, summarize
+
+User = get_user_model()
+
+SCENARIOS = ['get_posts', 'search_post', 'get_profile', 'toggle_like', 'comment_post']
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the feed, search, profile, like and comment views through the Django test client, '
+        'as a logged-in user, and reports latency percentiles and query counts as JSON. '
+        'toggle_like and comment_post write to the database. Run seed_dataset first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario.')
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, dest='scenarios',
+                            help='Scenario to run; can be repeated. All of them by default.')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+        parser.add_argument('--output', help='File to write the JSON report to, instead of stdout.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the requests.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        post_ids = list(Post.objects.values_list('id', flat=True)[:1000])
+        user_ids = list(User.objects.filter(profile__isnull=False).values_list('id', flat=True)[:1000])
+        if not post_ids or not user_ids:
+            raise CommandError('There is nothing to benchmark; run seed_dataset first.')
+
+        client = Client(HTTP_HOST=options['host'])
+        client.force_login(User.objects.get(pk=user_ids[0]))
+
+        requests = {
+            'get_posts': lambda: client.get(reverse('get_posts')),
+            'search_post': lambda: client.get(reverse('search_post'), {'post_name': rng.choice(WORDS)}),
+            'get_profile': lambda: client.get(reverse('get_profile', args=[rng.choice(user_ids)])),
+            'toggle_like': lambda: client.get(reverse('like_post', args=[rng.choice(post_ids)])),
+            'comment_post': lambda: client.post(reverse('comment_post', args=[rng.choice(post_ids)]),
+                                                {'body': 'Benchmark comment'}),
+        }
+
+        report = {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'dataset': {'users': User.objects.count(), 'posts': Post.objects.count()},
+            'scenarios': {},
+        }
+        for name in options['scenarios'] or SCENARIOS:
+            report['scenarios'][name] = self.run_scenario(requests[name], options['iterations'], options['warmup'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Wrote the report to {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    @staticmethod
+    def run_scenario(request, iterations, warmup) -> dict:
+        """Sends the warm-up requests, then times `iterations` requests and counts their queries."""
+        for _ in range(warmup):
+            request()
+
+        latencies, queries, statuses = [], [], {}
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request()
+                latencies.append(time.perf_counter() - started)
+            queries.append(len(context.captured_queries))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        return {
+            **summarize(latencies),
+            'queries': {'p50': percentile(queries, 50), 'max': max(queries, default=0)},
+            'statuses': statuses,
+        }
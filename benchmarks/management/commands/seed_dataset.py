@@ -0,0 +1,134 @@
+import random
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from interactions.models import Comment, Like
+from posts.models import Post, Tag
+from profiles.models import Profile
+
+User = get_user_model()
+
+WORDS = (
+    'django python database index cache query feed search profile comment like tag write shine '
+    'science art technology design data model view template test server client async stream'
+).split()
+
+SEED_PASSWORD = 'benchmarkPassword!'
+
+
+def sentence(rng, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a synthetic dataset of users (with profiles), tagged posts, likes and comments using '
+        'bulk inserts, then rebuilds the search index. Seeded users share the password '
+        f'"{SEED_PASSWORD}". The data is added to what the database already holds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--posts', type=int, default=200_000)
+        parser.add_argument('--likes', type=int, default=2_000_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--tags', type=int, default=500)
+        parser.add_argument('--batch-size', type=int, default=5_000, help='Rows per INSERT statement.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for a reproducible dataset.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        if options['likes'] > options['users'] * options['posts']:
+            options['likes'] = options['users'] * options['posts']
+
+        with transaction.atomic():
+            users = self.seed_users(rng, options['users'], batch_size)
+            tags = self.seed_tags(options['tags'], batch_size)
+            posts = self.seed_posts(rng, users, tags, options, batch_size)
+            self.seed_likes(rng, users, posts, batch_size)
+            self.seed_comments(rng, users, posts, batch_size)
+
+        call_command('rebuild_search_index', stdout=self.stdout)
+        for backend in caches.all():
+            backend.clear()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {len(tags)} tags, {len(posts)} posts, "
+            f"{options['likes']} likes and {options['comments']} comments."
+        ))
+
+    def seed_users(self, rng, count, batch_size):
+        # Hashing once keeps seeding fast; every seeded user can still log in
+        password = make_password(SEED_PASSWORD)
+        run = secrets.token_hex(4)
+        users = User.objects.bulk_create(
+            [User(email=f'bench-{run}-{i}@example.com', name=sentence(rng, 2), password=password)
+             for i in range(count)],
+            batch_size=batch_size
+        )
+        Profile.objects.bulk_create(
+            [Profile(user=user, headline=sentence(rng, 4), bio=sentence(rng, 12)) for user in users],
+            batch_size=batch_size
+        )
+        self.stdout.write(f'Seeded {len(users)} users.')
+        return users
+
+    def seed_tags(self, count, batch_size):
+        names = [f'{WORDS[i % len(WORDS)]}-{i}' for i in range(count)]
+        Tag.objects.bulk_create([Tag(name=name) for name in names], batch_size=batch_size, ignore_conflicts=True)
+        return list(Tag.objects.filter(name__in=names))
+
+    def seed_posts(self, rng, users, tags, options, batch_size):
+        """Creates the posts with their final like/comment counters, and tags each with one to three tags."""
+        count = options['posts']
+        likes = self.spread(options['likes'], count)
+        comments = self.spread(options['comments'], count)
+        posts = Post.objects.bulk_create(
+            [Post(author=rng.choice(users), title=sentence(rng, 6), body=sentence(rng, 60),
+                  like_count=likes[i], comment_count=comments[i]) for i in range(count)],
+            batch_size=batch_size
+        )
+        if tags:
+            PostTag = Post.tags.through
+            PostTag.objects.bulk_create(
+                [PostTag(post_id=post.id, tag_id=tag.id)
+                 for post in posts for tag in rng.sample(tags, min(len(tags), rng.randint(1, 3)))],
+                batch_size=batch_size
+            )
+        self.stdout.write(f'Seeded {len(posts)} posts.')
+        return posts
+
+    @staticmethod
+    def spread(total, buckets):
+        """Splits `total` over `buckets` as evenly as possible."""
+        share, remainder = divmod(total, buckets) if buckets else (0, 0)
+        return [share + (index < remainder) for index in range(buckets)]
+
+    def seed_likes(self, rng, users, posts, batch_size):
+        """Likes each post by distinct random users, so (user, post) pairs stay unique."""
+        batch = []
+        for post in posts:
+            for user in rng.sample(users, post.like_count):
+                batch.append(Like(user=user, post=post))
+            if len(batch) >= batch_size:
+                Like.objects.bulk_create(batch, batch_size=batch_size)
+                batch = []
+        Like.objects.bulk_create(batch, batch_size=batch_size)
+        self.stdout.write('Seeded likes.')
+
+    def seed_comments(self, rng, users, posts, batch_size):
+        batch = []
+        for post in posts:
+            for _ in range(post.comment_count):
+                batch.append(Comment(post=post, author=rng.choice(users), body=sentence(rng, 15)))
+            if len(batch) >= batch_size:
+                Comment.objects.bulk_create(batch, batch_size=batch_size)
+                batch = []
+        Comment.objects.bulk_create(batch, batch_size=batch_size)
+        self.stdout.write('Seeded comments.')
@@ -0,0 +1,73 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase
+
+from interactions.models import Comment, Like
+from posts.models import Post
+from posts.tags import tag_cache
+from test_helpers import clear_caches
+
+
+class BenchDbWritesTests(SimpleTestCase):
+    def test_reports_both_profiles(self):
+        """Test that a short run reports write throughput for the baseline and tuned profiles."""
+        out = StringIO()
+        call_command('bench_db_writes', writers=2, readers=1, duration=0.2, posts=5, json=True, stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(set(results), {'baseline', 'tuned'})
+        for result in results.values():
+            self.assertGreater(result['writes']['count'], 0)
+
+
+class SeedDatasetTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        tag_cache.clear()
+
+    def test_seeds_consistent_dataset(self):
+        """Test that the seeded counters match the seeded likes and comments, with unique like pairs."""
+        call_command('seed_dataset', users=6, posts=10, likes=45, comments=25, tags=4, batch_size=7, seed=1,
+                     stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 10)
+        self.assertEqual(Like.objects.count(), 45)
+        self.assertEqual(Comment.objects.count(), 25)
+        drifted = Post.objects.annotate(likes=Count('like', distinct=True), comments=Count('comment', distinct=True))
+        for post in drifted:
+            self.assertEqual((post.like_count, post.comment_count), (post.likes, post.comments))
+            self.assertTrue(1 <= post.tags.count() <= 3)
+
+
+class RunBenchmarksTests(TestCase):
+    def setUp(self):
+        clear_caches()
+        tag_cache.clear()
+        call_command('seed_dataset', users=4, posts=6, likes=10, comments=10, tags=3, seed=1, stdout=StringIO())
+
+    def test_reports_every_scenario(self):
+        """Test that every scenario is timed, with query counts and response statuses."""
+        out = StringIO()
+        call_command('run_benchmarks', iterations=2, warmup=0, host='testserver', seed=1, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['dataset'], {'users': 4, 'posts': 6})
+        self.assertEqual(
+            set(report['scenarios']), {'get_posts', 'search_post', 'get_profile', 'toggle_like', 'comment_post'}
+        )
+        for scenario in report['scenarios'].values():
+            self.assertEqual(scenario['count'], 2)
+            self.assertGreater(scenario['queries']['max'], 0)
+            self.assertNotIn('500', scenario['statuses'])
+
+
+class BenchAuthTests(TestCase):
+    def test_reports_signup_and_login_throughput(self):
+        """Test that a policy's signups and logins are measured, and its accounts rolled back."""
+        out = StringIO()
+        call_command('bench_auth', iterations=2, policies=['fast'], host='testserver', json=True, stdout=out)
+        results = json.loads(out.getvalue())
+        self.assertEqual(results['fast']['signup']['count'], 2)
+        self.assertGreater(results['fast']['login']['per_second'], 0)
+        self.assertFalse(get_user_model().objects.filter(email__startswith='bench-auth-').exists())
@@ -0,0 +1,120 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from interactions.models import Like
+
+GLOBAL_VERSION_KEY = 'liked-posts:version'
+
+
+def _user_version_key(user_id: int) -> str:
+    return f'liked-posts:version:{user_id}'
+
+
+def _new_version() -> str:
+    return format(time.time_ns(), 'x')
+
+
+class LikedPostsCache:
+    """
+    Caches the set of post IDs each user has liked, loaded with a single query.
+
+    Entries are versioned instead of deleted: a user's entry key embeds a per-user
+    version (bumped when that user toggles a like) and a global version (bumped when
+    posts are deleted, since their likes disappear through cascades). Versions are
+    unique stamps, and a missing one is replaced by a fresh stamp, so a version evicted
+    before its entries never revives them.
+    """
+
+    @staticmethod
+    def _data_key(user_id: int, versions: dict) -> str:
+        return f'liked-posts:{user_id}:{versions[GLOBAL_VERSION_KEY]}:{versions[_user_version_key(user_id)]}'
+
+    @staticmethod
+    def _versions(user_id: int) -> dict:
+        keys = [GLOBAL_VERSION_KEY, _user_version_key(user_id)]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                version = _new_version()
+                if not cache.add(key, version, None):
+                    version = cache.get(key, version)
+                versions[key] = version
+        return versions
+
+    @staticmethod
+    async def _aversions(user_id: int) -> dict:
+        keys = [GLOBAL_VERSION_KEY, _user_version_key(user_id)]
+        versions = await cache.aget_many(keys)
+        for key in keys:
+            if key not in versions:
+                version = _new_version()
+                if not await cache.aadd(key, version, None):
+                    version = await cache.aget(key, version)
+                versions[key] = version
+        return versions
+
+    @staticmethod
+    def get(user_id: int) -> frozenset:
+        """
+        Returns all the post IDs liked by a user, loading them on a cache miss.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            frozenset: The IDs of the posts the user has liked.
+        """
+        key = LikedPostsCache._data_key(user_id, LikedPostsCache._versions(user_id))
+        liked_ids = cache.get(key)
+        if liked_ids is None:
+            liked_ids = frozenset(Like.objects.filter(user_id=user_id).values_list('post_id', flat=True))
+            cache.set(key, liked_ids, settings.LIKED_POSTS_CACHE_TIMEOUT)
+        return liked_ids
+
+    @staticmethod
+    async def aget(user_id: int) -> frozenset:
+        """
+        Async version of `get`, using the async cache and ORM APIs.
+        """
+        key = LikedPostsCache._data_key(user_id, await LikedPostsCache._aversions(user_id))
+        liked_ids = await cache.aget(key)
+        if liked_ids is None:
+            liked_ids = frozenset([
+                post_id async for post_id in Like.objects.filter(user_id=user_id).values_list('post_id', flat=True)
+            ])
+            await cache.aset(key, liked_ids, settings.LIKED_POSTS_CACHE_TIMEOUT)
+        return liked_ids
+
+    @staticmethod
+    def _bump(key: str):
+        cache.set(key, _new_version(), None)
+
+    @staticmethod
+    async def _abump(key: str):
+        await cache.aset(key, _new_version(), None)
+
+    @staticmethod
+    def invalidate(user_id: int):
+        """
+        Invalidates the cached likes of one user.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        LikedPostsCache._bump(_user_version_key(user_id))
+
+    @staticmethod
+    async def ainvalidate(user_id: int):
+        """
+        Async version of `invalidate`.
+        """
+        await LikedPostsCache._abump(_user_version_key(user_id))
+
+    @staticmethod
+    def invalidate_all():
+        """
+        Invalidates the cached likes of every user.
+        """
+        LikedPostsCache._bump(GLOBAL_VERSION_KEY)
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    Like = apps.get_model('interactions', 'Like')
+    Post = apps.get_model('posts', 'Post')
+
+    duplicates = (
+        Like.objects.values('user', 'post')
+        .annotate(total=Count('id'), keep=Min('id'))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        Like.objects.filter(user=duplicate['user'], post=duplicate['post']).exclude(id=duplicate['keep']).delete()
+        Post.objects.filter(id=duplicate['post']).update(
+            like_count=Like.objects.filter(post=duplicate['post']).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0001_initial'),
+        ('posts', '0004_post_like_count_comment_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_like_per_user_post'),
+        ),
+    ]
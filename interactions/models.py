@@ -10,6 +10,12 @@ class Comment(models.Model):
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A post's comments, newest first, as embedded in the feed and paginated
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+        ]
+
     def __str__(self):
         return f'{self.author.name} commented on {self.post.title}'
 
@@ -18,5 +24,10 @@ class Like(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
     liked_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_like_per_user_post'),
+        ]
+
     def __str__(self):
         return f'{self.user.name} liked {self.post.title}'
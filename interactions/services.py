@@ -1,28 +1,97 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.http import Http404
+from django.utils import timezone
+from posts.fragments import abump_post_versions, bump_post_versions_on_commit
 from posts.models import Post
+from posts.pagination import paginate_by_cursor
+from interactions.cache import LikedPostsCache
 from interactions.models import Comment, Like
-from django.shortcuts import get_object_or_404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 
 class InteractionRepository:
+    @staticmethod
+    def _insert_like(user_id, post_id):
+        """
+        Inserts a like in a single statement, skipping it if the post does not exist
+        or if the (user, post) pair is already liked.
+
+        Args:
+            user_id: The ID of the user liking the post.
+            post_id: The ID of the post to like.
+
+        Returns:
+            bool: True if a like row was inserted.
+        """
+        like_table, post_table = Like._meta.db_table, Post._meta.db_table
+        liked_at = Like._meta.get_field('liked_at').get_db_prep_value(timezone.now(), connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {like_table} (user_id, post_id, liked_at) '
+                f'SELECT %s, id, %s FROM {post_table} WHERE id = %s '
+                f'ON CONFLICT (user_id, post_id) DO NOTHING',
+                [user_id, liked_at, post_id]
+            )
+            return cursor.rowcount == 1
+
     @staticmethod
     def toggle_like(user, post_id):
         """
         Toggles the like for a post. If the user has liked it, the like will be removed, otherwise, it will be added.
 
+        The toggle is one conditional DELETE, followed only when nothing was deleted by an
+        INSERT that ignores conflicts, so concurrent toggles can never create duplicate likes.
+
         Args:
             user: The user liking/unliking the post.
             post_id: The ID of the post to like/unlike.
 
         Returns:
             dict: A dictionary containing the success status and message.
-        """
-        post = get_object_or_404(Post, pk=post_id)
-        like_instance = Like.objects.filter(user=user, post=post).first()
 
-        if like_instance:
-            like_instance.delete()
+        Raises:
+            Http404: If the post does not exist.
+        """
+        with transaction.atomic():
+            removed, _ = Like.objects.filter(user=user, post_id=post_id).delete()
+            if removed:
+                Post.objects.filter(pk=post_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+            elif InteractionRepository._insert_like(user.id, post_id):
+                Post.objects.filter(pk=post_id).update(like_count=F('like_count') + 1)
+            elif not Post.objects.filter(pk=post_id).exists():
+                raise Http404('No Post matches the given query.')
+            bump_post_versions_on_commit([post_id])
+
+        LikedPostsCache.invalidate(user.id)
+        if removed:
             return {'success': True, 'message': 'Like removed.'}
+        return {'success': True, 'message': 'Like added.'}
 
-        Like.objects.create(user=user, post=post)
+    @staticmethod
+    async def atoggle_like(user, post_id):
+        """
+        Async version of `toggle_like`, using the async ORM. It cannot open a transaction,
+        so the like and its counter update are separate statements; a counter left behind by
+        a failed request is fixed by `PostRepository.repair_counters`.
+        """
+        removed, _ = await Like.objects.filter(user=user, post_id=post_id).adelete()
+        if removed:
+            await Post.objects.filter(pk=post_id, like_count__gt=0).aupdate(like_count=F('like_count') - 1)
+        elif not await Post.objects.filter(pk=post_id).aexists():
+            raise Http404('No Post matches the given query.')
+        else:
+            try:
+                await Like.objects.acreate(user=user, post_id=post_id)
+            except IntegrityError:
+                # Liked by a concurrent request, which counted it
+                pass
+            else:
+                await Post.objects.filter(pk=post_id).aupdate(like_count=F('like_count') + 1)
+        await abump_post_versions([post_id])
+
+        await LikedPostsCache.ainvalidate(user.id)
+        if removed:
+            return {'success': True, 'message': 'Like removed.'}
         return {'success': True, 'message': 'Like added.'}
 
     @staticmethod
@@ -42,9 +111,44 @@ class InteractionRepository:
             return {'success': False, 'message': 'Comment cannot be empty.'}
 
         post = get_object_or_404(Post, pk=post_id)
-        Comment.objects.create(post=post, author=user, body=comment_body)
+        with transaction.atomic():
+            Comment.objects.create(post=post, author=user, body=comment_body)
+            Post.objects.filter(pk=post.pk).update(comment_count=F('comment_count') + 1)
+        return {'success': True, 'message': 'Comment added.'}
+
+    @staticmethod
+    async def aadd_comment(user, post_id, comment_body):
+        """
+        Async version of `add_comment`, using the async ORM. As in `atoggle_like`, the
+        comment and its counter update are separate statements.
+        """
+        if not comment_body:
+            return {'success': False, 'message': 'Comment cannot be empty.'}
+
+        post = await aget_object_or_404(Post, pk=post_id)
+        await Comment.objects.acreate(post=post, author=user, body=comment_body)
+        await Post.objects.filter(pk=post.pk).aupdate(comment_count=F('comment_count') + 1)
         return {'success': True, 'message': 'Comment added.'}
 
+    @staticmethod
+    def get_comments_page(post_id, cursor, page_size):
+        """
+        Retrieves one page of a post's comments, newest first, with their authors and profiles.
+
+        Args:
+            post_id: The ID of the post.
+            cursor: The cursor returned with the previous page, or None for the first page.
+            page_size: The maximum number of comments on the page.
+
+        Returns:
+            CursorPage: The comments of the page and the cursor of the next one.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        comments = Comment.objects.filter(post_id=post_id).select_related('author__profile')
+        return paginate_by_cursor(comments, cursor, page_size)
+
     @staticmethod
     def get_comment(comment_id):
         """
@@ -88,13 +192,49 @@ class InteractionRepository:
         Returns:
             None
         """
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
+            Post.objects.filter(pk=comment.post_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+
+
+    @staticmethod
+    def liked_post_ids(user, post_ids):
+        """
+        Returns which of the given posts the user has liked, using the cached like set.
 
+        Args:
+            user: The user to check.
+            post_ids: The IDs of the posts to check.
+
+        Returns:
+            set: The subset of `post_ids` the user has liked.
+        """
+        return LikedPostsCache.get(user.id).intersection(post_ids)
 
     @staticmethod
     def user_liked_post(user, post_id):
-        try:
-            post = Post.objects.get(id=post_id)
-            return Like.objects.filter(user=user, post=post).exists()
-        except Post.DoesNotExist:
-            return False
+        """
+        Checks if the user has liked a post.
+
+        Args:
+            user: The user to check.
+            post_id: The ID of the post.
+
+        Returns:
+            bool: True if the user liked the post, False otherwise.
+        """
+        return post_id in LikedPostsCache.get(user.id)
+
+    @staticmethod
+    async def aliked_post_ids(user, post_ids):
+        """
+        Async version of `liked_post_ids`.
+        """
+        return (await LikedPostsCache.aget(user.id)).intersection(post_ids)
+
+    @staticmethod
+    async def auser_liked_post(user, post_id):
+        """
+        Async version of `user_liked_post`.
+        """
+        return post_id in await LikedPostsCache.aget(user.id)
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.fragments import bump_post_versions_on_commit
+from posts.models import Post
+from .cache import LikedPostsCache
+from .models import Comment
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_liked_posts(sender, instance, **kwargs):
+    """Drops cached like sets that may still reference a deleted post."""
+    LikedPostsCache.invalidate_all()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_commented_post(sender, instance, **kwargs):
+    """Invalidates the cached card of a post whose comments changed."""
+    bump_post_versions_on_commit([instance.post_id])
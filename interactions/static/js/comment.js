@@ -1,9 +1,11 @@
-// Toggle comments section
-document.querySelectorAll('.comment-btn').forEach(button => {
-    button.addEventListener('click', function() {
-        const commentsSection = this.closest('.post-footer').querySelector('.comments-section');
-        commentsSection.style.display = commentsSection.style.display === 'none' ? 'flex' : 'none';
-    });
+// Toggle comments section (delegated, so cards loaded later work too)
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('.comment-btn');
+    if (!button) {
+        return;
+    }
+    const commentsSection = button.closest('.post-footer').querySelector('.comments-section');
+    commentsSection.style.display = commentsSection.style.display === 'none' ? 'flex' : 'none';
 });
 
 // Handle comment submission
@@ -17,4 +19,30 @@ function toggleComments(button) {
     } else {
         commentsSection.style.display = 'none';
     }
-}
\ No newline at end of file
+}
+
+// Load older comments on demand
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('.load-more-comments');
+    if (!button || button.disabled) {
+        return;
+    }
+    button.disabled = true;
+
+    const container = button.closest('.comments-display').querySelector('.comment-container');
+    const url = button.dataset.url + '?cursor=' + encodeURIComponent(button.dataset.cursor);
+    fetch(url, {headers: {'Accept': 'application/json'}})
+        .then(response => response.json())
+        .then(data => {
+            container.insertAdjacentHTML('beforeend', data.html);
+            if (data.next_cursor) {
+                button.dataset.cursor = data.next_cursor;
+                button.disabled = false;
+            } else {
+                button.remove();
+            }
+        })
+        .catch(() => {
+            button.disabled = false;
+        });
+});
@@ -1,5 +1,6 @@
-document.querySelectorAll('.like-btn').forEach(button => {
-    button.addEventListener('click', function() {
-        this.classList.toggle('liked');
-    });
-});
\ No newline at end of file
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('.like-btn');
+    if (button) {
+        button.classList.toggle('liked');
+    }
+});
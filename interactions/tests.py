@@ -1,3 +1,274 @@
-from django.test import TestCase
+import threading
+import time
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.http import Http404
+from django.test import AsyncClient, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from interactions.models import Comment, Like
+from interactions.services import InteractionRepository
+from posts.models import Post
+from profiles.models import Profile
+from test_helpers import clear_caches, query_plan
+
+User = get_user_model()
+
+
+class LikedPostsCacheTests(TestCase):
+    def setUp(self):
+        """Set up a user and a few posts, with an empty cache."""
+        clear_caches()
+        self.user = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.posts = [Post.objects.create(author=self.user, title=f'Post {i}', body='Body') for i in range(3)]
+        InteractionRepository.toggle_like(self.user, self.posts[0].id)
+        InteractionRepository.toggle_like(self.user, self.posts[2].id)
+
+    def test_liked_post_ids(self):
+        """Test the batch API returns the liked subset of the given posts."""
+        post_ids = [post.id for post in self.posts[:2]]
+        self.assertEqual(InteractionRepository.liked_post_ids(self.user, post_ids), {self.posts[0].id})
+
+    def test_cached_lookups_do_not_query(self):
+        """Test that lookups after the first one are served from the cache."""
+        InteractionRepository.user_liked_post(self.user, self.posts[0].id)
+        with self.assertNumQueries(0):
+            self.assertTrue(InteractionRepository.user_liked_post(self.user, self.posts[0].id))
+            self.assertFalse(InteractionRepository.user_liked_post(self.user, self.posts[1].id))
+
+    def test_toggle_invalidates(self):
+        """Test that toggling a like is reflected immediately."""
+        self.assertFalse(InteractionRepository.user_liked_post(self.user, self.posts[1].id))
+        InteractionRepository.toggle_like(self.user, self.posts[1].id)
+        self.assertTrue(InteractionRepository.user_liked_post(self.user, self.posts[1].id))
+        InteractionRepository.toggle_like(self.user, self.posts[1].id)
+        self.assertFalse(InteractionRepository.user_liked_post(self.user, self.posts[1].id))
+
+    def test_post_deletion_invalidates(self):
+        """Test that a deleted post is no longer reported as liked."""
+        post_id = self.posts[0].id
+        self.assertTrue(InteractionRepository.user_liked_post(self.user, post_id))
+        self.posts[0].delete()
+        self.assertFalse(InteractionRepository.user_liked_post(self.user, post_id))
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        """Test that a like set cached under an older version is not served again after its version is evicted."""
+        clear_caches()
+        def liked(post):
+            return InteractionRepository.user_liked_post(self.user, post.id)
+
+        for _ in range(2):
+            liked(self.posts[1])  # caches the like set under the current version
+            InteractionRepository.toggle_like(self.user, self.posts[1].id)
+        self.assertFalse(liked(self.posts[1]))
+
+        # The small version key is evicted before the like sets, then the user toggles again
+        cache.delete(f'liked-posts:version:{self.user.id}')
+        InteractionRepository.toggle_like(self.user, self.posts[0].id)
+
+        self.assertFalse(liked(self.posts[0]))
+        self.assertFalse(liked(self.posts[1]))
+
+    def test_has_user_liked_post_view(self):
+        """Test the AJAX endpoint answers from the cached like set."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('has_user_liked_post', args=[self.posts[2].id]))
+        self.assertEqual(response.json(), {'liked': True})
+
+
+class ToggleLikeTests(TestCase):
+    def setUp(self):
+        """Set up a user and a post."""
+        clear_caches()
+        self.user = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.post = Post.objects.create(author=self.user, title='Post', body='Body')
+
+    def test_toggle_queries(self):
+        """Test that a toggle costs one DELETE plus one INSERT and one counter UPDATE."""
+        with CaptureQueriesContext(connection) as context:
+            InteractionRepository.toggle_like(self.user, self.post.id)
+        statements = [query['sql'].split()[0] for query in context.captured_queries]
+        self.assertEqual([s for s in statements if s not in ('SAVEPOINT', 'RELEASE')], ['DELETE', 'INSERT', 'UPDATE'])
+
+    def test_toggle_missing_post(self):
+        """Test that liking a missing post raises a 404."""
+        with self.assertRaises(Http404):
+            InteractionRepository.toggle_like(self.user, self.post.id + 1)
+
+    def test_duplicate_like_rejected(self):
+        """Test that the database rejects a second like of the same post by the same user."""
+        Like.objects.create(user=self.user, post=self.post)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Like.objects.create(user=self.user, post=self.post)
+
+
+class ToggleLikeConcurrencyTests(TransactionTestCase):
+    threads = 16
+
+    def setUp(self):
+        """Set up users and a post."""
+        clear_caches()
+        self.users = [
+            User.objects.create(email=f'user{i}@ws.com', name=f'User {i}')
+            for i in range(self.threads)
+        ]
+        self.post = Post.objects.create(author=self.users[0], title='Post', body='Body')
+
+    def run_concurrently(self, users):
+        """Toggle the like of every given user from its own thread, all released at once."""
+        barrier = threading.Barrier(len(users))
+        errors = []
+
+        def toggle(user):
+            try:
+                barrier.wait()
+                for attempt in range(50):
+                    try:
+                        InteractionRepository.toggle_like(user, self.post.id)
+                        break
+                    except OperationalError:  # SQLite lock contention, retry like a client would
+                        time.sleep(0.01 * (attempt + 1))
+                else:
+                    errors.append('gave up')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=toggle, args=(user,)) for user in users]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+
+    def test_double_clicks_never_duplicate(self):
+        """Test that one user toggling from many threads ends with at most one like."""
+        self.run_concurrently([self.users[0]] * self.threads)
+
+        self.post.refresh_from_db()
+        likes = Like.objects.filter(user=self.users[0], post=self.post).count()
+        self.assertEqual(likes, self.threads % 2)
+        self.assertEqual(self.post.like_count, likes)
+
+    def test_many_users_like_concurrently(self):
+        """Test that concurrent likes from different users are all counted."""
+        self.run_concurrently(self.users)
+
+        self.post.refresh_from_db()
+        self.assertEqual(Like.objects.filter(post=self.post).count(), self.threads)
+        self.assertEqual(self.post.like_count, self.threads)
+
+
+class CommentsPageTests(TestCase):
+    def setUp(self):
+        """Set up a post with more comments than the feed embeds."""
+        clear_caches()
+        self.user = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        Profile.objects.create(user=self.user)
+        self.post = Post.objects.create(author=self.user, title='Post', body='Body')
+        for index in range(7):
+            InteractionRepository.add_comment(self.user, self.post.id, f'Comment {index}')
+
+    def test_feed_embeds_newest_comments(self):
+        """Test that the feed embeds only the newest comments and a load-more button."""
+        with self.settings(FEED_COMMENTS_LIMIT=3):
+            response = self.client.get(reverse('get_posts'))
+        self.assertContains(response, 'class="comment"', count=3)
+        self.assertContains(response, 'Comment 6')
+        self.assertNotContains(response, 'Comment 3')
+        self.assertContains(response, 'class="load-more-comments"')
+
+    def test_comments_pages(self):
+        """Test that following the cursors returns every comment once, newest first."""
+        url = reverse('get_comments', args=[self.post.id])
+        with self.settings(COMMENTS_PAGE_SIZE=4):
+            first = self.client.get(url).json()
+            second = self.client.get(url, {'cursor': first['next_cursor']}).json()
+
+        self.assertEqual(first['html'].count('class="comment"'), 4)
+        self.assertIn('Comment 6', first['html'])
+        self.assertEqual(second['html'].count('class="comment"'), 3)
+        self.assertIn('Comment 0', second['html'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        response = self.client.get(reverse('get_comments', args=[self.post.id]), {'cursor': '%%%'})
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class InteractionIndexesTests(TestCase):
+    def test_like_lookup_uses_unique_index(self):
+        """Test that checking a user's like on a post searches the unique (user, post) index."""
+        plan = query_plan(Like.objects.filter(user_id=1, post_id=1))
+        self.assertIn('(user_id=? AND post_id=?)', plan)
+
+    def test_post_likes_use_post_index(self):
+        """Test that a post's likes are searched by the post index."""
+        self.assertIn('USING INDEX interactions_like_post_id', query_plan(Like.objects.filter(post_id=1)))
+
+    def test_comments_page_uses_post_created_index(self):
+        """Test that a page of a post's comments is read in index order, without sorting."""
+        plan = query_plan(Comment.objects.filter(post_id=1).order_by('-created_at', '-id')[:10])
+        self.assertIn('USING INDEX comment_post_created_idx (post_id=?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_author_comments_use_author_index(self):
+        """Test that a user's comments are searched by the author index."""
+        self.assertIn('USING INDEX interactions_comment_author_id', query_plan(Comment.objects.filter(author_id=1)))
+
+
+class AsyncInteractionViewsTests(TestCase):
+    def setUp(self):
+        """Set up a logged-in user and a post."""
+        clear_caches()
+        self.user = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.post = Post.objects.create(author=self.user, title='Post', body='Body')
+        self.async_client = AsyncClient()
+
+    async def test_like_comment_and_liked_state(self):
+        """Test that the async views toggle likes, add comments and report the liked state."""
+        await self.async_client.aforce_login(self.user)
+        has_liked = reverse('ahas_user_liked_post', args=[self.post.id])
+        self.assertEqual((await self.async_client.get(has_liked)).json(), {'liked': False})
+
+        response = await self.async_client.get(reverse('alike_post', args=[self.post.id]))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual((await self.async_client.get(has_liked)).json(), {'liked': True})
+
+        response = await self.async_client.post(reverse('acomment_post', args=[self.post.id]), {'body': 'Async'})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(await Comment.objects.filter(post=self.post, body='Async').aexists())
+        await self.post.arefresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 1))
+
+    async def test_anonymous_and_missing_post(self):
+        """Test that anonymous users are sent to log in, and missing posts are 404s."""
+        response = await self.async_client.get(reverse('alike_post', args=[self.post.id]))
+        self.assertEqual(response.url, reverse('login_api'))
+        self.assertEqual((await self.async_client.get(reverse('ahas_user_liked_post', args=[self.post.id]))).json(),
+                         {'liked': False})
+
+        await self.async_client.aforce_login(self.user)
+        self.assertEqual((await self.async_client.get(reverse('alike_post', args=[0]))).status_code, 404)
+
+    async def test_unlike_bumps_card_and_like_set(self):
+        """Test that toggling a like twice removes it, and each toggle invalidates the card and like set."""
+        await self.async_client.aforce_login(self.user)
+        like = reverse('alike_post', args=[self.post.id])
+        has_liked = reverse('ahas_user_liked_post', args=[self.post.id])
+        versions = []
+        for liked in (True, False):
+            await self.async_client.get(like)
+            self.assertEqual((await self.async_client.get(has_liked)).json(), {'liked': liked})
+            versions.append(await caches['post_cards'].aget(f'post-version:{self.post.id}'))
+
+        self.assertNotEqual(versions[0], versions[1])
+        await self.post.arefresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertFalse(await Like.objects.aexists())
@@ -6,8 +6,14 @@ urlpatterns = [
 
     path('<int:post_id>/like/', views.like_post, name='like_post'),
     path('<int:post_id>/comment/', views.comment_post, name='comment_post'),
+    path('<int:post_id>/comments/', views.get_comments, name='get_comments'),
     path('comments/<int:comment_id>/edit/', views.edit_comment, name='edit_comment'),
     path('comments/<int:comment_id>/delete/', views.delete_comment, name='delete_comment'),
     path('<int:post_id>/has-liked/', views.has_user_liked_post, name='has_user_liked_post'),
 
+    # Async variants, for ASGI deployments
+    path('<int:post_id>/like/async/', views.alike_post, name='alike_post'),
+    path('<int:post_id>/comment/async/', views.acomment_post, name='acomment_post'),
+    path('<int:post_id>/has-liked/async/', views.ahas_user_liked_post, name='ahas_user_liked_post'),
+
 ]
\ No newline at end of file
@@ -1,8 +1,11 @@
 from django.contrib import messages
 from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.conf import settings
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_GET, require_POST
 from rest_framework.decorators import api_view
 from .services import InteractionRepository
+from posts.fragments import layer_viewer, render_viewer_neutral
 from posts.models import Post
 
 @api_view(['GET'])
@@ -52,6 +55,27 @@ def comment_post(request, post_id):
     return redirect('login_api')
 
 
+@api_view(['GET'])
+def get_comments(request, post_id):
+    """
+    Returns a page of a post's comments as rendered HTML, for loading comments on demand.
+
+    Args:
+        request: The HTTP request object, with the optional `cursor` query parameter.
+        post_id: The ID of the post whose comments are requested.
+
+    Returns:
+        JsonResponse: The rendered comments and the cursor of the following page.
+    """
+    try:
+        page = InteractionRepository.get_comments_page(post_id, request.GET.get('cursor'), settings.COMMENTS_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'The requested page of comments is invalid.'}, status=400)
+
+    html = layer_viewer(render_viewer_neutral('interactions/comment_items.html', {'comments': page.items}), request)
+    return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
+
 @api_view(['GET', 'POST'])
 def edit_comment(request, comment_id):
     """
@@ -121,4 +145,50 @@ def has_user_liked_post(request, post_id):
     """
     if request.user.is_authenticated:
         liked = InteractionRepository.user_liked_post(request.user, post_id)
-        return JsonResponse({'liked': liked})
\ No newline at end of file
+        return JsonResponse({'liked': liked})
+
+# Native async variants, for ASGI deployments, writing through the async ORM.
+
+@require_GET
+async def alike_post(request, post_id):
+    """
+    Async version of `like_post`.
+    """
+    user = await request.auser()
+    if user.is_authenticated:
+        result = await InteractionRepository.atoggle_like(user, post_id)
+        if result['success']:
+            # Reload the current page
+            return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+        return HttpResponse(result['message'], status=403)
+
+    messages.error(request, "You should be logged in to like/unlike a post" )
+    return redirect('login_api')
+
+
+@require_POST
+async def acomment_post(request, post_id):
+    """
+    Async version of `comment_post`.
+    """
+    user = await request.auser()
+    if user.is_authenticated:
+        comment_body = request.POST.get('body', '')
+        result = await InteractionRepository.aadd_comment(user, post_id, comment_body)
+        if result['success']:
+            # Reload the current page
+            return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+        return HttpResponse(result['message'], status=400)
+
+    messages.error(request, "You should be logged in to comment on a post")
+    return redirect('login_api')
+
+
+@require_GET
+async def ahas_user_liked_post(request, post_id):
+    """
+    Async version of `has_user_liked_post`, reading the like set through the async cache and ORM.
+    """
+    user = await request.auser()
+    liked = user.is_authenticated and await InteractionRepository.auser_liked_post(user, post_id)
+    return JsonResponse({'liked': liked})
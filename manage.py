@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'write_and_shine.settings')
+    # The test suite runs with its own settings, see write_and_shine/test_settings.py
+    settings_module = 'write_and_shine.test_settings' if sys.argv[1:2] == ['test'] else 'write_and_shine.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
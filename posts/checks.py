@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core import checks
+
+from tasks.checks import PROCESS_LOCAL_CACHES
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Warns, outside DEBUG, about caches that are local to each process but carry invalidations:
+    post version stamps (cards), like set versions and the page cache stamp. With more than
+    one process, a change made in one leaves the others serving stale cards, likes and pages
+    until their entries expire.
+    """
+    if settings.DEBUG:
+        return []
+    aliases = sorted({'default', settings.POST_CARD_CACHE_ALIAS, settings.PAGE_CACHE_ALIAS})
+    return [
+        checks.Warning(
+            f"The '{alias}' cache is {settings.CACHES[alias]['BACKEND']}, which each process keeps "
+            f"to itself, so changes made in one process are not seen by the others.",
+            hint='Use a shared cache (CACHE_BACKEND=redis or memcached, see write_and_shine/caches.py), '
+                 'or serve from a single process.',
+            id='posts.W001',
+        )
+        for alias in aliases
+        if settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES
+    ]
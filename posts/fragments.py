@@ -0,0 +1,188 @@
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from write_and_shine import page_cache
+
+# Placeholders rendered into cached cards and replaced per viewer. They are rendered unescaped
+# and contain '<', which user content (always autoescaped) can never produce.
+CSRF_PLACEHOLDER = mark_safe('<viewer-csrf-token>')
+LIKE_CLASS_PLACEHOLDER = mark_safe('<viewer-like-class>')
+
+# Author-only controls are wrapped in <!--owner:ID-->...<!--/owner--> and kept only for that user.
+OWNER_BLOCK = re.compile(r'<!--owner:(\d+)-->(.*?)<!--/owner-->', re.DOTALL)
+
+HITS_KEY = 'post-card:hits'
+MISSES_KEY = 'post-card:misses'
+
+
+def _cache():
+    return caches[settings.POST_CARD_CACHE_ALIAS]
+
+
+def _version_key(post_id: int) -> str:
+    return f'post-version:{post_id}'
+
+
+def _new_version() -> str:
+    return format(time.time_ns(), 'x')
+
+
+def bump_post_versions(post_ids):
+    """
+    Gives posts a new version stamp, so their cached cards are rendered again.
+
+    Args:
+        post_ids: The IDs of the changed posts.
+    """
+    version = _new_version()
+    _cache().set_many({_version_key(post_id): version for post_id in post_ids}, None)
+    page_cache.touch()
+
+
+async def abump_post_versions(post_ids):
+    """
+    Async version of `bump_post_versions`, for async views, which write outside transactions.
+    """
+    version = _new_version()
+    await _cache().aset_many({_version_key(post_id): version for post_id in post_ids}, None)
+    await page_cache.atouch()
+
+
+def bump_post_versions_on_commit(post_ids):
+    """
+    Bumps the version stamps of posts once the current transaction commits, so a card
+    rendered from uncommitted state is never cached under the new stamp. It runs in the
+    committing process rather than as a job: a worker process may not share its cache.
+
+    Args:
+        post_ids: The IDs of the changed posts.
+    """
+    post_ids = [int(post_id) for post_id in post_ids]
+    if post_ids:
+        transaction.on_commit(lambda: bump_post_versions(post_ids))
+
+
+def get_post_versions(post_ids) -> dict:
+    """
+    Returns the current version stamp of each post, stamping the ones that have none yet.
+
+    Args:
+        post_ids: The IDs of the posts.
+
+    Returns:
+        dict: Post IDs mapped to their version stamps.
+    """
+    keys = {_version_key(post_id): post_id for post_id in post_ids}
+    versions = {keys[key]: version for key, version in _cache().get_many(keys).items()}
+    missing = [post_id for post_id in post_ids if post_id not in versions]
+    if missing:
+        # A fresh stamp (rather than a default) so an evicted stamp never revives an old card.
+        version = _new_version()
+        for post_id in missing:
+            if not _cache().add(_version_key(post_id), version, None):
+                version = _cache().get(_version_key(post_id), version)
+            versions[post_id] = version
+    return versions
+
+
+def _increment(key: str, delta: int):
+    if delta:
+        try:
+            _cache().incr(key, delta)
+        except ValueError:
+            _cache().add(key, 0, None)
+            _cache().incr(key, delta)
+
+
+def post_card_cache_stats() -> dict:
+    """
+    Returns the hit/miss counters of the post card cache.
+
+    Returns:
+        dict: The number of hits and misses and the hit rate.
+    """
+    counters = _cache().get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counters.get(HITS_KEY, 0), counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+
+def layer_viewer(html: str, request, liked: bool = False) -> str:
+    """
+    Fills the viewer-specific parts of a rendered card or comment: keeps the author-only
+    controls of the viewer, and sets the CSRF token and the like button state.
+
+    Args:
+        html (str): The viewer-neutral HTML.
+        request: The HTTP request of the viewer.
+        liked (bool): Whether the viewer liked the post.
+
+    Returns:
+        str: The HTML for this viewer.
+    """
+    user = request.user
+    viewer_id = str(user.id) if user.is_authenticated else None
+    html = OWNER_BLOCK.sub(lambda match: match.group(2) if match.group(1) == viewer_id else '', html)
+    if CSRF_PLACEHOLDER in html:
+        # Anonymous forms only lead to the login prompt, so they get no token (and no
+        # CSRF cookie), which keeps their pages cacheable.
+        html = html.replace(CSRF_PLACEHOLDER, get_token(request) if user.is_authenticated else '')
+    like_class = 'liked' if user.is_authenticated and liked else 'like-btn'
+    return html.replace(LIKE_CLASS_PLACEHOLDER, like_class)
+
+
+def render_viewer_neutral(template_name: str, context: dict) -> str:
+    """
+    Renders a template with the viewer-specific parts left as placeholders.
+
+    Args:
+        template_name (str): The template to render.
+        context (dict): The template context, without any request.
+
+    Returns:
+        str: The viewer-neutral HTML.
+    """
+    return render_to_string(template_name, {
+        **context,
+        'csrf_token': CSRF_PLACEHOLDER,
+        'like_class': LIKE_CLASS_PLACEHOLDER,
+    })
+
+
+def render_post_cards(posts, request) -> str:
+    """
+    Renders feed cards, reusing the cached viewer-neutral render of every post whose
+    version stamp has not changed, then layers the viewer-specific parts on top.
+
+    Args:
+        posts: Posts with their card metadata loaded (see PostMetadataLoader).
+        request: The HTTP request of the viewer.
+
+    Returns:
+        str: The HTML of all the cards.
+    """
+    posts = list(posts)
+    versions = get_post_versions([post.id for post in posts])
+    keys = {post.id: f'post-card:{post.id}:{versions[post.id]}' for post in posts}
+    cached = _cache().get_many(list(keys.values()))
+
+    rendered = {}
+    for post in posts:
+        if keys[post.id] not in cached:
+            rendered[keys[post.id]] = render_viewer_neutral('posts/post_card.html', {'post': post})
+    if rendered:
+        _cache().set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
+    _increment(HITS_KEY, len(posts) - len(rendered))
+    _increment(MISSES_KEY, len(rendered))
+
+    cards = {**cached, **rendered}
+    return mark_safe(''.join(
+        layer_viewer(cards[keys[post.id]], request, getattr(post, 'liked', False)) for post in posts
+    ))
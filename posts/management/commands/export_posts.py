@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.serializers import iter_ndjson
+from posts.services import PostRepository
+
+
+class Command(BaseCommand):
+    help = 'Exports every post, with its tags, counters and comments, as NDJSON, streaming it in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help='File to write; stdout by default.')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Posts fetched, with their tags and comments, per database round trip.')
+
+    def handle(self, *args, **options):
+        lines = iter_ndjson(PostRepository.iter_export(options['chunk_size']))
+        if options['path'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        exported = 0
+        with open(options['path'], 'w', encoding='utf-8') as file:
+            for line in lines:
+                file.write(line)
+                exported += 1
+        self.stderr.write(self.style.SUCCESS(f"Exported {exported} posts to {options['path']}."))
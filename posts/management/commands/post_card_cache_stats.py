@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.fragments import post_card_cache_stats
+from tasks.checks import PROCESS_LOCAL_CACHES
+
+
+class Command(BaseCommand):
+    help = (
+        'Shows the hit/miss counters of the rendered post card cache. They are kept in the '
+        'post card cache, so this needs a cache shared with the web processes; otherwise read '
+        'them from the _stats/ endpoint of a web process.'
+    )
+
+    def handle(self, *args, **options):
+        backend = settings.CACHES[settings.POST_CARD_CACHE_ALIAS]['BACKEND']
+        if backend in PROCESS_LOCAL_CACHES:
+            raise CommandError(
+                f"The post card cache ({backend}) is local to each process, so the web processes' "
+                f"counters cannot be read from here. Read them from the _stats/ endpoint instead."
+            )
+
+        stats = post_card_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}, misses: {stats['misses']}, hit rate: {stats['hit_rate']:.1%}"
+        )
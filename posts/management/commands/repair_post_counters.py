@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.services import PostRepository
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized like/comment counters of posts and repairs the ones that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of posts updated per UPDATE statement.')
+
+    def handle(self, *args, **options):
+        repaired = PostRepository.repair_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired counters of {repaired} post(s).'))
@@ -15,6 +15,8 @@ ERROR_MESSAGES = {
     'user_not_found': 'No user associated with the provided data was found.',
     'post_not_found': 'No post associated with the provided data was found.',
     'tag_not_found': 'No tag associated with the provided data was found.',
+    'invalid_cursor': 'The requested page of posts is invalid.',
+    'export_forbidden': 'Only staff members can export posts.',
 }
 
 
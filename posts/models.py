@@ -13,8 +13,20 @@ class Post(models.Model):
     title = models.CharField(max_length=255)
     body = models.TextField()
     tags = models.ManyToManyField(Tag, related_name='posts')  # Simplified many-to-many relation
+    like_count = models.PositiveIntegerField(default=0)  # Denormalized, maintained by InteractionRepository
+    comment_count = models.PositiveIntegerField(default=0)  # Denormalized, maintained by InteractionRepository
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # The feed's keyset order (see posts/pagination.py)
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            # A profile's posts, newest first
+            models.Index(fields=['author', '-created_at'], name='post_author_created_idx'),
+            # Posts written since a time, as read by the in-process search index and the page cache
+            models.Index(fields=['updated_at'], name='post_updated_idx'),
+        ]
+
     def __str__(self):
         return self.title
@@ -0,0 +1,100 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Q
+
+
+@dataclass
+class CursorPage:
+    """
+    A page of results produced by keyset pagination.
+
+    Attributes:
+        items (list): The objects on this page.
+        next_cursor (str | None): The cursor of the next page, or None on the last page.
+    """
+    items: list
+    next_cursor: str | None
+
+
+def encode_cursor(obj) -> str:
+    """
+    Encodes the (created_at, id) position of an object as an opaque cursor.
+
+    Args:
+        obj: A model instance with `created_at` and `id` attributes.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    raw = f'{obj.created_at.isoformat()}|{obj.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor string.
+
+    Returns:
+        tuple: The (created_at, id) position encoded in the cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, obj_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from e
+
+
+def paginate_by_cursor(queryset, cursor: str | None, page_size: int) -> CursorPage:
+    """
+    Returns the page of `queryset` that follows `cursor`, newest first.
+
+    Rows are ordered by (created_at, id) descending and the page boundary is
+    expressed as a WHERE clause on those columns instead of an OFFSET, so deep
+    pages cost the same as the first one.
+
+    Args:
+        queryset: QuerySet of a model with `created_at` and `id` fields.
+        cursor (str | None): The cursor returned with the previous page, or None for the first page.
+        page_size (int): The maximum number of items on the page.
+
+    Returns:
+        CursorPage: The items of the page and the cursor of the next one.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    items = list(_page_queryset(queryset, cursor, page_size))
+    return _to_page(items, page_size)
+
+
+async def apaginate_by_cursor(queryset, cursor: str | None, page_size: int) -> CursorPage:
+    """
+    Async version of `paginate_by_cursor`, fetching the page with the async ORM.
+    """
+    items = [item async for item in _page_queryset(queryset, cursor, page_size)]
+    return _to_page(items, page_size)
+
+
+def _page_queryset(queryset, cursor: str | None, page_size: int):
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, obj_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=obj_id)
+        )
+    # One extra row tells whether there is a next page
+    return queryset[:page_size + 1]
+
+
+def _to_page(items: list, page_size: int) -> CursorPage:
+    next_cursor = encode_cursor(items[page_size - 1]) if len(items) > page_size else None
+    return CursorPage(items[:page_size], next_cursor)
@@ -1,3 +1,5 @@
+import json
+
 from rest_framework import serializers
 from .models import Post, Tag
 from interactions.models import Comment, Like
@@ -22,3 +24,41 @@ class LikeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Like
         fields = '__all__'
+
+
+class ExportCommentSerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.name')
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'author', 'author_name', 'body', 'created_at']
+
+class PostExportSerializer(serializers.ModelSerializer):
+    """
+    A post with its tags, counters and comments, as one line of the NDJSON export.
+    Expects the `export_tags` and `export_comments` prefetches of PostRepository.iter_export.
+    """
+    author_name = serializers.CharField(source='author.name')
+    tags = serializers.SlugRelatedField(source='export_tags', slug_field='name', many=True, read_only=True)
+    likes_count = serializers.IntegerField(source='like_count')
+    comments_count = serializers.IntegerField(source='comment_count')
+    comments = ExportCommentSerializer(source='export_comments', many=True)
+
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'body', 'author', 'author_name', 'created_at', 'updated_at',
+                  'tags', 'likes_count', 'comments_count', 'comments']
+
+
+def iter_ndjson(posts):
+    """
+    Serializes posts one at a time as NDJSON lines.
+
+    Args:
+        posts: An iterable of posts, as yielded by PostRepository.iter_export.
+
+    Returns:
+        Iterator[str]: One JSON document per post, each ending with a newline.
+    """
+    for post in posts:
+        yield json.dumps(PostExportSerializer(post).data) + '\n'
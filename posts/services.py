@@ -1,7 +1,137 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from interactions.models import Comment, Like
 from interactions.services import InteractionRepository
+from posts.fragments import bump_post_versions_on_commit
 from posts.models import Post, Tag
+from posts.pagination import CursorPage, apaginate_by_cursor, paginate_by_cursor
+from posts.tags import tag_cache
 from django.contrib.auth import get_user_model
 
+POSTS_COUNT_KEY = 'posts:count'
+
+
+def _count_subquery(model):
+    """
+    Builds a correlated subquery counting the rows of `model` that point to the outer post.
+
+    Args:
+        model: A model with a `post` foreign key (Like or Comment).
+
+    Returns:
+        Coalesce: An expression usable in `QuerySet.annotate`.
+    """
+    counts = (
+        model.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def build_feed_queryset(posts, comments_limit: int | None = None):
+    """
+    Prepares a queryset of posts for rendering feed cards: the author and their profile
+    are joined in, and the comments are prefetched (newest first) into `feed_comments`
+    together with their authors and profiles.
+
+    Args:
+        posts: QuerySet of posts.
+        comments_limit (int | None): Keep only the newest N comments of each post, or None for all of them.
+
+    Returns:
+        QuerySet: The prepared queryset.
+    """
+    comments = Comment.objects.select_related('author__profile').order_by('-created_at', '-id')
+    if comments_limit is not None:
+        comments = comments[:comments_limit]
+    return posts.select_related('author__profile').prefetch_related(
+        Prefetch('comment_set', queryset=comments, to_attr='feed_comments')
+    )
+
+
+class PostMetadataLoader:
+    """
+    Loads the metadata rendered on post cards (author, likes count, comments count,
+    tags, comments and the viewer's liked flag) for a whole queryset in a fixed number
+    of queries: one for the posts, their authors and counters, one each for the
+    prefetched tags and comments and, on a cache miss, one for the viewer's like set.
+    """
+
+    @staticmethod
+    def annotate(posts):
+        """
+        Exposes the denormalized likes/comments counters and adds the tags, authors and
+        comments to a queryset of posts.
+
+        Args:
+            posts: QuerySet of posts.
+
+        Returns:
+            QuerySet: The annotated queryset.
+        """
+        posts = build_feed_queryset(posts, settings.FEED_COMMENTS_LIMIT)
+        return posts.annotate(
+            likes_count=F('like_count'),
+            comments_count=F('comment_count'),
+        ).prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.order_by('name'), to_attr='post_tags')
+        )
+
+    @staticmethod
+    def mark_liked(posts, user):
+        """
+        Sets the `liked` flag of each post for the given viewer from their cached like set.
+
+        Args:
+            posts (list[Post]): Evaluated posts.
+            user: The current user.
+
+        Returns:
+            list[Post]: The same posts, with `liked` set.
+        """
+        liked_ids = set()
+        if user.is_authenticated and posts:
+            liked_ids = InteractionRepository.liked_post_ids(user, [post.id for post in posts])
+        for post in posts:
+            post.liked = post.id in liked_ids
+        return posts
+
+    @staticmethod
+    async def amark_liked(posts, user):
+        """
+        Async version of `mark_liked`.
+        """
+        liked_ids = set()
+        if user.is_authenticated and posts:
+            liked_ids = await InteractionRepository.aliked_post_ids(user, [post.id for post in posts])
+        for post in posts:
+            post.liked = post.id in liked_ids
+        return posts
+
+    @staticmethod
+    def load(posts, user=None):
+        """
+        Evaluates a queryset of posts with all their card metadata attached.
+
+        Args:
+            posts: QuerySet of posts.
+            user: The current user, or None to skip the liked flag.
+
+        Returns:
+            list[Post]: The posts, in queryset order, with `likes_count`,
+            `comments_count`, `post_tags` and (when a user is given) `liked` set.
+        """
+        posts = list(PostMetadataLoader.annotate(posts))
+        if user is None:
+            return posts
+        return PostMetadataLoader.mark_liked(posts, user)
+
 
 def update_post_metadata(posts, user=None):
     """
@@ -14,18 +144,7 @@ def update_post_metadata(posts, user=None):
     Returns:
         Updated posts with additional metadata.
     """
-    for post in posts:
-        post.likes_count = post.like_set.count()
-        post.comments_count = post.comment_set.count()
-        post.post_tags = post.tags.all()
-        # Check if the user liked the post
-        if user is not None:
-            if user.is_authenticated:
-                # Check if the user is authenticated and liked the post
-                post.liked = InteractionRepository.user_liked_post(user, post.id)
-            else:
-                post.liked = False  # User is not logged in, set to False
-    return posts
+    return PostMetadataLoader.load(posts, user)
 
 
 User = get_user_model()
@@ -47,11 +166,7 @@ class PostRepository:
             Post: The created post object.
         """
         post = Post.objects.create(title=title, body=body, author=author)
-        
-        for tag_name in tags:
-            tag, _ = Tag.objects.get_or_create(name=tag_name)
-            post.tags.add(tag)
-        
+        TagRepository.add_to_post(post, tags)
         return post
 
     @staticmethod
@@ -76,3 +191,240 @@ class PostRepository:
             QuerySet: A queryset of the user's posts.
         """
         return Post.objects.filter(author__id=user_id)
+
+    @staticmethod
+    def get_feed_page(cursor: str | None, page_size: int, user=None) -> CursorPage:
+        """
+        Retrieves one page of the home feed, newest posts first, with card metadata attached.
+
+        Args:
+            cursor (str | None): The cursor returned with the previous page, or None for the first page.
+            page_size (int): The maximum number of posts on the page.
+            user: The current user, or None to skip the liked flag.
+
+        Returns:
+            CursorPage: The posts of the page and the cursor of the next one.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        page = paginate_by_cursor(PostMetadataLoader.annotate(Post.objects.all()), cursor, page_size)
+        if user is not None:
+            PostMetadataLoader.mark_liked(page.items, user)
+        return page
+
+    @staticmethod
+    async def aget_feed_page(cursor: str | None, page_size: int, user=None) -> CursorPage:
+        """
+        Async version of `get_feed_page`, using the async ORM.
+        """
+        page = await apaginate_by_cursor(PostMetadataLoader.annotate(Post.objects.all()), cursor, page_size)
+        if user is not None:
+            await PostMetadataLoader.amark_liked(page.items, user)
+        return page
+
+    @staticmethod
+    def count_posts() -> int:
+        """
+        Returns the number of posts shown above the feed, from the cache when possible, so
+        rendering the feed does not count the whole table. The cached count is dropped when
+        a post is created or deleted, and expires after POSTS_COUNT_CACHE_TIMEOUT seconds.
+
+        Returns:
+            int: The number of posts.
+        """
+        count = cache.get(POSTS_COUNT_KEY)
+        if count is None:
+            count = Post.objects.count()
+            cache.set(POSTS_COUNT_KEY, count, settings.POSTS_COUNT_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    async def acount_posts() -> int:
+        """
+        Async version of `count_posts`.
+        """
+        count = await cache.aget(POSTS_COUNT_KEY)
+        if count is None:
+            count = await Post.objects.acount()
+            await cache.aset(POSTS_COUNT_KEY, count, settings.POSTS_COUNT_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    def forget_posts_count():
+        """
+        Drops the cached number of posts, after a post is created or deleted.
+        """
+        cache.delete(POSTS_COUNT_KEY)
+
+    @staticmethod
+    def iter_export(chunk_size: int = 500):
+        """
+        Yields every post, oldest first, with its author, tags and comments, for bulk export.
+
+        Posts are fetched `chunk_size` at a time, and the tags and comments of each chunk are
+        prefetched together, so memory use does not grow with the number of posts.
+
+        Args:
+            chunk_size (int): The number of posts fetched, and prefetched for, per round trip.
+
+        Returns:
+            Iterator[Post]: Posts with `export_tags` and `export_comments` attached.
+        """
+        return (
+            Post.objects.order_by('id')
+            .select_related('author')
+            .prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.order_by('name'), to_attr='export_tags'),
+                Prefetch(
+                    'comment_set',
+                    queryset=Comment.objects.select_related('author').order_by('created_at', 'id'),
+                    to_attr='export_comments'
+                ),
+            )
+            .iterator(chunk_size=chunk_size)
+        )
+
+    @staticmethod
+    def repair_counters(batch_size: int = 1000, post_ids=None) -> int:
+        """
+        Recomputes the denormalized like/comment counters and fixes the ones that drifted
+        (e.g. after likes or comments were removed by a cascading user deletion).
+
+        Args:
+            batch_size (int): The number of posts updated per UPDATE statement.
+            post_ids: The IDs of the posts to check; all posts when not given.
+
+        Returns:
+            int: The number of posts whose counters were repaired.
+        """
+        posts = Post.objects.all() if post_ids is None else Post.objects.filter(id__in=post_ids)
+        drifted = posts.annotate(
+            actual_likes=_count_subquery(Like),
+            actual_comments=_count_subquery(Comment),
+        ).filter(
+            ~Q(like_count=F('actual_likes')) | ~Q(comment_count=F('actual_comments'))
+        ).values_list('id', 'actual_likes', 'actual_comments')
+
+        posts = [
+            Post(id=post_id, like_count=likes, comment_count=comments)
+            for post_id, likes, comments in drifted
+        ]
+        Post.objects.bulk_update(posts, ['like_count', 'comment_count'], batch_size=batch_size)
+        return len(posts)
+
+
+class TagRepository:
+    @staticmethod
+    def _from_cache(name: str, tag_id: int) -> Tag:
+        return Tag.from_db(Tag.objects.db, ['id', 'name'], [tag_id, name])
+
+    @staticmethod
+    def resolve_many(names: list[str]) -> list[Tag]:
+        """
+        Retrieves the tags with the given names, creating the missing ones in bulk.
+        Names found in the tag name cache cost no query.
+
+        Args:
+            names (list[str]): The tag names, already normalized.
+
+        Returns:
+            list[Tag]: The tags, in the order of their first occurrence in `names`.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+
+        tags = {
+            name: TagRepository._from_cache(name, tag_id)
+            for name, tag_id in tag_cache.get_many(names).items()
+        }
+        missing = [name for name in names if name not in tags]
+        if missing:
+            tags.update((tag.name, tag) for tag in Tag.objects.filter(name__in=missing))
+            missing = [name for name in missing if name not in tags]
+        if missing:
+            # Conflicts mean another request created the tag meanwhile, so re-read the created rows.
+            Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            tags.update((tag.name, tag) for tag in Tag.objects.filter(name__in=missing))
+
+        tag_cache.set_many({name: tag.id for name, tag in tags.items()})
+        return [tags[name] for name in names]
+
+    @staticmethod
+    def lookup_id(name: str) -> int | None:
+        """
+        Finds the ID of a tag by name, from the tag name cache when possible.
+
+        Args:
+            name (str): The tag name, already normalized.
+
+        Returns:
+            int | None: The ID of the tag, or None if there is no such tag.
+        """
+        cached = tag_cache.get_many([name])
+        if cached:
+            return cached[name]
+
+        tag_id = Tag.objects.filter(name=name).values_list('id', flat=True).first()
+        if tag_id is not None:
+            tag_cache.set_many({name: tag_id})
+        return tag_id
+
+    @staticmethod
+    def _insert_post_tags(post_id: int, tags: list[Tag]) -> int:
+        """
+        Associates tags with a post in a single statement, skipping the pairs that already
+        exist and the tags whose row no longer has the same ID and name (a tag from the
+        per-process name cache may have been deleted or renamed by another process).
+
+        Args:
+            post_id (int): The ID of the post.
+            tags (list[Tag]): The tags, as resolved.
+
+        Returns:
+            int: The number of pairs inserted.
+        """
+        PostTag = Post.tags.through
+        post_column = PostTag._meta.get_field('post').column
+        tag_column = PostTag._meta.get_field('tag').column
+        matches = ' OR '.join(['(id = %s AND name = %s)'] * len(tags))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {PostTag._meta.db_table} ({post_column}, {tag_column}) '
+                f'SELECT %s, id FROM {Tag._meta.db_table} WHERE {matches} '
+                f'ON CONFLICT ({post_column}, {tag_column}) DO NOTHING',
+                [post_id] + [value for tag in tags for value in (tag.id, tag.name)]
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def add_to_post(post: Post, names: list[str]) -> list[Tag]:
+        """
+        Associates tags with a post, creating the missing tags, using a single insert
+        into the post-tag relation table.
+
+        When fewer pairs than tags are inserted, the tags are checked against the tags
+        table: those that came stale from the tag name cache are dropped from it, resolved
+        again from the database and inserted.
+
+        Args:
+            post (Post): The post to tag.
+            names (list[str]): The tag names, already normalized.
+
+        Returns:
+            list[Tag]: The tags associated with the post.
+        """
+        tags = TagRepository.resolve_many(names)
+        if tags and TagRepository._insert_post_tags(post.id, tags) < len(tags):
+            # Some pairs may simply exist already (e.g. when editing), so look for stale tags
+            current = dict(Tag.objects.filter(id__in=[tag.id for tag in tags]).values_list('id', 'name'))
+            stale = [tag for tag in tags if current.get(tag.id) != tag.name]
+            if stale:
+                for tag in stale:
+                    tag_cache.discard(tag.id)
+                fresh = {tag.name: tag for tag in TagRepository.resolve_many([tag.name for tag in stale])}
+                TagRepository._insert_post_tags(post.id, list(fresh.values()))
+                tags = [fresh.get(tag.name, tag) for tag in tags]
+        bump_post_versions_on_commit([post.id])
+        return tags
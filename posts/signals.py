@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from posts.fragments import bump_post_versions, bump_post_versions_on_commit
+from posts.models import Post, Tag
+from posts.services import PostRepository
+from posts.tags import tag_cache
+from profiles.models import Profile
+from tasks.queue import enqueue_on_commit
+from write_and_shine.page_cache import touch_on_commit
+
+User = get_user_model()
+
+# The user fields shown on cards and public pages
+DISPLAYED_USER_FIELDS = frozenset(['name'])
+
+
+@receiver(post_save, sender=Tag)
+def cache_tag(sender, instance, **kwargs):
+    """Keeps the tag name cache in sync when a tag is created or renamed."""
+    tag_cache.set_many({instance.name: instance.id})
+
+
+@receiver(post_delete, sender=Tag)
+def uncache_tag(sender, instance, **kwargs):
+    """Removes a deleted tag from the tag name cache."""
+    tag_cache.discard(instance.id)
+
+
+@receiver(post_delete, sender=Post)
+def touch_deleted_post(sender, instance, **kwargs):
+    """Invalidates the cached pages listing a deleted post, and the number of posts."""
+    touch_on_commit()
+    transaction.on_commit(PostRepository.forget_posts_count)
+
+
+@receiver(post_save, sender=Post)
+def bump_saved_post(sender, instance, created, **kwargs):
+    """Invalidates the cached card of an edited post, or the number of posts for a new one."""
+    bump_post_versions_on_commit([instance.id])
+    if created:
+        transaction.on_commit(PostRepository.forget_posts_count)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def bump_retagged_post(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidates the cached cards of posts whose tags changed."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_post_versions_on_commit([instance.id])
+    elif pk_set:
+        bump_post_versions_on_commit(pk_set)
+    else:
+        bump_post_versions_on_commit(instance.posts.values_list('id', flat=True))
+
+
+def bump_posts_showing_user(user_id):
+    """
+    Invalidates, once the current transaction commits, the cached cards showing a user's
+    name or profile, as a post or comment author.
+    """
+    def bump():
+        post_ids = list(
+            Post.objects.filter(Q(author_id=user_id) | Q(comment__author_id=user_id))
+            .values_list('id', flat=True).distinct()
+        )
+        if post_ids:
+            bump_post_versions(post_ids)
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=Profile)
+def bump_profile_posts(sender, instance, created, **kwargs):
+    # A new profile belongs to a new user, who has no posts or comments yet.
+    if not created:
+        touch_on_commit()
+        bump_posts_showing_user(instance.user_id)
+
+
+@receiver(post_delete, sender=Profile)
+def touch_deleted_profile(sender, instance, **kwargs):
+    touch_on_commit()
+
+
+@receiver(post_save, sender=User)
+def bump_user_posts(sender, instance, created, update_fields=None, **kwargs):
+    # Saves of fields no page shows, like last_login on login or password, are skipped.
+    if created or (update_fields is not None and not update_fields & DISPLAYED_USER_FIELDS):
+        return
+    touch_on_commit()
+    bump_posts_showing_user(instance.id)
+
+
+@receiver(pre_delete, sender=User)
+def repair_counters_of_deleted_user(sender, instance, **kwargs):
+    """
+    Repairs, in a background job, the counters of the other users' posts whose likes and
+    comments by a deleted user are removed by the cascade.
+    """
+    post_ids = list(
+        Post.objects.filter(Q(like__user_id=instance.id) | Q(comment__author_id=instance.id))
+        .exclude(author_id=instance.id).values_list('id', flat=True).distinct()
+    )
+    if post_ids:
+        enqueue_on_commit('posts.repair_counters', post_ids)
@@ -1,17 +1,57 @@
-document.querySelectorAll('.read-more').forEach(function(readMoreLink) {
-    readMoreLink.addEventListener('click', function(event) {
-        event.preventDefault(); // Prevent the default link behavior
-        
-        // Find the associated full content paragraph
-        const fullContent = this.previousElementSibling;
-        
-        // Toggle display of the full content
-        if (fullContent.style.display === 'none' || fullContent.style.display === '') {
-            fullContent.style.display = 'block';
-            this.innerHTML = 'Read Less <i class="fas fa-arrow-up"></i>';
-        } else {
-            fullContent.style.display = 'none';
-            this.innerHTML = 'Read More <i class="fas fa-arrow-right"></i>';
-        }
-    });
+// Toggle the full content of a post (delegated, so cards loaded later work too)
+document.addEventListener('click', function(event) {
+    const readMoreLink = event.target.closest('.read-more');
+    if (!readMoreLink) {
+        return;
+    }
+    event.preventDefault(); // Prevent the default link behavior
+
+    // Find the associated full content paragraph
+    const fullContent = readMoreLink.previousElementSibling;
+
+    // Toggle display of the full content
+    if (fullContent.style.display === 'none' || fullContent.style.display === '') {
+        fullContent.style.display = 'block';
+        readMoreLink.innerHTML = 'Read Less <i class="fas fa-arrow-up"></i>';
+    } else {
+        fullContent.style.display = 'none';
+        readMoreLink.innerHTML = 'Read More <i class="fas fa-arrow-right"></i>';
+    }
 });
+
+// Infinite scroll: load the next page of cards when the sentinel comes into view
+const feedSentinel = document.getElementById('feed-sentinel');
+
+if (feedSentinel) {
+    const cardsContainer = document.getElementById('cards-container');
+    let loading = false;
+
+    const feedObserver = new IntersectionObserver(function(entries) {
+        if (!entries[0].isIntersecting || loading) {
+            return;
+        }
+        loading = true;
+
+        const url = feedSentinel.dataset.url + '?cursor=' + encodeURIComponent(feedSentinel.dataset.cursor);
+        fetch(url, {headers: {'Accept': 'application/json'}})
+            .then(response => response.json())
+            .then(data => {
+                cardsContainer.insertAdjacentHTML('beforeend', data.html);
+                if (data.next_cursor) {
+                    feedSentinel.dataset.cursor = data.next_cursor;
+                    // A short page can leave the sentinel in view, which fires no new
+                    // intersection; observing it afresh reports its current state
+                    feedObserver.unobserve(feedSentinel);
+                    feedObserver.observe(feedSentinel);
+                } else {
+                    feedObserver.disconnect();
+                    feedSentinel.remove();
+                }
+            })
+            .finally(() => {
+                loading = false;
+            });
+    }, {rootMargin: '400px'});
+
+    feedObserver.observe(feedSentinel);
+}
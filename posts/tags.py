@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from posts.models import Tag
+
+
+def normalize_tag_name(name: str) -> str:
+    """
+    Normalizes a tag name the way tags are stored ("  machine learning " -> "Machine learning").
+
+    Args:
+        name (str): The raw tag name.
+
+    Returns:
+        str: The normalized tag name.
+    """
+    return name.strip().capitalize()
+
+
+def parse_tag_names(raw: str) -> list[str]:
+    """
+    Splits a comma-separated tags input into normalized tag names, skipping blank entries.
+
+    Args:
+        raw (str): The tags input, e.g. "ai, Science,,art".
+
+    Returns:
+        list[str]: The normalized tag names.
+    """
+    return [normalize_tag_name(name) for name in (raw or '').split(',') if name.strip()]
+
+
+class TagNameCache:
+    """
+    Bounded, thread-safe LRU cache of tag name -> tag ID.
+
+    It is filled with up to `max_size` tags on first use, updated by the Tag save/delete
+    signals and by `TagRepository` after bulk creations. It is per process: a tag created
+    elsewhere is only picked up on its first miss here, and the signals only evict tags
+    renamed or deleted by this process. Entries made stale by other processes are caught
+    when tags are added to a post (see `TagRepository.add_to_post`), and dropped then.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        self._max_size = max_size
+        self._ids = OrderedDict()
+        self._names = {}
+        self._lock = threading.RLock()
+        self._warm = False
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size if self._max_size is not None else settings.TAG_CACHE_SIZE
+
+    def _warm_up(self):
+        if self._warm:
+            return
+        self._warm = True
+        for name, tag_id in Tag.objects.order_by('id').values_list('name', 'id')[:self.max_size]:
+            self._store(name, tag_id)
+
+    def _store(self, name: str, tag_id: int):
+        old_name = self._names.get(tag_id)
+        if old_name is not None and old_name != name:
+            self._ids.pop(old_name, None)
+        self._ids[name] = tag_id
+        self._ids.move_to_end(name)
+        self._names[tag_id] = name
+        while len(self._ids) > self.max_size:
+            _, evicted_id = self._ids.popitem(last=False)
+            self._names.pop(evicted_id, None)
+
+    def get_many(self, names: list[str]) -> dict[str, int]:
+        """
+        Looks up tag IDs by name.
+
+        Args:
+            names (list[str]): Normalized tag names.
+
+        Returns:
+            dict: The cached name -> ID pairs; names that are not cached are left out.
+        """
+        with self._lock:
+            self._warm_up()
+            found = {}
+            for name in names:
+                if name in self._ids:
+                    self._ids.move_to_end(name)
+                    found[name] = self._ids[name]
+            return found
+
+    def set_many(self, tags: dict[str, int]):
+        """
+        Adds or refreshes name -> ID pairs.
+
+        Args:
+            tags (dict): Normalized tag names mapped to their IDs.
+        """
+        with self._lock:
+            for name, tag_id in tags.items():
+                self._store(name, tag_id)
+
+    def discard(self, tag_id: int):
+        """
+        Forgets a tag.
+
+        Args:
+            tag_id (int): The ID of the tag.
+        """
+        with self._lock:
+            name = self._names.pop(tag_id, None)
+            if name is not None:
+                self._ids.pop(name, None)
+
+    def clear(self):
+        """
+        Empties the cache; it is filled again on next use.
+        """
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+            self._warm = False
+
+
+tag_cache = TagNameCache()
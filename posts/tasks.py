@@ -0,0 +1,8 @@
+from posts.services import PostRepository
+from tasks.registry import task
+
+
+@task('posts.repair_counters')
+def repair_counters(post_ids):
+    """Recomputes the like/comment counters of posts."""
+    PostRepository.repair_counters(post_ids=post_ids)
@@ -0,0 +1,15 @@
+from django import template
+
+from posts.pagination import encode_cursor
+
+register = template.Library()
+
+
+@register.filter
+def cursor(obj):
+    """
+    Renders the keyset pagination cursor pointing right after `obj`.
+
+    Usage: {{ post.feed_comments|last|cursor }}
+    """
+    return encode_cursor(obj) if obj else ''
@@ -0,0 +1,15 @@
+from django import template
+
+from posts.fragments import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts):
+    """
+    Renders feed cards through the post card cache.
+
+    Usage: {% post_cards posts %}
+    """
+    return render_post_cards(posts, context['request'])
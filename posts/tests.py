@@ -1,3 +1,578 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import skipUnless
+from django.db import connection
+from django.test import AsyncClient, RequestFactory, TestCase
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from accounts.services import AccountService
+from interactions.models import Comment, Like
+from interactions.services import InteractionRepository
+from posts.checks import check_shared_caches
+from posts.fragments import get_post_versions, post_card_cache_stats, render_post_cards
+from posts.models import Post, Tag
+from posts.pagination import decode_cursor, encode_cursor, paginate_by_cursor
+from posts.services import PostMetadataLoader, PostRepository, TagRepository
+from posts.tags import TagNameCache, normalize_tag_name, parse_tag_names, tag_cache
+from profiles.models import Profile
+from tasks.models import Job
+from test_helpers import clear_caches, query_plan
+from write_and_shine import page_cache
+from write_and_shine.instrumentation import instrument
 
-# Create your tests here.
+User = get_user_model()
+
+
+class PostMetadataLoaderTests(TestCase):
+    def setUp(self):
+        """Set up an author, a viewer and a few tags for testing."""
+        clear_caches()
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        self.viewer = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.tags = [Tag.objects.create(name=name) for name in ('Ai', 'Science')]
+
+    def create_posts(self, count):
+        """Create `count` posts, each with tags, a like and a comment from the viewer."""
+        for index in range(count):
+            post = Post.objects.create(author=self.author, title=f'Post {index}', body='Body')
+            post.tags.add(*self.tags)
+            InteractionRepository.toggle_like(self.viewer, post.id)
+            InteractionRepository.add_comment(self.viewer, post.id, 'Nice')
+
+    def count_load_queries(self, user):
+        """Return the number of queries needed to load all posts with their metadata."""
+        with CaptureQueriesContext(connection) as context:
+            posts = PostMetadataLoader.load(Post.objects.order_by('-created_at'), user)
+            for post in posts:
+                post.likes_count, post.comments_count, list(post.post_tags)
+        return len(context.captured_queries)
+
+    def test_metadata_values(self):
+        """Test the loaded counts, tags and liked flag."""
+        self.create_posts(1)
+        InteractionRepository.toggle_like(self.author, Post.objects.get().id)
+
+        post = PostMetadataLoader.load(Post.objects.all(), self.viewer)[0]
+        self.assertEqual(post.likes_count, 2)
+        self.assertEqual(post.comments_count, 1)
+        self.assertEqual([tag.name for tag in post.post_tags], ['Ai', 'Science'])
+        self.assertTrue(post.liked)
+
+    def test_anonymous_viewer_has_not_liked(self):
+        """Test that anonymous viewers get liked=False without a likes lookup."""
+        self.create_posts(2)
+
+        posts = PostMetadataLoader.load(Post.objects.all(), AnonymousUser())
+        self.assertFalse(any(post.liked for post in posts))
+
+    def test_query_count_is_constant(self):
+        """Test that the number of queries does not grow with the number of posts."""
+        self.create_posts(2)
+        small = self.count_load_queries(self.viewer)
+
+        self.create_posts(20)
+        large = self.count_load_queries(self.viewer)
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, 4)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        """Set up an author with posts, some of them sharing the same creation time."""
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        Profile.objects.create(user=self.author)
+        self.posts = [Post.objects.create(author=self.author, title=f'Post {i}', body='Body') for i in range(7)]
+        Post.objects.filter(id__in=[post.id for post in self.posts[2:5]]).update(created_at=timezone.now())
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes back to the position it was built from."""
+        post = self.posts[0]
+        self.assertEqual(decode_cursor(encode_cursor(post)), (post.created_at, post.id))
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+
+    def test_pages_cover_all_posts_once(self):
+        """Test walking every page returns each post exactly once, newest first."""
+        seen, cursor = [], None
+        while True:
+            page = paginate_by_cursor(Post.objects.all(), cursor, 3)
+            seen.extend(post.id for post in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_feed_page_endpoint(self):
+        """Test the JSON endpoint returns rendered cards and the next cursor."""
+        response = self.client.get(reverse('get_posts_page'), {'page_size': 5})
+        data = response.json()
+        self.assertEqual(data['html'].count('class="card"'), 5)
+        self.assertIsNotNone(data['next_cursor'])
+
+        response = self.client.get(reverse('get_posts_page'), {'cursor': data['next_cursor'], 'page_size': 5})
+        data = response.json()
+        self.assertEqual(data['html'].count('class="card"'), 2)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_feed_page_invalid_cursor(self):
+        """Test the JSON endpoint rejects a malformed cursor."""
+        response = self.client.get(reverse('get_posts_page'), {'cursor': '%%%'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_home_renders_first_page(self):
+        """Test the home page renders only the first page and the scroll sentinel."""
+        with self.settings(POSTS_PAGE_SIZE=4):
+            response = self.client.get(reverse('get_posts'))
+        self.assertEqual(len(response.context['posts']), 4)
+        self.assertContains(response, 'id="feed-sentinel"')
+
+
+    def test_posts_count_is_cached(self):
+        """Test that the feed does not count the posts table on every render, yet follows creates and deletes."""
+        clear_caches()
+        self.client.force_login(self.author)
+        self.client.get(reverse('get_posts'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_posts'))
+        self.assertFalse([query for query in queries if 'COUNT(*)' in query['sql']])
+        self.assertEqual(response.context['posts_count'], 7)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post = PostRepository.create_post('New', 'Body', self.author, [])
+        self.assertEqual(self.client.get(reverse('get_posts')).context['posts_count'], 8)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.client.get(reverse('get_posts')).context['posts_count'], 7)
+
+class PostCountersTests(TestCase):
+    def setUp(self):
+        """Set up a post and two users interacting with it."""
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        self.viewer = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.post = Post.objects.create(author=self.author, title='Post', body='Body')
+
+    def test_like_counter_follows_toggles(self):
+        """Test that liking and unliking keeps like_count in sync."""
+        InteractionRepository.toggle_like(self.viewer, self.post.id)
+        InteractionRepository.toggle_like(self.author, self.post.id)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 2)
+
+        InteractionRepository.toggle_like(self.viewer, self.post.id)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+
+    def test_comment_counter_follows_add_and_delete(self):
+        """Test that adding and deleting comments keeps comment_count in sync."""
+        InteractionRepository.add_comment(self.viewer, self.post.id, 'First')
+        InteractionRepository.add_comment(self.viewer, self.post.id, 'Second')
+        InteractionRepository.delete_comment(Comment.objects.first())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_repair_counters(self):
+        """Test that drifted counters are recomputed by the repair command."""
+        Like.objects.create(user=self.viewer, post=self.post)
+        Comment.objects.create(post=self.post, author=self.viewer, body='Untracked')
+        untouched = Post.objects.create(author=self.author, title='Other', body='Body')
+
+        call_command('repair_post_counters', stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 1))
+        self.assertEqual(PostRepository.repair_counters(), 0)
+        untouched.refresh_from_db()
+        self.assertEqual((untouched.like_count, untouched.comment_count), (0, 0))
+
+    def test_deleting_a_user_repairs_counters(self):
+        """Test that the likes and comments removed with a deleted user are recounted by a job."""
+        InteractionRepository.toggle_like(self.viewer, self.post.id)
+        InteractionRepository.add_comment(self.viewer, self.post.id, 'Soon gone')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.viewer.delete()
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (0, 0))
+
+
+class TagRepositoryTests(TestCase):
+    def setUp(self):
+        """Set up an author and an existing tag, with an empty tag cache."""
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        self.existing = Tag.objects.create(name='Ai')
+
+    def test_resolve_many(self):
+        """Test that existing tags are reused, missing ones created and duplicates collapsed."""
+        tags = TagRepository.resolve_many(['Science', 'Ai', 'Science', 'Art'])
+        self.assertEqual([tag.name for tag in tags], ['Science', 'Ai', 'Art'])
+        self.assertEqual(tags[1], self.existing)
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_create_post_query_count_is_constant(self):
+        """Test that creating a post costs the same number of queries for 2 or 20 tags."""
+        def count_queries(names):
+            with CaptureQueriesContext(connection) as context:
+                PostRepository.create_post('Title', 'Body', self.author, names)
+            return len(context.captured_queries)
+
+        tag_cache.get_many([])  # warm up
+        few = count_queries(['Ai', 'Fresh'])
+        many = count_queries(['Ai'] + [f'Tag {i}' for i in range(19)])
+        self.assertEqual(few, many)
+        self.assertEqual(Post.objects.last().tags.count(), 20)
+
+    def test_edit_adds_tags_once(self):
+        """Test that re-adding tags that are already on a post does not fail or duplicate them."""
+        post = PostRepository.create_post('Title', 'Body', self.author, ['Ai'])
+        self.client.force_login(self.author)
+        self.client.post(reverse('delete_edit_post', args=[post.id]), {'new_tag': 'ai, robots'})
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['Ai', 'Robots'])
+
+
+class TagNameCacheTests(TestCase):
+    def setUp(self):
+        """Set up a few tags, with an empty tag cache."""
+        tag_cache.clear()
+        self.tags = [Tag.objects.create(name=name) for name in ('Ai', 'Art', 'Science')]
+
+    def test_normalization(self):
+        """Test that tag names are normalized the same way everywhere."""
+        self.assertEqual(normalize_tag_name('  machine LEARNING '), 'Machine learning')
+        self.assertEqual(parse_tag_names(' ai, ,Science ,'), ['Ai', 'Science'])
+        self.assertEqual(parse_tag_names(None), [])
+
+    def test_cached_tags_resolve_without_queries(self):
+        """Test that known tags are resolved from the cache."""
+        tag_cache.get_many(['Ai'])  # warm up
+        with self.assertNumQueries(0):
+            tags = TagRepository.resolve_many(['Ai', 'Science'])
+            self.assertEqual(TagRepository.lookup_id('Art'), self.tags[1].id)
+        self.assertEqual(tags, [self.tags[0], self.tags[2]])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used tag is evicted when the cache is full."""
+        small_cache = TagNameCache(max_size=2)
+        small_cache.get_many(['Ai'])  # warm up with the first two tags, then touch 'Ai'
+        small_cache.set_many({'Science': self.tags[2].id})
+        self.assertEqual(small_cache.get_many(['Ai', 'Art', 'Science']),
+                         {'Ai': self.tags[0].id, 'Science': self.tags[2].id})
+
+    def test_rename_and_delete_invalidate(self):
+        """Test that renamed and deleted tags are updated in the cache."""
+        tag_cache.get_many(['Ai'])
+        self.tags[0].name = 'Robots'
+        self.tags[0].save()
+        self.tags[1].delete()
+
+        self.assertEqual(tag_cache.get_many(['Ai', 'Art', 'Robots']), {'Robots': self.tags[0].id})
+
+
+    def test_tags_changed_by_other_processes(self):
+        """Test that tags deleted or renamed without this process's signals are not added from the cache."""
+        post = PostRepository.create_post('Title', 'Body', User.objects.create(email='a@ws.com', name='A'), [])
+        tag_cache.get_many(['Ai'])
+        tag_cache.set_many({'Ghost': 9999})
+        Tag.objects.filter(pk=self.tags[1].pk).update(name='Design')
+
+        tags = TagRepository.add_to_post(post, ['Ghost', 'Ai', 'Art'])
+
+        self.assertEqual([tag.name for tag in tags], ['Ghost', 'Ai', 'Art'])
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['Ai', 'Art', 'Ghost'])
+        self.assertEqual(tag_cache.get_many(['Ghost', 'Art']), {'Ghost': tags[0].id, 'Art': tags[2].id})
+        self.assertNotIn(9999, [tag.id for tag in tags])
+
+class FeedRenderQueriesTests(TestCase):
+    def setUp(self):
+        """Set up a logged-in viewer and a pool of commenters, each with a profile."""
+        clear_caches()
+        self.viewer = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        self.commenters = [User.objects.create(email=f'user{i}@ws.com', name=f'User {i}') for i in range(4)]
+        for user in [self.viewer] + self.commenters:
+            Profile.objects.create(user=user)
+        self.client.force_login(self.viewer)
+
+    def create_posts(self, count):
+        """Create `count` posts by different authors, each commented by every commenter."""
+        for index in range(count):
+            author = self.commenters[index % len(self.commenters)]
+            post = PostRepository.create_post(f'Post {index}', 'Body', author, ['Ai', f'Tag {index}'])
+            for commenter in self.commenters:
+                InteractionRepository.add_comment(commenter, post.id, f'Comment by {commenter.name}')
+
+    def test_home_query_count_is_constant(self):
+        """Test that rendering home.html costs the same queries for 2 or 8 posts."""
+        self.create_posts(2)
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('get_posts'))
+        self.assertContains(response, 'Comment by User 3', count=2)
+
+        self.create_posts(6)
+        cache.clear()  # render with a cold like-set cache again
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('get_posts'))
+        self.assertContains(response, 'Comment by User 3', count=8)
+
+    def test_authors_without_profile(self):
+        """Test that posts and comments by users without a profile show the default picture."""
+        author = User.objects.create(email='noprofile@ws.com', name='No Profile')
+        post = PostRepository.create_post('Orphan', 'Body', author, [])
+        InteractionRepository.add_comment(author, post.id, 'Comment without profile')
+
+        response = self.client.get(reverse('get_posts'))
+
+        self.assertContains(response, 'Comment without profile')
+        self.assertContains(response, 'default-48.webp')
+
+    def test_comments_limit(self):
+        """Test that only the newest comments are embedded when a limit is configured."""
+        self.create_posts(2)
+        with self.settings(FEED_COMMENTS_LIMIT=2):
+            posts = PostMetadataLoader.load(Post.objects.all())
+        self.assertEqual([[c.body for c in post.feed_comments] for post in posts],
+                         [['Comment by User 3', 'Comment by User 2']] * 2)
+
+
+class PostCardCacheTests(TestCase):
+    def setUp(self):
+        """Set up an author with a post, and a second user viewing it."""
+        clear_caches()
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        self.viewer = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        for user in (self.author, self.viewer):
+            Profile.objects.create(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post = PostRepository.create_post('Cached title', 'Body', self.author, ['Ai'])
+
+    def version(self):
+        return get_post_versions([self.post.id])[self.post.id]
+
+    def test_cards_are_reused_until_post_changes(self):
+        """Test that an unchanged card is served from the cache, and a like renders it again."""
+        self.client.force_login(self.viewer)
+        self.client.get(reverse('get_posts'))
+        self.client.get(reverse('get_posts'))
+        self.assertEqual(post_card_cache_stats()['hits'], 1)
+        self.assertEqual(post_card_cache_stats()['misses'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            InteractionRepository.toggle_like(self.viewer, self.post.id)
+        response = self.client.get(reverse('get_posts'))
+        self.assertEqual(post_card_cache_stats()['misses'], 2)
+        self.assertContains(response, 'class="liked"')
+        self.assertContains(response, '<strong class="like-count">1</strong>', html=False)
+
+    def test_version_bumps(self):
+        """Test that edits, tag changes, comments and profile changes give the post a new version."""
+        changes = [
+            lambda: Post.objects.get(pk=self.post.pk).save(),
+            lambda: TagRepository.add_to_post(self.post, ['django']),
+            lambda: self.post.tags.clear(),
+            lambda: InteractionRepository.add_comment(self.viewer, self.post.id, 'Nice'),
+            lambda: Profile.objects.filter(user=self.viewer).get().save(),
+        ]
+        for change in changes:
+            version = self.version()
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            self.assertNotEqual(self.version(), version)
+
+    def test_versions_are_bumped_in_process(self):
+        """Test that cache invalidation is not left to a worker process, which may have its own cache."""
+        with self.settings(TASKS_BACKEND='database'):
+            for change in (lambda: InteractionRepository.add_comment(self.viewer, self.post.id, 'Nice'),
+                           lambda: Profile.objects.filter(user=self.author).get().save()):
+                version = self.version()
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+                self.assertNotEqual(self.version(), version)
+        self.assertFalse(Job.objects.exists())
+
+    def test_login_does_not_bump_version(self):
+        """Test that updating only last_login leaves the author's cards cached."""
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(email='author@ws.com', password='passwordTest!')
+        self.assertEqual(self.version(), version)
+
+    def test_undisplayed_changes_keep_cards_and_pages(self):
+        """Test that signups and password changes leave cards and pages cached, while a new name does not."""
+        version, stamp = self.version(), page_cache.last_modified()
+        with self.captureOnCommitCallbacks(execute=True):
+            AccountService.create_account('Newcomer', 'newcomer@ws.com', 'passwordTest!')
+            AccountService.update_password('newPassword!1', self.author)
+        self.assertEqual((self.version(), page_cache.last_modified()), (version, stamp))
+
+        self.author.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save(update_fields=['name'])
+        self.assertNotEqual(self.version(), version)
+        self.assertGreater(page_cache.last_modified(), stamp)
+
+    def test_viewer_specific_parts_are_layered(self):
+        """Test that the cached card shows edit controls and a CSRF token only to the right viewer."""
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('get_posts'))
+        self.assertContains(response, reverse('delete_edit_post', args=[self.post.id]) + '?edit=true')
+        self.assertContains(response, 'class="like-btn"')
+        self.assertNotContains(response, '<viewer-')
+
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse('get_posts'))
+        self.assertEqual(post_card_cache_stats()['hits'], 1)
+        self.assertNotContains(response, reverse('delete_edit_post', args=[self.post.id]) + '?edit=true')
+        self.assertNotContains(response, '<viewer-')
+
+
+    def test_placeholders_in_user_content_are_kept(self):
+        """Test that user content spelling out the placeholders is not filled with the viewer's data."""
+        text = '__viewer_csrf_token__ __viewer_like_class__ <viewer-csrf-token> <viewer-like-class>'
+        with self.captureOnCommitCallbacks(execute=True):
+            post = PostRepository.create_post(text, text, self.author, [])
+            InteractionRepository.add_comment(self.author, post.id, text)
+
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse('get_posts'))
+        escaped = '__viewer_csrf_token__ __viewer_like_class__ &lt;viewer-csrf-token&gt; &lt;viewer-like-class&gt;'
+        self.assertContains(response, f'<strong>{escaped}</strong>')
+        self.assertContains(response, f'<p>{escaped}</p>')
+        self.assertNotContains(response, '<viewer-')
+
+    def test_cards_survive_a_pass_over_many_posts(self):
+        """Test that a pass over more posts than Django's default 300 cache entries keeps every card cached."""
+        Post.objects.bulk_create(Post(title=f'Post {i}', body='Body', author=self.author) for i in range(350))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        post_ids = list(Post.objects.order_by('-id').values_list('id', flat=True))
+        for _ in range(2):
+            for start in range(0, len(post_ids), 50):
+                render_post_cards(PostMetadataLoader.load(Post.objects.filter(id__in=post_ids[start:start + 50])), request)
+
+        self.assertEqual(post_card_cache_stats()['misses'], 351)
+        self.assertEqual(post_card_cache_stats()['hits'], 351)
+
+    def test_shared_caches_are_checked(self):
+        """Test that process-local caches are reported outside DEBUG, where several processes may serve."""
+        with self.settings(DEBUG=False):
+            self.assertEqual({warning.id for warning in check_shared_caches(None)}, {'posts.W001'})
+        with self.settings(DEBUG=True):
+            self.assertEqual(check_shared_caches(None), [])
+
+        backends = {alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'post_cards')}
+        with self.settings(DEBUG=False, CACHES=backends):
+            self.assertEqual(check_shared_caches(None), [])
+
+    def test_stats_command_needs_a_shared_cache(self):
+        """Test that the stats command refuses a per-process cache, whose counters it cannot see."""
+        with self.assertRaisesMessage(CommandError, '_stats/'):
+            call_command('post_card_cache_stats', stdout=StringIO())
+
+        out = StringIO()
+        backends = {alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'post_cards')}
+        with self.settings(CACHES=backends):
+            call_command('post_card_cache_stats', stdout=out)
+        self.assertIn('hits: 0, misses: 0', out.getvalue())
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class PostIndexesTests(TestCase):
+    def test_feed_page_uses_keyset_index(self):
+        """Test that a feed page is read in index order, without sorting the posts."""
+        plan = query_plan(Post.objects.order_by('-created_at', '-id')[:11])
+        self.assertIn('USING INDEX post_created_id_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_profile_posts_use_author_index(self):
+        """Test that a profile's posts are searched and ordered by the author index."""
+        plan = query_plan(Post.objects.filter(author_id=1).order_by('-created_at'))
+        self.assertIn('USING INDEX post_author_created_idx (author_id=?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class PostExportTests(TestCase):
+    def setUp(self):
+        """Set up tagged posts with comments, and a staff user allowed to export them."""
+        clear_caches()
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        self.staff = User.objects.create_user(email='staff@ws.com', password='passwordTest!', name='Staff',
+                                              is_staff=True)
+        for index in range(5):
+            post = PostRepository.create_post(f'Post {index}', 'Body', self.author, ['Ai', f'Tag {index}'])
+            InteractionRepository.add_comment(self.staff, post.id, f'Comment {index}')
+            InteractionRepository.toggle_like(self.staff, post.id)
+
+    def test_export_line(self):
+        """Test that each line holds a post with its tags, counters and comments."""
+        out = StringIO()
+        call_command('export_posts', stdout=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual([line['title'] for line in lines], [f'Post {i}' for i in range(5)])
+        self.assertEqual(lines[2]['tags'], ['Ai', 'Tag 2'])
+        self.assertEqual((lines[2]['likes_count'], lines[2]['comments_count']), (1, 1))
+        self.assertEqual(lines[2]['comments'][0]['body'], 'Comment 2')
+        self.assertEqual(lines[2]['comments'][0]['author_name'], 'Staff')
+
+    def test_prefetch_queries_are_per_chunk(self):
+        """Test that posts are read by one streamed query, and each chunk prefetches in two queries."""
+        with self.assertNumQueries(1 + 2 * 3):  # tags and comments for chunks of 2, 2 and 1 posts
+            self.assertEqual(len(list(PostRepository.iter_export(chunk_size=2))), 5)
+
+    def test_endpoint_streams_ndjson_to_staff(self):
+        """Test that the endpoint streams NDJSON to staff users, and refuses other users."""
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(reverse('export_posts')).status_code, 403)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('export_posts'), {'chunk_size': 2})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+
+
+class AsyncFeedTests(TestCase):
+    def setUp(self):
+        """Set up a logged-in viewer who liked one of the posts."""
+        clear_caches()
+        tag_cache.clear()
+        self.viewer = User.objects.create_user(email='viewer@ws.com', password='passwordTest!', name='Viewer')
+        Profile.objects.create(user=self.viewer)
+        self.posts = [PostRepository.create_post(f'Post {i}', 'Body', self.viewer, ['Ai']) for i in range(3)]
+        InteractionRepository.add_comment(self.viewer, self.posts[0].id, 'First comment')
+        InteractionRepository.toggle_like(self.viewer, self.posts[1].id)
+        self.async_client = AsyncClient()
+        # The test connection predates the middleware; entering instrument() once counts its queries
+        with instrument():
+            pass
+
+    async def test_async_feed_matches_sync_feed(self):
+        """Test that the async feed renders the same posts, comments and liked state."""
+        await self.async_client.aforce_login(self.viewer)
+        response = await self.async_client.get(reverse('aget_posts'))
+        self.assertContains(response, 'Number of posts: 3')
+        self.assertContains(response, 'First comment')
+        self.assertContains(response, 'class="liked"', count=1)
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    async def test_async_feed_page(self):
+        """Test that the async page loader follows cursors like the sync one."""
+        page = await PostRepository.aget_feed_page(None, 2)
+        self.assertEqual([post.title for post in page.items], ['Post 2', 'Post 1'])
+        page = await PostRepository.aget_feed_page(page.next_cursor, 2)
+        self.assertEqual([post.title for post in page.items], ['Post 0'])
+        self.assertIsNone(page.next_cursor)
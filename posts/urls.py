@@ -5,5 +5,8 @@ urlpatterns = [
     path('create/', views.create_post, name='create_post'),
     path('<int:post_id>/', views.delete_edit_post, name='delete_edit_post'),
     path('', views.get_posts, name='get_posts'),
+    path('feed/', views.get_posts_page, name='get_posts_page'),
+    path('export/', views.export_posts, name='export_posts'),
+    path('async/', views.aget_posts, name='aget_posts'),
     # path('user/<int:user_id>/', views.get_user_posts, name='get_user_posts')
 ]
\ No newline at end of file
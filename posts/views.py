@@ -1,12 +1,18 @@
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from accounts.models import User
 from .messages import message_handler
 from posts.models import Post, Tag
 from django.utils import timezone
 from django.contrib import messages
-from posts.services import PostRepository
+from posts.services import PostRepository, TagRepository
 from posts.services import update_post_metadata
+from posts.serializers import iter_ndjson
+from posts.tags import parse_tag_names
 
 
 @api_view(['POST', 'GET'])
@@ -17,8 +23,8 @@ def create_post(request):
             body = request.POST.get('body')
             tags_input = request.POST.get('tags')  # Get the tags input as a single string
             
-            # Split the tags by comma and strip whitespace
-            tags = [tag.strip().capitalize() for tag in tags_input.split(',') if tag.strip()]
+            # Split the tags by comma and normalize them
+            tags = parse_tag_names(tags_input)
 
             if title and body:
                 PostRepository.create_post(title, body, request.user, tags)
@@ -41,15 +47,96 @@ def create_post(request):
         return redirect('login_api')
 
 
+def get_page_size(request) -> int:
+    """
+    Reads the requested feed page size, clamped to the configured bounds.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        int: The number of posts per page.
+    """
+    try:
+        page_size = int(request.GET.get('page_size', settings.POSTS_PAGE_SIZE))
+    except ValueError:
+        page_size = settings.POSTS_PAGE_SIZE
+    return max(1, min(page_size, settings.POSTS_MAX_PAGE_SIZE))
+
+
 @api_view(['GET'])
 def get_posts(request):
-    # Retrieve posts ordered by 'created_at' in descending order
-    posts = Post.objects.all().order_by('-created_at')
+    # Retrieve the first page of posts, newest first, with their metadata
+    page = PostRepository.get_feed_page(None, get_page_size(request), request.user)
+
+    return render(request, 'home.html', {
+        'posts': page.items,
+        'posts_count': PostRepository.count_posts(),
+        'next_cursor': page.next_cursor,
+    })
+
+
+@require_GET
+async def aget_posts(request):
+    """
+    Async version of `get_posts`, for ASGI deployments, loading the feed with the async ORM.
+    """
+    # Resolved here so the templates never load the user synchronously
+    request.user = await request.auser()
+    page = await PostRepository.aget_feed_page(None, get_page_size(request), request.user)
+
+    return render(request, 'home.html', {
+        'posts': page.items,
+        'posts_count': await PostRepository.acount_posts(),
+        'next_cursor': page.next_cursor,
+    })
 
-    # Update post metadata
-    posts = update_post_metadata(posts, request.user)
 
-    return render(request, 'home.html', {'posts': posts})
+@api_view(['GET'])
+def get_posts_page(request):
+    """
+    Returns the next page of the feed as rendered post cards, for infinite scrolling.
+
+    Args:
+        request: The HTTP request object, with the `cursor` (and optional `page_size`) query parameters.
+
+    Returns:
+        JsonResponse: The rendered cards and the cursor of the following page.
+    """
+    try:
+        page = PostRepository.get_feed_page(request.GET.get('cursor'), get_page_size(request), request.user)
+    except ValueError:
+        error_message = message_handler.get('invalid_cursor')
+        return JsonResponse({'error': error_message}, status=400)
+
+    html = render_to_string('posts/post_cards.html', {'posts': page.items}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
+
+@api_view(['GET'])
+def export_posts(request):
+    """
+    Streams every post, with its tags, counters and comments, as NDJSON, for staff users.
+
+    Args:
+        request: The HTTP request object, with the optional `chunk_size` query parameter.
+
+    Returns:
+        StreamingHttpResponse: One JSON document per line, or a 403 JsonResponse.
+    """
+    if not request.user.is_staff:
+        error_message = message_handler.get('export_forbidden')
+        return JsonResponse({'error': error_message}, status=403)
+
+    try:
+        chunk_size = min(max(int(request.GET.get('chunk_size', 500)), 1), 5000)
+    except ValueError:
+        chunk_size = 500
+    response = StreamingHttpResponse(
+        iter_ndjson(PostRepository.iter_export(chunk_size)), content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = 'attachment; filename="posts.ndjson"'
+    return response
 
 
 # @api_view(['GET'])
@@ -114,13 +201,10 @@ def delete_edit_post(request, post_id):
             # Handle adding new tags
             new_tag_name = request.POST.get('new_tag', '').strip()
 
-            # Split and capitalize each tag, then handle them individually
-            tags = [tag.strip().capitalize() for tag in new_tag_name.split(',') if tag.strip()]
-
-            for tag_name in tags:
-                tag, _ = Tag.objects.get_or_create(name=tag_name)  # Create or retrieve each tag
-                post.tags.add(tag)  # Associate each tag with the post
+            # Split and normalize each tag
+            tags = parse_tag_names(new_tag_name)
 
+            TagRepository.add_to_post(post, tags)  # Create or retrieve the tags and associate them with the post
 
             # Handle the post editing
             post_fields = ['title', 'body']
@@ -0,0 +1,105 @@
+import io
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# (file extension, Pillow format, MIME type) of each thumbnail format, preferred first.
+# The last one is the fallback every browser can show.
+THUMBNAIL_FORMATS = (
+    ('webp', 'WEBP', 'image/webp'),
+    ('jpg', 'JPEG', 'image/jpeg'),
+)
+
+
+def thumbnail_name(source_name: str, size: int, extension: str) -> str:
+    """
+    Returns the storage name of a thumbnail of a picture, e.g.
+    'profile_pictures/thumbnails/me-96.webp' for 'profile_pictures/me.png'.
+    """
+    path = PurePosixPath(source_name)
+    return str(path.parent / 'thumbnails' / f'{path.stem}-{size}.{extension}')
+
+
+def thumbnail_names(source_name: str) -> dict:
+    """
+    Returns the storage names of every thumbnail of a picture.
+
+    Args:
+        source_name (str): The storage name of the picture.
+
+    Returns:
+        dict: Sizes (as strings, like JSON keys) mapped to extensions mapped to names.
+    """
+    return {
+        str(size): {extension: thumbnail_name(source_name, size, extension) for extension, _, _ in THUMBNAIL_FORMATS}
+        for size in settings.THUMBNAIL_SIZES
+    }
+
+
+def _encode(image: Image.Image, size: int, image_format: str) -> bytes:
+    """Crops and resizes an image to a square thumbnail and encodes it, without any metadata."""
+    thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and thumbnail.mode != 'RGB':
+        # JPEG has no transparency: flatten it on white
+        background = Image.new('RGB', thumbnail.size, 'white')
+        background.paste(thumbnail, mask=thumbnail.getchannel('A') if thumbnail.mode == 'RGBA' else None)
+        thumbnail = background
+    output = io.BytesIO()
+    thumbnail.save(output, image_format, quality=settings.THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def encode_thumbnails(field_file) -> dict:
+    """
+    Encodes the square thumbnails of a picture in every size of THUMBNAIL_SIZES and every
+    format of THUMBNAIL_FORMATS. EXIF orientation is applied, then all metadata is dropped.
+
+    Args:
+        field_file (FieldFile): The picture.
+
+    Returns:
+        dict: Sizes (as strings) mapped to extensions mapped to the encoded thumbnails.
+    """
+    with field_file.open('rb') as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+    return {
+        str(size): {extension: _encode(image, size, image_format) for extension, image_format, _ in THUMBNAIL_FORMATS}
+        for size in settings.THUMBNAIL_SIZES
+    }
+
+
+def make_thumbnails(field_file) -> dict:
+    """
+    Saves the thumbnails of a picture to its storage. With the content-hashed storage, each
+    thumbnail is a new reference to a file shared by every identical picture.
+
+    Args:
+        field_file (FieldFile): The picture.
+
+    Returns:
+        dict: Sizes (as strings) mapped to extensions mapped to the thumbnails' storage names.
+    """
+    storage = field_file.storage
+    return {
+        size: {
+            extension: storage.save(thumbnail_name(field_file.name, int(size), extension), ContentFile(content))
+            for extension, content in by_extension.items()
+        }
+        for size, by_extension in encode_thumbnails(field_file).items()
+    }
+
+
+def delete_thumbnails(variants: dict, storage):
+    """
+    Deletes (with the content-hashed storage, releases) the thumbnails of a picture.
+
+    Args:
+        variants (dict): The thumbnails' storage names, as returned by `make_thumbnails`.
+        storage (Storage): The storage holding the thumbnails.
+    """
+    for by_extension in variants.values():
+        for name in by_extension.values():
+            storage.delete(name)
@@ -0,0 +1,46 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db.models.fields.files import FieldFile
+
+from profiles.images import encode_thumbnails, make_thumbnails, thumbnail_name
+from profiles.models import DEFAULT_PICTURE, Profile
+
+
+class Command(BaseCommand):
+    help = (
+        'Makes the missing thumbnails of the default profile picture and of every uploaded '
+        'profile picture that has none, e.g. for pictures uploaded before thumbnails existed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Profiles fetched per query.')
+
+    def handle(self, *args, **options):
+        self.make_default_thumbnails()
+
+        profiles = Profile.objects.exclude(profile_picture=DEFAULT_PICTURE).filter(picture_variants={})
+        made = 0
+        for profile in profiles.iterator(chunk_size=options['chunk_size']):
+            if not profile.profile_picture.storage.exists(profile.profile_picture.name):
+                self.stderr.write(f'Skipping profile {profile.id}: {profile.profile_picture.name} is missing.')
+                continue
+            profile.picture_variants = make_thumbnails(profile.profile_picture)
+            profile.save(update_fields=['picture_variants'])
+            made += 1
+        self.stdout.write(self.style.SUCCESS(f'Made the thumbnails of {made} profile picture(s).'))
+
+    @staticmethod
+    def make_default_thumbnails():
+        """
+        Writes the default picture's thumbnails under the fixed names the avatar tag expects.
+        They ship with the default picture, outside the content-hashed storage.
+        """
+        storage = FileSystemStorage()
+        picture = FieldFile(None, Profile._meta.get_field('profile_picture'), DEFAULT_PICTURE)
+        picture.storage = storage
+        for size, by_extension in encode_thumbnails(picture).items():
+            for extension, content in by_extension.items():
+                name = thumbnail_name(DEFAULT_PICTURE, int(size), extension)
+                if not storage.exists(name):
+                    storage.save(name, ContentFile(content))
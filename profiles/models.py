@@ -4,6 +4,8 @@ import os
 
 User = get_user_model()
 
+DEFAULT_PICTURE = 'profile_pictures/default.png'
+
 
 class Profile(models.Model):
     """
@@ -13,7 +15,9 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     headline = models.CharField(max_length=70, blank=True, default="")
     bio = models.TextField(blank=True, default="")
-    profile_picture = models.ImageField(default='profile_pictures/default.png', upload_to='profile_pictures', blank=True)
+    profile_picture = models.ImageField(default=DEFAULT_PICTURE, upload_to='profile_pictures', blank=True)
+    # The thumbnails of an uploaded picture (see profiles/images.py), once they are made
+    picture_variants = models.JSONField(default=dict, blank=True)
     education = models.CharField(max_length=255, blank=True, default="")
 
     def __str__(self):
@@ -21,5 +25,5 @@ class Profile(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.profile_picture or self.profile_picture == '':
-            self.profile_picture = 'profile_pictures/default.png'
+            self.profile_picture = DEFAULT_PICTURE
         super().save(*args, **kwargs)
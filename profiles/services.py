@@ -2,7 +2,8 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from .models import Profile
+from tasks.queue import enqueue_on_commit
+from .models import DEFAULT_PICTURE, Profile
 from .messages import message_handler
 User = get_user_model()
 
@@ -28,20 +29,22 @@ class ProfileService:
     @staticmethod
     def create_default_profile(user):
         """
-        Creates or updates a profile with the provided information.
+        Creates an empty profile for the user, unless they already have one.
 
         Args:
             user: The user to whom the profile belongs.
 
         Returns:
-            HttpResponse: A success message after profile creation or update.
+            Profile: The user's profile.
         """
-        return ProfileService.create_or_update_profile(user)
+        profile, _ = Profile.objects.get_or_create(user=user)
+        return profile
 
     @staticmethod
     def create_or_update_profile(user, headline='', bio='', education='', profile_picture=None):
         """
-        Creates or updates a profile with the provided information.
+        Creates or updates a profile with the provided information. Once the change is
+        committed, background jobs make a new picture's thumbnails and release the old one.
 
         Args:
             user: The user to whom the profile belongs.
@@ -54,14 +57,24 @@ class ProfileService:
             HttpResponse: A success message after profile creation or update.
         """
         profile, created = Profile.objects.get_or_create(user=user)
+        old_picture, old_variants = profile.profile_picture.name, profile.picture_variants
+        replaced = bool(profile_picture) or old_picture != DEFAULT_PICTURE
 
         profile.headline = headline
         profile.bio = bio
         profile.education = education
         profile.profile_picture = profile_picture
+        if replaced:
+            profile.picture_variants = {}
 
         profile.save()
 
+        # Saving an upload adds a reference to its stored file, even when it is the old picture again
+        if replaced and old_picture != DEFAULT_PICTURE:
+            enqueue_on_commit('profiles.release_picture', old_picture, old_variants)
+        if replaced and profile.profile_picture.name != DEFAULT_PICTURE:
+            enqueue_on_commit('profiles.generate_thumbnails', profile.id, profile.profile_picture.name)
+
         if created:
             success_message = message_handler.get('profile_created', False)
         else:
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from tasks.queue import enqueue_on_commit
+from .models import DEFAULT_PICTURE, Profile
+
+
+@receiver(post_delete, sender=Profile)
+def release_deleted_picture(sender, instance, **kwargs):
+    """Releases the picture of a deleted profile, also when it is deleted with its account."""
+    if instance.profile_picture.name != DEFAULT_PICTURE:
+        enqueue_on_commit('profiles.release_picture', instance.profile_picture.name, instance.picture_variants)
@@ -0,0 +1,35 @@
+from django.db import transaction
+
+from tasks.registry import task
+from .images import delete_thumbnails, make_thumbnails
+from .models import Profile
+
+
+def _storage():
+    return Profile._meta.get_field('profile_picture').storage
+
+
+@task('profiles.generate_thumbnails')
+def generate_thumbnails(profile_id, picture_name):
+    """Makes the thumbnails of a profile picture, unless the profile or its picture changed since."""
+    profile = Profile.objects.filter(id=profile_id).first()
+    if profile is None or profile.profile_picture.name != picture_name:
+        return
+    variants = make_thumbnails(profile.profile_picture)
+
+    with transaction.atomic():
+        profile = Profile.objects.select_for_update().filter(id=profile_id).first()
+        if profile is None or profile.profile_picture.name != picture_name:
+            # Changed while the thumbnails were made
+            delete_thumbnails(variants, _storage())
+            return
+        profile.picture_variants = variants
+        profile.save(update_fields=['picture_variants'])
+
+
+@task('profiles.release_picture')
+def release_picture(picture_name, variants):
+    """Releases a profile's reference to a picture and its thumbnails, deleting the ones no one else uses."""
+    storage = _storage()
+    storage.delete(picture_name)
+    delete_thumbnails(variants, storage)
@@ -0,0 +1,44 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from profiles.images import THUMBNAIL_FORMATS, thumbnail_names
+from profiles.models import DEFAULT_PICTURE
+
+register = template.Library()
+
+
+@register.inclusion_tag('profiles/avatar.html')
+def avatar(profile, size, alt='profile pic', style=''):
+    """
+    Renders a profile picture shown `size` CSS pixels wide. Browsers pick the smallest
+    thumbnail that is sharp at their pixel density, in the first format they support.
+    Pictures whose thumbnails are not made yet are shown as uploaded. Users without a profile
+    (or picture), e.g. ones made by createsuperuser, get the default picture.
+
+    Usage: {% avatar post.author.profile 50 %}
+    """
+    if profile and profile.profile_picture:
+        picture_name, variants = profile.profile_picture.name, profile.picture_variants
+        storage = profile.profile_picture.storage
+    else:
+        picture_name, variants, storage = DEFAULT_PICTURE, {}, default_storage
+    if not variants and picture_name == DEFAULT_PICTURE:
+        # Shipped in media/ with the default picture, rather than stored on every profile
+        variants = thumbnail_names(DEFAULT_PICTURE)
+    context = {'size': size, 'alt': alt, 'style': style}
+    if not variants:
+        return {**context, 'src': storage.url(picture_name)}
+
+    sizes = sorted(variants, key=int)
+    srcsets = {
+        extension: ', '.join(f'{storage.url(variants[width][extension])} {width}w' for width in sizes)
+        for extension, _, _ in THUMBNAIL_FORMATS
+    }
+    fallback, _, _ = THUMBNAIL_FORMATS[-1]
+    smallest = next((width for width in sizes if int(width) >= size), sizes[-1])
+    return {
+        **context,
+        'sources': [{'type': mime, 'srcset': srcsets[extension]} for extension, _, mime in THUMBNAIL_FORMATS[:-1]],
+        'srcset': srcsets[fallback],
+        'src': storage.url(variants[smallest][fallback]),
+    }
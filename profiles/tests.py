@@ -1,6 +1,14 @@
-from django.test import TestCase
+import shutil
+import tempfile
+
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.template import Context, Template
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from .models import Profile
+from test_helpers import make_upload
+from .images import thumbnail_names
+from .models import DEFAULT_PICTURE, Profile
 from .services import ProfileService
 
 User = get_user_model()
@@ -51,3 +59,75 @@ class ProfileServiceTest(TestCase):
         profile = Profile.objects.create(user=self.user, bio="Test bio", headline="Test Headline")
         ProfileService.delete_profile(self.user)
         self.assertFalse(Profile.objects.filter(user=self.user).exists())
+
+
+class ProfilePictureThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(email='test@example.com', password='password', name='Test User')
+
+    def upload(self, picture):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProfileService.create_or_update_profile(user=self.user, headline='Headline', profile_picture=picture)
+        return Profile.objects.get(user=self.user)
+
+    def test_upload_makes_thumbnails(self):
+        """Test that an upload gets square WebP and JPEG thumbnails in every size, without metadata."""
+        profile = self.upload(make_upload('photo.jpg'))
+
+        self.assertEqual(sorted(profile.picture_variants, key=int), ['48', '96', '256'])
+        for size, by_extension in profile.picture_variants.items():
+            for extension, name in by_extension.items():
+                with default_storage.open(name) as file:
+                    image = Image.open(file)
+                    self.assertEqual(image.size, (int(size), int(size)))
+                    self.assertEqual(image.format, {'webp': 'WEBP', 'jpg': 'JPEG'}[extension])
+                    self.assertNotIn('exif', image.info)
+
+    def test_transparent_upload_falls_back_to_a_flat_jpeg(self):
+        """Test that a transparent picture keeps its alpha in WebP and is flattened in JPEG."""
+        profile = self.upload(make_upload())
+        with default_storage.open(profile.picture_variants['48']['webp']) as file:
+            self.assertEqual(Image.open(file).mode, 'RGBA')
+        with default_storage.open(profile.picture_variants['48']['jpg']) as file:
+            self.assertEqual(Image.open(file).mode, 'RGB')
+
+    def test_replacing_a_picture_deletes_its_thumbnails(self):
+        """Test that the thumbnails of a replaced picture are deleted and the new ones made."""
+        old = self.upload(make_upload('first.png')).picture_variants
+        new = self.upload(make_upload('second.jpg')).picture_variants
+
+        self.assertFalse(default_storage.exists(old['96']['webp']))
+        self.assertTrue(default_storage.exists(new['96']['webp']))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProfileService.delete_profile(self.user)
+        self.assertFalse(default_storage.exists(new['96']['webp']))
+
+    def test_avatar_tag(self):
+        """Test that the avatar tag offers every thumbnail and falls back to the smallest sharp JPEG."""
+        template = Template('{% load avatars %}{% avatar profile 50 %}')
+        profile = self.upload(make_upload())
+        html = template.render(Context({'profile': profile}))
+
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(f"{default_storage.url(profile.picture_variants['256']['webp'])} 256w", html)
+        self.assertIn(f'src="{default_storage.url(profile.picture_variants["96"]["jpg"])}"', html)
+        self.assertIn('sizes="50px"', html)
+
+        profile.picture_variants = {}
+        html = template.render(Context({'profile': profile}))
+        self.assertEqual(html, f'<img src="{profile.profile_picture.url}" width="50" height="50" alt="profile pic">\n')
+
+        default = Profile(user=self.user)
+        html = template.render(Context({'profile': default}))
+        self.assertEqual(default.profile_picture.name, DEFAULT_PICTURE)
+        self.assertIn(default_storage.url(thumbnail_names(DEFAULT_PICTURE)['48']['webp']), html)
+
+        for missing in ('', None):
+            html = template.render(Context({'profile': missing}))
+            self.assertIn(default_storage.url(thumbnail_names(DEFAULT_PICTURE)['48']['webp']), html)
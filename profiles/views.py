@@ -58,6 +58,7 @@ def get_profile(request, user_id: int):
         'bio': profile.bio,
         'education': profile.education,
         'profile_picture': profile.profile_picture.url,
+        'profile': profile,
         'is_owner': request.user.is_authenticated and request.user.id == user_id,
         'posts': posts
     }
@@ -0,0 +1,365 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+
+from posts.models import Post
+
+FTS_TABLE = 'search_post_fts'
+
+# Relative weight of a title match compared to a body match when ranking.
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Text search configuration of the PostgreSQL index (see migration 0002)
+POSTGRES_CONFIG = 'english'
+POSTGRES_INDEX = 'search_post_vector_idx'
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lower-cased word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list[str]: The tokens, in order of appearance.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SQLiteFTSEngine:
+    """
+    Full-text search backed by an SQLite FTS5 virtual table whose rowid is the post id.
+    Results are ranked with BM25 and every query term matches as a prefix.
+    """
+
+    # The index lives in the database, so any process (e.g. a task worker) can update it
+    in_process = False
+
+    def index_post(self, post):
+        """
+        Adds or refreshes a post in the index.
+
+        Args:
+            post (Post): The post to index.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.id])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+                [post.id, post.title, post.body]
+            )
+
+    def remove_post(self, post_id: int):
+        """
+        Removes a post from the index.
+
+        Args:
+            post_id (int): The ID of the post to remove.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+    def rebuild(self):
+        """
+        Rebuilds the whole index from the posts table.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, body) SELECT id, title, body FROM {Post._meta.db_table}'
+            )
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        Searches the index.
+
+        Args:
+            query (str): The user's search text.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[int]: The IDs of the matching posts, best match first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Quote every term so FTS5 operators typed by users are matched literally.
+        match = ' '.join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, %s, %s) LIMIT %s',
+                [match, TITLE_WEIGHT, BODY_WEIGHT, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchEngine:
+    """
+    Full-text search with PostgreSQL's text search over a GIN index of the posts' title
+    (weight A) and body (weight B) vectors, created by migration 0002. Results are ranked
+    with ts_rank and every query term matches as a prefix.
+    """
+
+    # PostgreSQL keeps the index up to date as posts are written, so there is no job to queue
+    in_process = True
+
+    def index_post(self, post):
+        """
+        Nothing to do: the index is maintained by PostgreSQL.
+
+        Args:
+            post (Post): The post to index.
+        """
+
+    def remove_post(self, post_id: int):
+        """
+        Nothing to do: the index is maintained by PostgreSQL.
+
+        Args:
+            post_id (int): The ID of the post to remove.
+        """
+
+    def rebuild(self):
+        """
+        Rebuilds the GIN index.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'REINDEX INDEX {POSTGRES_INDEX}')
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        Searches the index.
+
+        Args:
+            query (str): The user's search text.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[int]: The IDs of the matching posts, best match first.
+        """
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        # Underscores would be read as word separators; every other token is plain letters and digits
+        terms = tokenize(query.replace('_', ' '))
+        if not terms:
+            return []
+
+        # Every term as a prefix (`term:*`), all of them required, like the FTS5 engine
+        search_query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=POSTGRES_CONFIG)
+        vector = post_search_vector()
+        # Filtering on the same expression as the index lets PostgreSQL use it
+        return list(
+            Post.objects.annotate(search=vector).filter(search=search_query)
+            .annotate(rank=SearchRank(vector, search_query)).order_by('-rank', '-id')
+            .values_list('id', flat=True)[:limit]
+        )
+
+
+class InvertedIndexEngine:
+    """
+    Pure-Python fallback for databases without full-text search: an in-process inverted
+    index (term -> {post id: weighted term frequency}) with BM25 ranking and prefix
+    matching over a sorted vocabulary. It is built lazily from the posts table and kept
+    in sync by the same signals as the FTS5 index. Before each search it also reads the
+    posts written since (by `updated_at`), so writes made by other processes are found.
+    Posts deleted by other processes stay in the index, but are dropped when the results
+    are loaded. Its memory grows with the corpus, in every process.
+    """
+
+    # Updates must run in the process serving the searches, not in a task worker
+    in_process = True
+
+    # Posts are stamped before their transaction commits, so one saved this long before the
+    # newest post read may still become visible after it
+    refresh_overlap = timedelta(seconds=60)
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._vocabulary = []
+        self._high_water = None
+
+    def _terms_of(self, title: str, body: str) -> Counter:
+        terms = Counter()
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        for term in tokenize(body):
+            terms[term] += BODY_WEIGHT
+        return terms
+
+    def _add(self, post_id: int, title: str, body: str):
+        self._discard(post_id)
+        terms = self._terms_of(title, body)
+        for term, frequency in terms.items():
+            if term not in self._postings:
+                self._vocabulary.insert(bisect_left(self._vocabulary, term), term)
+            self._postings[term][post_id] = frequency
+        self._doc_terms[post_id] = list(terms)
+        self._doc_lengths[post_id] = sum(terms.values())
+
+    def _discard(self, post_id: int):
+        for term in self._doc_terms.pop(post_id, []):
+            postings = self._postings[term]
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary.pop(bisect_left(self._vocabulary, term))
+        self._doc_lengths.pop(post_id, None)
+
+    def _load(self, posts):
+        for post_id, title, body, updated_at in posts.values_list('id', 'title', 'body', 'updated_at').iterator():
+            self._add(post_id, title, body)
+            if self._high_water is None or updated_at > self._high_water:
+                self._high_water = updated_at
+
+    def _refresh(self):
+        """Builds the index on first use, then adds the posts written since the last refresh."""
+        if not self._built:
+            self.rebuild()
+        elif self._high_water is None:
+            self._load(Post.objects.all())
+        else:
+            self._load(Post.objects.filter(updated_at__gte=self._high_water - self.refresh_overlap))
+
+    def index_post(self, post):
+        """
+        Adds or refreshes a post in the index.
+
+        Args:
+            post (Post): The post to index.
+        """
+        with self._lock:
+            if self._built:
+                self._add(post.id, post.title, post.body)
+
+    def remove_post(self, post_id: int):
+        """
+        Removes a post from the index.
+
+        Args:
+            post_id (int): The ID of the post to remove.
+        """
+        with self._lock:
+            if self._built:
+                self._discard(post_id)
+
+    def rebuild(self):
+        """
+        Rebuilds the whole index from the posts table.
+        """
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._vocabulary = []
+            self._high_water = None
+            self._load(Post.objects.all())
+            self._built = True
+
+    def _expand(self, prefix: str) -> list[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + '\U0010ffff')
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """
+        Searches the index.
+
+        Args:
+            query (str): The user's search text.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[int]: The IDs of the matching posts, best match first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            self._refresh()
+            documents = len(self._doc_lengths)
+            if not documents:
+                return []
+            average_length = sum(self._doc_lengths.values()) / documents
+
+            scores, matched = defaultdict(float), None
+            for term in terms:
+                term_matches = set()
+                for expanded in self._expand(term):
+                    postings = self._postings[expanded]
+                    idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for post_id, frequency in postings.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[post_id] / average_length)
+                        scores[post_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                        term_matches.add(post_id)
+                # Every query term has to match, like FTS5's implicit AND.
+                matched = term_matches if matched is None else matched & term_matches
+
+        return sorted(matched, key=lambda post_id: (-scores[post_id], -post_id))[:limit]
+
+
+def post_search_vector():
+    """
+    Returns the weighted text search vector of a post, as indexed by migration 0002.
+
+    Returns:
+        CombinedSearchVector: The title (weight A) and body (weight B) vectors.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return (SearchVector('title', weight='A', config=POSTGRES_CONFIG)
+            + SearchVector('body', weight='B', config=POSTGRES_CONFIG))
+
+
+def fts5_available() -> bool:
+    """
+    Checks whether the default database is SQLite with the FTS5 index table created.
+
+    Returns:
+        bool: True if the FTS5 engine can be used.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+_engine = None
+
+
+def get_search_engine():
+    """
+    Returns the search engine for the current database, creating it on first use.
+    The `SEARCH_ENGINE` setting ('auto', 'fts5', 'postgres' or 'inverted') forces a choice.
+
+    Returns:
+        SQLiteFTSEngine | PostgresSearchEngine | InvertedIndexEngine: The engine.
+    """
+    global _engine
+    if _engine is None:
+        choice = getattr(settings, 'SEARCH_ENGINE', 'auto')
+        if choice == 'fts5' or (choice == 'auto' and fts5_available()):
+            _engine = SQLiteFTSEngine()
+        elif choice == 'postgres' or (choice == 'auto' and connection.vendor == 'postgresql'):
+            _engine = PostgresSearchEngine()
+        else:
+            _engine = InvertedIndexEngine()
+    return _engine
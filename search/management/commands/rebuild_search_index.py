@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from search.engines import get_search_engine
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of posts from the posts table.'
+
+    def handle(self, *args, **options):
+        engine = get_search_engine()
+        engine.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search index with {type(engine).__name__}.'))
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+POSTGRES_CONFIG = 'english'
+POSTGRES_INDEX = 'search_post_vector_idx'
+
+
+def search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # The same expression as search.engines.post_search_vector, which queries have to match
+    vector = (SearchVector('title', weight='A', config=POSTGRES_CONFIG)
+              + SearchVector('body', weight='B', config=POSTGRES_CONFIG))
+    return GinIndex(vector, name=POSTGRES_INDEX)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('posts', 'Post'), search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('posts', 'Post'), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_post_fts_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
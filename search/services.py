@@ -1,6 +1,8 @@
-from django.db.models import Q
-from posts.models import Post, Tag
-from posts.services import update_post_metadata
+from django.conf import settings
+from posts.models import Post
+from posts.services import TagRepository, update_post_metadata
+from posts.tags import normalize_tag_name
+from .engines import get_search_engine
 
 class SearchRepository:
     
@@ -9,31 +11,30 @@ class SearchRepository:
         """
         Searches posts by title, body, or tag.
 
+        Title and body matches come from the full-text index, ranked by relevance;
+        posts carrying a tag named after the query follow them, newest first.
+
         Args:
             query_post_name: The name of the post or tag to search for.
 
         Returns:
-            QuerySet: A queryset of filtered posts.
+            list[Post]: The matching posts, best match first.
         """
-        # Search for posts by title or body using Q objects
-        posts_by_title_or_body = Post.objects.filter(
-            Q(title__icontains=query_post_name) | Q(body__icontains=query_post_name)
-        )
-        
-        # Capitalize the first letter of the tag query and filter by tags
-        query_tag_name = query_post_name.capitalize()
-        tag = Tag.objects.filter(name=query_tag_name).first()
+        limit = settings.SEARCH_MAX_RESULTS
+        if not query_post_name:
+            return update_post_metadata(Post.objects.order_by('-created_at')[:limit], user=None)
 
-        if tag:
-            posts_by_tags = Post.objects.filter(tags=tag)
-        else:
-            posts_by_tags = Post.objects.none()
+        # Search for posts by title or body through the full-text index
+        post_ids = get_search_engine().search(query_post_name, limit)
 
-        # Combine the two queries using Q objects
-        posts = Post.objects.filter(
-            Q(id__in=posts_by_title_or_body.values_list('id', flat=True)) | 
-            Q(id__in=posts_by_tags.values_list('id', flat=True))
-        ).distinct()
+        # Normalize the query as a tag name and add the posts tagged with it
+        tag_id = TagRepository.lookup_id(normalize_tag_name(query_post_name))
+        if tag_id is not None:
+            tagged_ids = Post.objects.filter(tags=tag_id).order_by('-created_at').values_list('id', flat=True)
+            matched = set(post_ids)
+            post_ids += [post_id for post_id in tagged_ids[:limit] if post_id not in matched]
 
-        # Update post metadata
-        return update_post_metadata(posts, user=None)
+        # Update post metadata and keep the ranking order
+        rank = {post_id: position for position, post_id in enumerate(post_ids[:limit])}
+        posts = update_post_metadata(Post.objects.filter(id__in=rank), user=None)
+        return sorted(posts, key=lambda post: rank[post.id])
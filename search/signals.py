@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Post
+from tasks.queue import enqueue_on_commit
+from .engines import get_search_engine
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    """Keeps the search index in sync when a post is created or edited, in a background job."""
+    engine = get_search_engine()
+    if engine.in_process:
+        engine.index_post(instance)
+    else:
+        enqueue_on_commit('search.index_post', instance.id)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    """Removes a deleted post from the search index, in a background job."""
+    engine = get_search_engine()
+    if engine.in_process:
+        engine.remove_post(instance.id)
+    else:
+        enqueue_on_commit('search.remove_post', instance.id)
@@ -0,0 +1,17 @@
+from posts.models import Post
+from tasks.registry import task
+from .engines import get_search_engine
+
+
+@task('search.index_post')
+def index_post(post_id):
+    """Adds or refreshes a post in the search index, unless it was deleted since."""
+    post = Post.objects.filter(id=post_id).first()
+    if post is not None:
+        get_search_engine().index_post(post)
+
+
+@task('search.remove_post')
+def remove_post(post_id):
+    """Removes a post from the search index."""
+    get_search_engine().remove_post(post_id)
@@ -1,3 +1,165 @@
-from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, TestCase, TransactionTestCase
+from django.utils import timezone
+from django.urls import reverse
+from posts.models import Post, Tag
+from posts.tags import tag_cache
+from profiles.models import Profile
+from . import engines
+from .engines import (
+    POSTGRES_INDEX, InvertedIndexEngine, PostgresSearchEngine, SQLiteFTSEngine, get_search_engine, post_search_vector,
+)
+from .services import SearchRepository
+
+User = get_user_model()
+
+
+class SearchTestMixin:
+    def setUp(self):
+        """Set up an author with a few posts."""
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        Profile.objects.create(user=self.author)
+        # The FTS5 index is updated by jobs dispatched on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.title_match = Post.objects.create(author=self.author, title='Deduction in practice', body='A story.')
+            self.body_match = Post.objects.create(author=self.author, title='Detectives',
+                                                  body='Sherlock is famous for his deductive reasoning.')
+            self.unrelated = Post.objects.create(author=self.author, title='Gardening', body='Tomatoes and basil.')
+
+
+class FullTextSearchTests(SearchTestMixin, TestCase):
+    def test_sqlite_uses_fts5(self):
+        """Test that the FTS5 engine is picked on SQLite."""
+        self.assertIsInstance(get_search_engine(), SQLiteFTSEngine)
+
+    def test_prefix_match_ranked(self):
+        """Test that query terms match as prefixes and title matches rank first."""
+        posts = SearchRepository.search_by_post_or_tag('deduct')
+        self.assertEqual([post.id for post in posts], [self.title_match.id, self.body_match.id])
+
+    def test_all_terms_must_match(self):
+        """Test that every query term has to match."""
+        posts = SearchRepository.search_by_post_or_tag('sherlock tomatoes')
+        self.assertEqual(posts, [])
+
+    def test_index_follows_edits_and_deletes(self):
+        """Test that the index is updated when a post is edited or deleted."""
+        self.unrelated.body = 'Growing tomatoes with deductive methods.'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.save()
+            self.body_match.delete()
+
+        posts = SearchRepository.search_by_post_or_tag('deductive')
+        self.assertEqual([post.id for post in posts], [self.unrelated.id])
+
+    def test_tag_match(self):
+        """Test that posts tagged with the query are included after text matches."""
+        self.unrelated.tags.add(Tag.objects.create(name='Deduction'))
+
+        posts = SearchRepository.search_by_post_or_tag('deduction')
+        self.assertEqual([post.id for post in posts], [self.title_match.id, self.unrelated.id])
+
+    def test_search_operators_are_literal(self):
+        """Test that FTS5 syntax in user input does not raise."""
+        self.assertEqual(SearchRepository.search_by_post_or_tag('"NEAR( title:*'), [])
+
+    def test_search_view(self):
+        """Test the search page renders the matching posts with their metadata."""
+        response = self.client.get(reverse('search_post'), {'post_name': 'gardening'})
+        self.assertEqual([post.id for post in response.context['posts']], [self.unrelated.id])
+        self.assertEqual(response.context['posts'][0].likes_count, 0)
+
+class AsyncSearchViewTests(TransactionTestCase):
+    # The async view searches on another thread, with its own connection, which only sees committed rows
+
+    def setUp(self):
+        """Set up an author with a committed post."""
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        Profile.objects.create(user=self.author)
+        self.post = Post.objects.create(author=self.author, title='Gardening', body='Tomatoes and basil.')
+        Post.objects.create(author=self.author, title='Detectives', body='Deductive reasoning.')
+
+    async def test_async_search_view(self):
+        """Test the async search page renders the same posts as the sync one."""
+        response = await AsyncClient().get(reverse('asearch_post'), {'post_name': 'gardening'})
+        self.assertEqual([post.id for post in response.context['posts']], [self.post.id])
+        self.assertContains(response, self.post.title)
+
+
+class InvertedIndexEngineTests(SearchTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.engine = InvertedIndexEngine()
+
+    def test_prefix_match_ranked(self):
+        """Test that query terms match as prefixes and title matches rank first."""
+        self.assertEqual(self.engine.search('deduct', 10), [self.title_match.id, self.body_match.id])
+
+    def test_all_terms_must_match(self):
+        """Test that every query term has to match."""
+        self.assertEqual(self.engine.search('sherlock reason', 10), [self.body_match.id])
+        self.assertEqual(self.engine.search('sherlock tomatoes', 10), [])
+
+    def test_index_and_remove(self):
+        """Test that indexing and removing posts updates the results."""
+        self.engine.search('warmup', 10)
+        self.unrelated.body = 'Deductive gardening.'
+        Post.objects.filter(pk=self.unrelated.pk).update(body=self.unrelated.body, updated_at=timezone.now())
+        self.engine.index_post(self.unrelated)
+        Post.objects.filter(pk=self.body_match.pk).delete()
+        self.engine.remove_post(self.body_match.id)
+
+        self.assertEqual(self.engine.search('deductive', 10), [self.unrelated.id])
+        self.assertEqual(self.engine.search('tomatoes', 10), [])
+
+    def test_writes_of_other_processes_are_found(self):
+        """Test that posts written without this process's signals are found by the next search."""
+        self.engine.search('warmup', 10)
+        Post.objects.filter(pk=self.unrelated.pk).update(body='Deductive gardening.', updated_at=timezone.now())
+        created = Post.objects.bulk_create([Post(author=self.author, title='Elementary', body='Deduce.')])[0]
+
+        self.assertEqual(self.engine.search('tomatoes', 10), [])
+        self.assertIn(self.unrelated.id, self.engine.search('deductive', 10))
+        self.assertEqual(self.engine.search('elementary', 10), [created.id])
+
+
+class SearchEngineChoiceTests(TestCase):
+    def setUp(self):
+        engines._engine = None
+        self.addCleanup(setattr, engines, '_engine', None)
+
+    def test_setting_forces_engine(self):
+        """Test that the SEARCH_ENGINE setting picks the engine."""
+        for choice, engine in (('fts5', SQLiteFTSEngine), ('postgres', PostgresSearchEngine),
+                               ('inverted', InvertedIndexEngine)):
+            engines._engine = None
+            with self.settings(SEARCH_ENGINE=choice):
+                self.assertIsInstance(get_search_engine(), engine)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL text search')
+class PostgresSearchEngineTests(SearchTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.engine = PostgresSearchEngine()
+
+    def test_prefix_match_ranked(self):
+        """Test that query terms match as prefixes and title matches rank first."""
+        self.assertEqual(self.engine.search('deduct', 10), [self.title_match.id, self.body_match.id])
+
+    def test_all_terms_must_match(self):
+        """Test that every query term has to match, and operators are literal."""
+        self.assertEqual(self.engine.search('sherlock tomatoes', 10), [])
+        self.assertEqual(self.engine.search('sherlock & !( reason_', 10), [self.body_match.id])
+
+    def test_search_uses_gin_index(self):
+        """Test that the query can use the GIN index."""
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        query = Post.objects.annotate(search=post_search_vector()).filter(search='deduct')
+        self.assertIn(POSTGRES_INDEX, query.explain())
@@ -4,4 +4,5 @@ from search import views
 urlpatterns = [
     path('search/', views.index, name='search_index'),
     path('posts/search/', views.search_post, name='search_post'),
+    path('posts/search/async/', views.asearch_post, name='asearch_post'),
 ]
\ No newline at end of file
@@ -1,4 +1,7 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
 from django.shortcuts import render
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from .services import SearchRepository
 
@@ -14,3 +17,25 @@ def search_post(request):
     posts = SearchRepository.search_by_post_or_tag(query_post_name)
     
     return render(request, 'home.html', {'posts': posts})
+
+
+def _search_in_thread(query_post_name):
+    try:
+        return SearchRepository.search_by_post_or_tag(query_post_name)
+    finally:
+        # The executor's threads keep their own connections, past any request's end
+        close_old_connections()
+
+
+@require_GET
+async def asearch_post(request):
+    """
+    Async version of `search_post`, for ASGI deployments. The full-text index is queried
+    with raw SQL, which has no async API, so the search runs in a thread. It is not
+    thread-sensitive: searches only read, so they run in parallel on the executor's threads
+    rather than queueing on the one thread shared by the async ORM.
+    """
+    request.user = await request.auser()
+    query_post_name = request.GET.get('post_name', '').strip()
+    posts = await sync_to_async(_search_in_thread, thread_sensitive=False)(query_post_name)
+    return render(request, 'home.html', {'posts': posts})
@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from tasks.models import Job
+
+
+admin.site.register(Job)
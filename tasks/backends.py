@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .registry import Task
+
+logger = logging.getLogger(__name__)
+
+
+class ImmediateBackend:
+    """
+    Runs each job in the calling thread as soon as it is enqueued, retrying without delay.
+    Meant for tests: the job's effects are visible right after it is dispatched, and the
+    error of its last attempt is raised to the caller.
+    """
+
+    transactional = False
+
+    def enqueue(self, task: Task, args: list, kwargs: dict):
+        for attempt in range(1, task.max_attempts + 1):
+            try:
+                task.func(*args, **kwargs)
+                return
+            except Exception:
+                if attempt == task.max_attempts:
+                    raise
+                logger.warning('Task %s failed (attempt %d), retrying.', task.name, attempt, exc_info=True)
+
+
+class ThreadPoolBackend:
+    """
+    Runs jobs on a pool of threads in the web process, retrying with backoff. Jobs that are
+    still queued when the process exits are lost, which is fine for work that can be redone
+    (cache invalidation, counter repair), and needs no separate worker process.
+    """
+
+    transactional = False
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=settings.TASKS_THREADS, thread_name_prefix='tasks')
+            return self._executor
+
+    def enqueue(self, task: Task, args: list, kwargs: dict):
+        self._get_executor().submit(self._run, task, args, kwargs)
+
+    @staticmethod
+    def _run(task: Task, args: list, kwargs: dict):
+        for attempt in range(1, task.max_attempts + 1):
+            try:
+                task.func(*args, **kwargs)
+                return
+            except Exception:
+                if attempt == task.max_attempts:
+                    logger.exception('Task %s failed after %d attempts.', task.name, attempt)
+                    return
+                logger.warning('Task %s failed (attempt %d), retrying.', task.name, attempt, exc_info=True)
+                time.sleep(task.retry_delay_after(attempt))
+            finally:
+                close_old_connections()
+
+
+class DatabaseBackend:
+    """
+    Stores each job as a `Job` row, for `run_workers` processes to claim and run. Jobs
+    survive restarts and are retried with backoff, also when a worker dies mid-job.
+    """
+
+    # Rows written in the caller's transaction are only claimable once it commits
+    transactional = True
+
+    def enqueue(self, task: Task, args: list, kwargs: dict):
+        from .models import Job
+
+        Job.objects.create(name=task.name, args=args, kwargs=kwargs, max_attempts=task.max_attempts)
+
+
+BACKENDS = {
+    'immediate': ImmediateBackend,
+    'thread': ThreadPoolBackend,
+    'database': DatabaseBackend,
+}
+
+_backends = {}
+
+
+def get_backend():
+    """
+    Returns the backend named by the `TASKS_BACKEND` setting ('immediate', 'thread' or
+    'database'), creating it on first use.
+
+    Returns:
+        ImmediateBackend | ThreadPoolBackend | DatabaseBackend: The backend.
+
+    Raises:
+        ValueError: If the setting names no backend.
+    """
+    name = settings.TASKS_BACKEND
+    if name not in _backends:
+        if name not in BACKENDS:
+            raise ValueError(f'Unknown task backend: {name}')
+        _backends[name] = BACKENDS[name]()
+    return _backends[name]
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core import checks
+
+# Caches that each process keeps to itself
+PROCESS_LOCAL_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@checks.register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Refuses the database backend when the caches are local to each process. Its jobs run
+    in `run_workers` processes, and the cache invalidations they cause (e.g. a profile
+    saved with its thumbnails) would never reach the web processes' caches.
+    """
+    if settings.TASKS_BACKEND != 'database':
+        return []
+    return [
+        checks.Error(
+            f"TASKS_BACKEND = 'database' needs a cache shared between processes, but the "
+            f"'{alias}' cache is {config['BACKEND']}.",
+            hint='Use a shared cache such as Redis or Memcached, or the thread task backend.',
+            id='tasks.E001',
+        )
+        for alias, config in settings.CACHES.items()
+        if config['BACKEND'] in PROCESS_LOCAL_CACHES
+    ]
@@ -0,0 +1,48 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the jobs stored by the database task backend (TASKS_BACKEND = "database") on '
+        'worker threads, until interrupted. Several processes can run side by side.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=2, help='Worker threads in this process.')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed at once by a thread.')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds a thread waits when no job is due.')
+        parser.add_argument('--stale-after', type=float, default=300.0,
+                            help='Seconds after which a running job is assumed abandoned and claimed again.')
+        parser.add_argument('--once', action='store_true', help='Run the due jobs, then exit.')
+
+    def handle(self, *args, **options):
+        worker = Worker(batch_size=options['batch_size'], stale_after=options['stale_after'])
+        if options['once']:
+            total = 0
+            while ran := worker.run_once():
+                total += ran
+            self.stdout.write(self.style.SUCCESS(f'Ran {total} job(s).'))
+            return
+
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=worker.run, args=(stop, options['poll_interval']), name=f'worker-{i}')
+            for i in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"Running {len(threads)} worker thread(s); press Ctrl+C to stop.")
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping after the current jobs...')
+            stop.set()
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,47 @@
+import json
+
+from django.db import transaction
+
+from .backends import get_backend
+from .registry import get_task
+
+
+def enqueue(name: str, *args, **kwargs):
+    """
+    Dispatches a job to the configured backend.
+
+    Args:
+        name (str): The name of a registered task.
+        *args: The task's positional arguments, JSON serializable.
+        **kwargs: The task's keyword arguments, JSON serializable.
+
+    Raises:
+        ValueError: If the task is unknown.
+        TypeError: If the arguments are not JSON serializable.
+    """
+    task = get_task(name)
+    # Every backend gets the arguments as the database backend would store them
+    payload = json.loads(json.dumps([list(args), kwargs]))
+    get_backend().enqueue(task, *payload)
+
+
+def enqueue_on_commit(name: str, *args, **kwargs):
+    """
+    Dispatches a job once the current transaction commits, so it sees the committed writes
+    and is never run for a rolled back one. Outside a transaction it is dispatched at once.
+    The database backend stores the job in the transaction instead, so it is committed, or
+    rolled back, together with the writes.
+
+    Args:
+        name (str): The name of a registered task.
+        *args: The task's positional arguments, JSON serializable.
+        **kwargs: The task's keyword arguments, JSON serializable.
+
+    Raises:
+        ValueError: If the task is unknown.
+    """
+    get_task(name)
+    if get_backend().transactional:
+        enqueue(name, *args, **kwargs)
+    else:
+        transaction.on_commit(lambda: enqueue(name, *args, **kwargs))
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    max_attempts: int
+    retry_delay: float
+
+    def retry_delay_after(self, attempt: int) -> float:
+        """Returns the seconds to wait before retrying after the given failed attempt (doubling each time)."""
+        return self.retry_delay * 2 ** (attempt - 1)
+
+
+_tasks: dict[str, Task] = {}
+
+
+def task(name: str, max_attempts: int = 3, retry_delay: float = 1.0):
+    """
+    Registers a function as a task that `enqueue` can run in the background.
+    Its arguments must be JSON serializable, since the database backend stores them.
+
+    Args:
+        name (str): The name jobs refer to the task by, e.g. 'posts.repair_counters'.
+        max_attempts (int): How many times the task is tried before it is given up.
+        retry_delay (float): Seconds before the first retry; later retries wait twice as long as the previous one.
+
+    Returns:
+        The decorator, which returns the function unchanged.
+    """
+    def register(func):
+        _tasks[name] = Task(name, func, max_attempts, retry_delay)
+        return func
+    return register
+
+
+def get_task(name: str) -> Task:
+    """
+    Returns a registered task.
+
+    Args:
+        name (str): The name of the task.
+
+    Returns:
+        Task: The task.
+
+    Raises:
+        ValueError: If no task has that name.
+    """
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise ValueError(f'Unknown task: {name}') from None
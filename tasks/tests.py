@@ -0,0 +1,154 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .backends import get_backend
+from .checks import check_shared_cache
+from .models import Job
+from .queue import enqueue, enqueue_on_commit
+from .registry import get_task, task
+from .worker import Worker
+
+calls = []
+done = threading.Event()
+
+
+@task('tests.record')
+def record(value):
+    calls.append(value)
+    done.set()
+
+
+@task('tests.flaky', max_attempts=3, retry_delay=0.0)
+def flaky(failures):
+    calls.append('attempt')
+    if len(calls) <= failures:
+        raise RuntimeError('Flaky failure')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        done.clear()
+
+    def test_unknown_task(self):
+        """Test that enqueueing an unregistered task raises."""
+        with self.assertRaises(ValueError):
+            enqueue('tests.missing')
+        with self.assertRaises(ValueError):
+            get_task('tests.missing')
+
+    def test_arguments_must_be_json(self):
+        """Test that arguments the database backend could not store are rejected by every backend."""
+        with self.assertRaises(TypeError):
+            enqueue('tests.record', {1, 2})
+
+    def test_immediate_backend_retries(self):
+        """Test that the immediate backend retries a failing task and raises its last error."""
+        with self.assertLogs('tasks', 'WARNING'):
+            enqueue('tests.flaky', 2)
+        self.assertEqual(calls, ['attempt'] * 3)
+
+        calls.clear()
+        with self.assertLogs('tasks', 'WARNING'), self.assertRaises(RuntimeError):
+            enqueue('tests.flaky', 3)
+        self.assertEqual(len(calls), 3)
+
+    def test_enqueue_on_commit_waits_for_the_commit(self):
+        """Test that a job dispatched on commit runs after the commit, and never after a rollback."""
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_on_commit('tests.record', 'committed')
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['committed'])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                enqueue_on_commit('tests.record', 'rolled back')
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+
+    @override_settings(TASKS_BACKEND='thread')
+    def test_thread_backend(self):
+        """Test that the thread backend runs jobs off the calling thread."""
+        enqueue('tests.record', 'threaded')
+        self.assertTrue(done.wait(5))
+        self.assertEqual(calls, ['threaded'])
+
+
+@override_settings(TASKS_BACKEND='database')
+class DatabaseBackendTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_are_stored_in_the_transaction(self):
+        """Test that the database backend writes the job with the caller's transaction."""
+        self.assertTrue(get_backend().transactional)
+        with transaction.atomic():
+            enqueue_on_commit('tests.record', 'stored')
+            self.assertEqual(Job.objects.get().args, ['stored'])
+        with transaction.atomic():
+            enqueue_on_commit('tests.record', 'rolled back')
+            transaction.set_rollback(True)
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(calls, [])
+
+    def test_worker_runs_and_deletes_jobs(self):
+        """Test that a worker runs due jobs in order and deletes them."""
+        enqueue('tests.record', 'first')
+        enqueue('tests.record', 'second')
+        Job.objects.create(name='tests.record', args=['later'], run_after=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(Worker().run_once(), 2)
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertEqual(list(Job.objects.values_list('args', flat=True)), [['later']])
+
+    def test_worker_retries_then_gives_up(self):
+        """Test that failed jobs are retried with backoff and marked failed after their last attempt."""
+        enqueue('tests.flaky', 5)
+        worker = Worker()
+        for attempt in range(1, 4):
+            with self.assertLogs('tasks', 'WARNING'):
+                self.assertEqual(worker.run_once(), 1)
+            job = Job.objects.get()
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn('Flaky failure', job.last_error)
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(worker.run_once(), 0)
+
+    def test_unknown_and_stale_jobs(self):
+        """Test that jobs of unregistered tasks fail at once, and abandoned running jobs are claimed again."""
+        unknown = Job.objects.create(name='tests.missing')
+        stale = Job.objects.create(name='tests.record', args=['stale'], status=Job.RUNNING,
+                                   locked_at=timezone.now() - timedelta(hours=1))
+        with self.assertLogs('tasks', 'ERROR'):
+            Worker().run_once()
+
+        unknown.refresh_from_db()
+        self.assertEqual((unknown.status, unknown.attempts), (Job.FAILED, 1))
+        self.assertFalse(Job.objects.filter(id=stale.id).exists())
+        self.assertEqual(calls, ['stale'])
+
+    def test_run_workers_once(self):
+        """Test that run_workers --once drains the due jobs."""
+        for value in range(3):
+            enqueue('tests.record', value)
+        out = StringIO()
+        call_command('run_workers', '--once', '--batch-size', '2', stdout=out)
+        self.assertIn('Ran 3 job(s)', out.getvalue())
+        self.assertEqual(calls, [0, 1, 2])
+
+    def test_shared_cache_is_required(self):
+        """Test that the database backend is refused while the caches are local to each process."""
+        errors = check_shared_cache(None)
+        self.assertEqual({error.id for error in errors}, {'tasks.E001'})
+
+        backends = {alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'post_cards')}
+        with override_settings(CACHES=backends):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(TASKS_BACKEND='thread'):
+            self.assertEqual(check_shared_cache(None), [])
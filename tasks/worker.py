@@ -0,0 +1,106 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Claims and runs the jobs stored by the database backend. Several workers, in threads or
+    processes, can share the table: a job is claimed in a write transaction (with SKIP LOCKED
+    where the database supports it), so it is run by one worker at a time.
+    """
+
+    def __init__(self, batch_size: int = 10, stale_after: float = 300.0):
+        """
+        Args:
+            batch_size (int): The number of jobs claimed at once.
+            stale_after (float): Seconds after which a running job is assumed to belong to a
+                dead worker and is claimed again.
+        """
+        self.batch_size = batch_size
+        self.stale_after = stale_after
+
+    def claim(self) -> list[Job]:
+        """
+        Marks the next due jobs as running.
+
+        Returns:
+            list[Job]: The claimed jobs, oldest first.
+        """
+        now = timezone.now()
+        due = (
+            Q(status=Job.PENDING, run_after__lte=now)
+            | Q(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=self.stale_after))
+        )
+        with transaction.atomic():
+            jobs = list(Job.objects.select_for_update(skip_locked=True).filter(due).order_by('id')[:self.batch_size])
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(status=Job.RUNNING, locked_at=now)
+        return jobs
+
+    def run_job(self, job: Job) -> bool:
+        """
+        Runs a claimed job. It is deleted if it succeeds; otherwise it is scheduled for a retry,
+        or marked as failed after its last attempt.
+
+        Args:
+            job (Job): The claimed job.
+
+        Returns:
+            bool: True if the job succeeded.
+        """
+        job.attempts += 1
+        task = None
+        try:
+            task = get_task(job.name)
+            task.func(*job.args, **job.kwargs)
+        except Exception:
+            job.last_error = traceback.format_exc()
+            # A job whose task is not registered cannot succeed on a retry
+            if task is None or job.attempts >= job.max_attempts:
+                logger.error('Job %s (%s) failed after %d attempts.', job.id, job.name, job.attempts)
+                job.status = Job.FAILED
+            else:
+                logger.warning('Job %s (%s) failed (attempt %d), retrying.', job.id, job.name, job.attempts)
+                job.status = Job.PENDING
+                job.run_after = timezone.now() + timedelta(seconds=task.retry_delay_after(job.attempts))
+            job.locked_at = None
+            job.save(update_fields=['attempts', 'status', 'run_after', 'locked_at', 'last_error'])
+            return False
+        job.delete()
+        return True
+
+    def run_once(self) -> int:
+        """
+        Claims a batch of due jobs and runs them.
+
+        Returns:
+            int: The number of jobs run.
+        """
+        jobs = self.claim()
+        try:
+            for job in jobs:
+                self.run_job(job)
+        finally:
+            close_old_connections()
+        return len(jobs)
+
+    def run(self, stop, poll_interval: float = 1.0):
+        """
+        Runs jobs until `stop` is set, waiting `poll_interval` seconds whenever none is due.
+
+        Args:
+            stop (threading.Event): Set to make the worker return after its current batch.
+            poll_interval (float): Seconds to wait when there is no due job.
+        """
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(poll_interval)
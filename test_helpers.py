@@ -1,4 +1,8 @@
+import io
+
+from PIL import Image
 from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
 
@@ -14,3 +18,33 @@ def assert_redirect(response, expected_url_name, **kwargs):
     assert response.status_code == 302, f"Expected status code 302, but got {response.status_code}."
     expected_url = reverse(expected_url_name, kwargs=kwargs)
     assert response.url == expected_url, f"Expected redirect to '{expected_url}', but got '{response.url}'."
+
+
+def query_plan(queryset):
+    """Helper method to return SQLite's EXPLAIN QUERY PLAN details for a queryset, one line per step."""
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' | '.join(row[-1] for row in cursor.fetchall())
+
+
+def make_upload(name='me.png', size=(600, 400)):
+    """Helper method to return an uploaded PNG with transparency, and a JPEG with EXIF metadata when `name` ends with .jpg."""
+    output = io.BytesIO()
+    if name.endswith('.jpg'):
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        Image.new('RGB', size, 'red').save(output, 'JPEG', exif=exif)
+    else:
+        Image.new('RGBA', size, (0, 0, 255, 128)).save(output, 'PNG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg' if name.endswith('.jpg') else 'image/png')
+
+
+def clear_caches():
+    """Helper method to empty every configured cache, e.g. the default and the post card caches."""
+    from django.core.cache import caches
+
+    for backend in caches.all():
+        backend.clear()
@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class StoredFile(models.Model):
+    """
+    A file saved by `ContentHashedStorage`, with the number of references to it. Each save
+    of the same content adds a reference, each delete removes one, and the file is removed
+    with its last reference.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount} references)'
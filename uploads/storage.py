@@ -0,0 +1,76 @@
+import hashlib
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+from .models import StoredFile
+
+# <directory>/<first two hex digits>/<sha256 of the content>.<extension>
+HASHED_NAME = re.compile(r'(?:.*/)?([0-9a-f]{2})/\1[0-9a-f]{62}(?:\.\w+)?')
+
+
+class ContentHashedStorage(FileSystemStorage):
+    """
+    A file system storage that names files after the SHA-256 of their content, so identical
+    uploads are stored once and a name always refers to the same bytes. References are
+    counted in `StoredFile`: `save` adds one, `delete` removes one, and the file is only
+    removed with its last reference. Files it did not save (e.g. the default profile
+    picture) are never deleted by it.
+    """
+
+    def __init__(self, **kwargs):
+        # Writing the same name twice writes the same bytes
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def hashed_name(name: str, content) -> str:
+        """
+        Returns the name a file is stored under: the directory of `name`, a two-character
+        fan-out directory, and the content's hash with the extension of `name`.
+        """
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(posixpath.dirname(name), digest[:2], digest + extension)
+
+    @staticmethod
+    def is_immutable(name: str) -> bool:
+        """Whether a name is a content hash, whose content therefore never changes."""
+        return HASHED_NAME.fullmatch(name) is not None
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(self.generate_filename(name), content)
+
+        with transaction.atomic():
+            stored, created = StoredFile.objects.select_for_update().get_or_create(
+                name=name, defaults={'size': content.size}
+            )
+            if not created:
+                StoredFile.objects.filter(id=stored.id).update(refcount=F('refcount') + 1)
+            if created or not self.exists(name):
+                self._save(name, content)
+        return name
+
+    def delete(self, name):
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None:
+                return
+            if stored.refcount > 1:
+                StoredFile.objects.filter(id=stored.id).update(refcount=F('refcount') - 1)
+                return
+            stored.delete()
+            # Under the row lock, so a concurrent save of the same content waits and writes it again
+            super().delete(name)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from profiles.models import Profile
+from profiles.services import ProfileService
+from test_helpers import make_upload
+from .models import StoredFile
+from .storage import ContentHashedStorage
+
+User = get_user_model()
+
+
+class MediaRootMixin:
+    def setUp(self):
+        """Point MEDIA_ROOT to a temporary directory."""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ContentHashedStorageTests(MediaRootMixin, TestCase):
+    def test_identical_files_are_stored_once(self):
+        """Test that saving the same content twice gives one file with two references."""
+        first = default_storage.save('profile_pictures/a.PNG', ContentFile(b'same bytes'))
+        second = default_storage.save('profile_pictures/b.png', ContentFile(b'same bytes'))
+
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^profile_pictures/([0-9a-f]{2})/\1[0-9a-f]{62}\.png$')
+        self.assertTrue(ContentHashedStorage.is_immutable(first))
+        self.assertEqual(StoredFile.objects.get(name=first).refcount, 2)
+        self.assertEqual(os.listdir(os.path.dirname(default_storage.path(first))), [os.path.basename(first)])
+
+    def test_file_is_deleted_with_its_last_reference(self):
+        """Test that deleting removes a reference, and the file only goes with the last one."""
+        name = default_storage.save('profile_pictures/a.png', ContentFile(b'bytes'))
+        default_storage.save('profile_pictures/a.png', ContentFile(b'bytes'))
+
+        default_storage.delete(name)
+        self.assertTrue(default_storage.exists(name))
+        default_storage.delete(name)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_unmanaged_files_are_kept(self):
+        """Test that files the storage did not save, like the default picture, are never deleted."""
+        os.makedirs(os.path.join(self.media_root, 'profile_pictures'))
+        with open(os.path.join(self.media_root, 'profile_pictures', 'default.png'), 'wb') as file:
+            file.write(b'default')
+        default_storage.delete('profile_pictures/default.png')
+        self.assertTrue(default_storage.exists('profile_pictures/default.png'))
+        self.assertFalse(ContentHashedStorage.is_immutable('profile_pictures/default.png'))
+
+    def test_shared_picture_outlives_one_account(self):
+        """Test that a picture shared by two profiles is kept until both accounts are deleted."""
+        users = [User.objects.create_user(email=f'user{i}@ws.com', password='password', name='User') for i in range(2)]
+        with self.captureOnCommitCallbacks(execute=True):
+            for user in users:
+                ProfileService.create_or_update_profile(user=user, profile_picture=make_upload())
+        profile = Profile.objects.get(user=users[0])
+        names = [profile.profile_picture.name] + [
+            name for by_extension in profile.picture_variants.values() for name in by_extension.values()
+        ]
+        self.assertEqual(Profile.objects.get(user=users[1]).picture_variants, profile.picture_variants)
+        self.assertEqual(set(StoredFile.objects.values_list('refcount', flat=True)), {2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            users[0].delete()
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            users[1].delete()
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+        self.assertFalse(StoredFile.objects.exists())
+
+
+class ServeMediaTests(MediaRootMixin, TestCase):
+    def test_hashed_files_are_immutable(self):
+        """Test that content-hashed files are served with far-future cache headers and revalidate to 304."""
+        name = default_storage.save('profile_pictures/a.png', ContentFile(b'bytes'))
+        response = self.client.get(reverse('media', args=[name]))
+        self.assertEqual(b''.join(response.streaming_content), b'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        response = self.client.get(reverse('media', args=[name]), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_files_are_cached_briefly(self):
+        """Test that files with fixed names are cached for MEDIA_CACHE_MAX_AGE only, and missing files 404."""
+        os.makedirs(os.path.join(self.media_root, 'profile_pictures'))
+        with open(os.path.join(self.media_root, 'profile_pictures', 'default.png'), 'wb') as file:
+            file.write(b'default')
+        with self.settings(MEDIA_CACHE_MAX_AGE=60):
+            response = self.client.get(reverse('media', args=['profile_pictures/default.png']))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(self.client.get(reverse('media', args=['profile_pictures/missing.png'])).status_code, 404)
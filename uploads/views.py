@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+from django.views.static import serve
+
+
+@require_GET
+def serve_media(request, path):
+    """
+    Serves an uploaded file. Content-hashed names never change content, so browsers and
+    CDNs may keep them for a year without revalidating; other files (e.g. the default
+    profile picture) are cached for MEDIA_CACHE_MAX_AGE seconds.
+
+    Args:
+        request: The HTTP request object.
+        path (str): The file's storage name.
+
+    Returns:
+        FileResponse: The file, or a 304 response if the client's copy is current.
+
+    Raises:
+        Http404: If there is no such file.
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if getattr(default_storage, 'is_immutable', lambda name: False)(path):
+        patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
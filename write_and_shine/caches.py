@@ -0,0 +1,45 @@
+import os
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+
+
+def cache_profile(prefix: str, max_entries: int, environ=os.environ) -> dict:
+    """
+    Builds the settings of a cache from the environment variables starting with `prefix`.
+
+    <prefix>_BACKEND selects `locmem` (the default), `redis` or `memcached`, and
+    <prefix>_LOCATION the server (e.g. redis://localhost:6379/1); both fall back to
+    CACHE_BACKEND and CACHE_LOCATION, and keys are prefixed so caches can share a server.
+    Local memory caches keep at most <prefix>_MAX_ENTRIES entries, `max_entries` by default,
+    and cull a third of them when full.
+
+    Args:
+        prefix (str): The prefix of the environment variables, e.g. `POST_CARD_CACHE`.
+        max_entries (int): The default size of a local memory cache.
+        environ: The environment to read the settings from.
+
+    Returns:
+        dict: The settings of the cache.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    backend = environ.get(f'{prefix}_BACKEND', environ.get('CACHE_BACKEND', 'locmem'))
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f'Unsupported {prefix}_BACKEND: {backend}')
+
+    if backend == 'locmem':
+        return {
+            'BACKEND': CACHE_BACKENDS[backend],
+            'LOCATION': prefix.lower(),
+            'OPTIONS': {'MAX_ENTRIES': int(environ.get(f'{prefix}_MAX_ENTRIES', max_entries))},
+        }
+    return {
+        'BACKEND': CACHE_BACKENDS[backend],
+        'LOCATION': environ.get(f'{prefix}_LOCATION', environ.get('CACHE_LOCATION')),
+        'KEY_PREFIX': prefix.lower(),
+    }
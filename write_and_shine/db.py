@@ -0,0 +1,82 @@
+import os
+
+
+def sqlite_pragmas(environ=os.environ) -> list[str]:
+    """
+    Returns the PRAGMA statements run on every new SQLite connection.
+
+    WAL lets readers run alongside a writer, and synchronous=NORMAL only syncs at
+    checkpoints, which is safe under WAL. busy_timeout makes a blocked writer wait for the
+    lock instead of failing at once, and the mmap and page cache sizes keep hot pages in memory.
+
+    Args:
+        environ: The environment to read the SQLITE_* overrides from.
+
+    Returns:
+        list[str]: The PRAGMA statements.
+    """
+    return [
+        f"PRAGMA journal_mode={environ.get('SQLITE_JOURNAL_MODE', 'WAL')}",
+        f"PRAGMA synchronous={environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA busy_timeout={int(environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"PRAGMA mmap_size={int(environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))}",
+        # Negative sizes are in KiB
+        f"PRAGMA cache_size={int(environ.get('SQLITE_CACHE_SIZE', -64 * 1024))}",
+    ]
+
+
+def database_profile(base_dir, environ=os.environ) -> dict:
+    """
+    Builds the default database settings from the environment.
+
+    DB_ENGINE selects `sqlite` (the default) or `postgresql`. SQLite uses DB_NAME (a file
+    path, `db.sqlite3` in the project by default) with the pragmas of `sqlite_pragmas`, and
+    takes its write lock when a transaction starts so writers queue on busy_timeout instead of
+    failing on lock upgrades. PostgreSQL reads DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and
+    DB_PORT. It keeps connections open for DB_CONN_MAX_AGE seconds with health checks, or,
+    with DB_POOL=1, uses psycopg's connection pool instead.
+
+    Args:
+        base_dir: The project directory, where the default SQLite file lives.
+        environ: The environment to read the settings from.
+
+    Returns:
+        dict: The settings of the default database.
+
+    Raises:
+        ValueError: If DB_ENGINE is not supported.
+    """
+    engine = environ.get('DB_ENGINE', 'sqlite')
+
+    if engine == 'sqlite':
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('DB_NAME', base_dir / 'db.sqlite3'),
+            'OPTIONS': {
+                'init_command': '; '.join(sqlite_pragmas(environ)),
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+
+    if engine == 'postgresql':
+        profile = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': environ.get('DB_NAME', 'write_and_shine'),
+            'USER': environ.get('DB_USER', ''),
+            'PASSWORD': environ.get('DB_PASSWORD', ''),
+            'HOST': environ.get('DB_HOST', 'localhost'),
+            'PORT': environ.get('DB_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+        }
+        if environ.get('DB_POOL') == '1':
+            # Pooled connections are returned to the pool, so they must not be persistent
+            profile['CONN_MAX_AGE'] = 0
+            profile['OPTIONS'] = {'pool': {
+                'min_size': int(environ.get('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(environ.get('DB_POOL_MAX_SIZE', 10)),
+            }}
+        else:
+            profile['CONN_MAX_AGE'] = int(environ.get('DB_CONN_MAX_AGE', 60))
+        return profile
+
+    raise ValueError(f'Unsupported DB_ENGINE: {engine}')
@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from write_and_shine.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+# The metrics of the request being handled, if it is instrumented
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view runs more queries than its budget in QUERY_BUDGETS allows."""
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    sql_ms: float = 0.0
+    template_ms: float = 0.0
+    total_ms: float = 0.0
+    template_depth: int = 0
+
+
+class ViewStats:
+    """
+    Keeps the metrics of the latest requests of each view, in process, for percentiles.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, view_name: str, metrics: RequestMetrics):
+        with self._lock:
+            self._samples[view_name].append(metrics)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the p50/p95/p99 of every metric, for each view.
+
+        Returns:
+            dict: View names mapped to their request count and metric percentiles.
+        """
+        with self._lock:
+            samples = {view_name: list(metrics) for view_name, metrics in self._samples.items()}
+        return {
+            view_name: {
+                'requests': len(metrics),
+                **{
+                    field: {f'p{pct}': percentile([getattr(m, field) for m in metrics], pct) for pct in (50, 95, 99)}
+                    for field in ('queries', 'sql_ms', 'template_ms', 'total_ms')
+                },
+            }
+            for view_name, metrics in samples.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+view_stats = ViewStats(settings.INSTRUMENTATION_WINDOW)
+
+
+def _count_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.sql_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedTemplate(Template):
+    """A Django template that adds its render time to the current request's metrics."""
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        # Templates rendered while rendering another one (e.g. from a template tag) are already timed
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render times recorded by InstrumentationMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def _install_query_counter(connection, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+# Installed on every connection, so queries run from sync_to_async threads (which copy the
+# request's context) are counted too. It does nothing outside instrumented code.
+connection_created.connect(_install_query_counter)
+
+
+@contextmanager
+def instrument():
+    """
+    Records the queries, SQL time and template render time of the code run inside it.
+
+    Yields:
+        RequestMetrics: The metrics, complete once the block exits.
+    """
+    for connection in connections.all(initialized_only=True):
+        _install_query_counter(connection)
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.total_ms = (time.perf_counter() - started) * 1000
+        _current.reset(token)
+
+
+def check_budget(view_name: str, metrics: RequestMetrics):
+    """
+    Logs, or raises when QUERY_BUDGET_ACTION is 'raise', if a view exceeded its query budget.
+
+    Args:
+        view_name (str): The URL name of the view.
+        metrics (RequestMetrics): The metrics of the request.
+
+    Raises:
+        QueryBudgetExceeded: If the budget is exceeded and QUERY_BUDGET_ACTION is 'raise'.
+    """
+    budget = settings.QUERY_BUDGETS.get(view_name)
+    if budget is None or metrics.queries <= budget:
+        return
+    message = f'{view_name} ran {metrics.queries} queries, over its budget of {budget}.'
+    if settings.QUERY_BUDGET_ACTION == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class InstrumentationMiddleware:
+    """
+    Measures every request: query count, SQL time, template render time and wall time.
+
+    The numbers are sent in a Server-Timing header, kept per view in `view_stats`, and
+    checked against the view's query budget.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with instrument() as metrics:
+            response = self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        with instrument() as metrics:
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    @staticmethod
+    def finish(request, response, metrics):
+        match = request.resolver_match
+        view_name = (match.url_name or match.view_name) if match else 'unresolved'
+        view_stats.record(view_name, metrics)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.sql_ms:.1f};desc="{metrics.queries} queries"',
+            f'tpl;dur={metrics.template_ms:.1f}',
+            f'total;dur={metrics.total_ms:.1f}',
+        ])
+        check_budget(view_name, metrics)
+        return response
+
+
+@staff_member_required
+def instrumentation_stats(request):
+    """
+    Returns the rolling per-view request metrics of this process, and the hit/miss
+    counters of the post card cache, which with a per-process cache only this process sees.
+
+    Args:
+        request: The HTTP request object, from a staff user.
+
+    Returns:
+        JsonResponse: `views` (view names mapped to their metric percentiles) and
+        `post_card_cache` (hits, misses and hit rate).
+    """
+    from posts.fragments import post_card_cache_stats
+
+    return JsonResponse({'views': view_stats.snapshot(), 'post_card_cache': post_card_cache_stats()})
@@ -0,0 +1,137 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date
+
+LAST_MODIFIED_KEY = 'page-cache:last-modified'
+
+
+def _cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+# The latest stamp this process has seen, so a restarted stamp never goes back to it
+_latest_seen = 0.0
+
+
+def _seen(stamp: float) -> float:
+    global _latest_seen
+    _latest_seen = max(_latest_seen, stamp)
+    return stamp
+
+
+def _new_stamp() -> float:
+    return max(time.time(), _latest_seen + 1e-6)
+
+
+def last_modified() -> float:
+    """
+    Returns the time the public pages last changed. It is kept in the cache and moved
+    forward by `touch`. A missing stamp (a cold cache, or an evicted key) restarts at the
+    current time rather than at the latest change in the database: likes, profile edits and
+    deletions leave no time there, and an older stamp would serve pages cached before them.
+
+    Returns:
+        float: The timestamp of the last change.
+    """
+    stamp = _cache().get(LAST_MODIFIED_KEY)
+    if stamp is None:
+        stamp = _new_stamp()
+        if not _cache().add(LAST_MODIFIED_KEY, stamp, None):
+            stamp = _cache().get(LAST_MODIFIED_KEY, stamp)
+    return _seen(stamp)
+
+
+async def alast_modified() -> float:
+    """Async version of `last_modified`."""
+    stamp = await _cache().aget(LAST_MODIFIED_KEY)
+    if stamp is None:
+        stamp = _new_stamp()
+        if not await _cache().aadd(LAST_MODIFIED_KEY, stamp, None):
+            stamp = await _cache().aget(LAST_MODIFIED_KEY, stamp)
+    return _seen(stamp)
+
+
+def touch():
+    """Marks the public pages as changed, so every cached page is rendered again."""
+    _cache().set(LAST_MODIFIED_KEY, _seen(max(time.time(), last_modified() + 1e-6)), None)
+
+
+async def atouch():
+    """Async version of `touch`."""
+    await _cache().aset(LAST_MODIFIED_KEY, _seen(max(time.time(), await alast_modified() + 1e-6)), None)
+
+
+def touch_on_commit():
+    """Calls `touch` once the current transaction commits."""
+    transaction.on_commit(touch)
+
+
+class AnonymousPageCacheMiddleware(MiddlewareMixin):
+    """
+    Caches whole pages of the views in PAGE_CACHE_VIEWS for anonymous visitors.
+
+    Pages are stored under the time of the last change, so a change (see `touch`)
+    invalidates every page at once. Responses carry an ETag and Last-Modified, and
+    conditional GETs are answered with 304 Not Modified. Requests carrying flash
+    messages, and responses that set cookies, are never cached.
+    """
+
+    @staticmethod
+    def is_cacheable(request) -> bool:
+        return (
+            request.method in ('GET', 'HEAD')
+            and request.resolver_match.url_name in settings.PAGE_CACHE_VIEWS
+            and not request.user.is_authenticated
+            and 'messages' not in request.COOKIES
+        )
+
+    @staticmethod
+    def sets_cookies(request, response) -> bool:
+        """Whether the response sets cookies, itself or through the outer middleware."""
+        messages = getattr(request, '_messages', None)
+        session = getattr(request, 'session', None)
+        return bool(
+            response.cookies
+            or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            or (session is not None and session.modified)
+            or (messages is not None and messages.added_new)
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.is_cacheable(request):
+            return None
+
+        stamp = last_modified()
+        digest = hashlib.md5(f'{request.get_full_path()}:{stamp!r}'.encode()).hexdigest()
+        etag = f'"{digest}"'
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(stamp))
+        if not_modified is not None:
+            return not_modified
+
+        key = f'page-cache:page:{digest}'
+        cached = _cache().get(key)
+        if cached is not None:
+            status, content_type, content = cached
+            response = HttpResponse(content, status=status, content_type=content_type)
+            response['X-Page-Cache'] = 'hit'
+        else:
+            response = view_func(request, *view_args, **view_kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if response.status_code != 200 or response.streaming or self.sets_cookies(request, response):
+                return response
+            _cache().set(key, (response.status_code, response['Content-Type'], response.content),
+                         settings.PAGE_CACHE_TIMEOUT)
+            response['X-Page-Cache'] = 'miss'
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stamp)
+        patch_vary_headers(response, ('Cookie',))
+        return response
@@ -12,6 +12,10 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+
+from accounts.hashers import password_hashers
+from write_and_shine.caches import cache_profile
+from write_and_shine.db import database_profile
 AUTH_USER_MODEL = 'accounts.User'
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,10 +48,14 @@ INSTALLED_APPS = [
     'posts',
     'search',
     'interactions',
-    
+    'benchmarks',
+    'tasks',
+    'uploads',
+    'assets',
 ]
 
 MIDDLEWARE = [
+    'write_and_shine.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,13 +63,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'write_and_shine.page_cache.AnonymousPageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'write_and_shine.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates with render times recorded by InstrumentationMiddleware
+        'BACKEND': 'write_and_shine.instrumentation.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates',
                  BASE_DIR / 'accounts/templates',
                  BASE_DIR / "profiles/templates",
@@ -87,13 +97,81 @@ WSGI_APPLICATION = 'write_and_shine.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Configured from the environment, see write_and_shine/db.py
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_profile(BASE_DIR),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Configured from the environment, see write_and_shine/caches.py. Cards, like sets and pages
+# are invalidated through these caches, so with more than one web or worker process they must
+# be a shared backend (CACHE_BACKEND=redis or memcached); local memory only suits one process.
+CACHES = {
+    'default': cache_profile('CACHE', max_entries=5000),
+    # Rendered feed cards and their version stamps, two entries per post: size it to the posts
+    # that are read, so a pass over the feed does not evict the cards it is about to reuse
+    'post_cards': cache_profile('POST_CARD_CACHE', max_entries=20000),
+}
+
+LIKED_POSTS_CACHE_TIMEOUT = 60 * 15
+
+# Maximum number of tag name -> ID pairs kept in each process's LRU tag cache
+TAG_CACHE_SIZE = 10000
+
+# Viewer-neutral feed cards are cached per post version; a changed post gets a new version
+POST_CARD_CACHE_ALIAS = 'post_cards'
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# The number of posts shown above the feed is cached, and dropped when a post is created or deleted
+POSTS_COUNT_CACHE_TIMEOUT = 60 * 5
+
+# Whole pages of these views are cached for anonymous visitors (see write_and_shine/page_cache.py)
+PAGE_CACHE_ALIAS = 'default'
+PAGE_CACHE_TIMEOUT = 60 * 5
+PAGE_CACHE_VIEWS = ['get_posts', 'get_posts_page', 'get_profile', 'about']
+
+
+# Instrumentation
+# Every request is measured (see write_and_shine/instrumentation.py). A view running more
+# queries than its budget is logged, or, with 'raise' (as in the tests), fails the request.
+
+INSTRUMENTATION_WINDOW = 1000  # Latest requests kept per view for percentiles
+
+QUERY_BUDGETS = {
+    'get_posts': 8,
+    'get_posts_page': 8,
+    'get_profile': 10,
+    'get_comments': 4,
+    'search_post': 8,
+    'like_post': 8,
+    'comment_post': 8,
+    'aget_posts': 8,
+    'asearch_post': 8,
+    'alike_post': 8,
+    'acomment_post': 8,
+    'ahas_user_liked_post': 4,
+}
+
+QUERY_BUDGET_ACTION = os.environ.get('QUERY_BUDGET_ACTION', 'log')
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+# `production` hashes with tuned Argon2 (or scrypt without argon2-cffi); `fast` uses MD5 and is
+# only meant for test and benchmark databases. Logins rehash passwords made by other hashers.
+
+PASSWORD_HASHER_POLICY = os.environ.get('PASSWORD_HASHER_POLICY', 'production')
+
+PASSWORD_HASH_COSTS = {
+    'argon2': {'time_cost': 2, 'memory_cost': 64 * 1024, 'parallelism': 2},  # memory_cost in KiB
+    'scrypt': {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1},
 }
 
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASHER_POLICY)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -130,9 +208,82 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'assets.finders.BundleFinder',
+]
+
+# Per-page CSS and JS bundles, built by `manage.py build_assets` (see assets/). Each lists
+# static paths, concatenated in order. Without ASSETS_BUNDLED the sources are linked one by one.
+
+ASSET_BUNDLES = {
+    'home': {
+        'css': [
+            'css/home.css', 'css/header.css', 'css/footer.css', 'css/like.css', 'css/comment.css',
+            'css/post.css', 'css/search.css', 'css/create_post.css', 'css/edit_post.css',
+        ],
+        'js': ['js/header.js', 'js/search.js', 'js/post.js', 'js/comment.js', 'js/create_post.js'],
+    },
+    'user': {
+        'css': [
+            'css/profile.css', 'css/header.css', 'css/like.css', 'css/comment.css', 'css/post.css',
+            'css/create_post.css', 'css/edit_post.css',
+        ],
+        'js': ['js/header.js', 'js/post.js', 'js/like.js', 'js/comment.js', 'js/create_post.js', 'js/profile.js'],
+    },
+    'about': {
+        'css': ['css/header.css', 'css/about.css', 'css/create_post.css'],
+        'js': ['js/header.js', 'js/create_post.js'],
+    },
+}
+
+ASSETS_BUILD_DIR = BASE_DIR / 'build' / 'assets'
+ASSETS_BUNDLED = not DEBUG
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+# Cache lifetime of media files that are not content-hashed, like the default profile picture
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+STORAGES = {
+    # Uploads are named by content hash and deduplicated (see uploads/storage.py)
+    'default': {'BACKEND': 'uploads.storage.ContentHashedStorage'},
+    # Content-hashed static names (e.g. bundles/home.1a2b3c.css) once collectstatic has run
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+    },
+}
+
+# Square profile picture thumbnails, in px (see profiles/images.py)
+THUMBNAIL_SIZES = (48, 96, 256)
+THUMBNAIL_QUALITY = 80
+
+# Feed pagination
+
+POSTS_PAGE_SIZE = 10
+POSTS_MAX_PAGE_SIZE = 50
+
+# Number of newest comments embedded in each feed card (None embeds all of them)
+FEED_COMMENTS_LIMIT = 3
+# Number of comments returned per "load more comments" request
+COMMENTS_PAGE_SIZE = 10
+
+# Full-text search ('auto' picks FTS5 on SQLite, PostgreSQL's text search on PostgreSQL and the
+# in-process inverted index elsewhere)
+
+SEARCH_ENGINE = 'auto'
+SEARCH_MAX_RESULTS = 100
+
+# Background jobs run after writes (see tasks/). 'thread' runs them in this process; 'database'
+# stores them for `manage.py run_workers` and needs a cache shared between processes; 'immediate'
+# runs them in the caller, as in the tests.
+
+TASKS_BACKEND = os.environ.get('TASKS_BACKEND', 'thread')
+TASKS_THREADS = 4  # Threads of the 'thread' backend
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
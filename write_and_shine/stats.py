@@ -0,0 +1,42 @@
+import math
+import statistics
+
+
+def percentile(samples, pct: float) -> float:
+    """
+    Returns a percentile of the samples, interpolating between the closest ranks.
+
+    Args:
+        samples: The measured values.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 when there are no samples.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples) -> dict:
+    """
+    Summarizes latency samples.
+
+    Args:
+        samples: The measured latencies, in seconds.
+
+    Returns:
+        dict: The count and the mean, p50, p95, p99 and max latencies, in milliseconds.
+    """
+    samples = list(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'max_ms': max(samples, default=0.0) * 1000,
+    }
@@ -0,0 +1,20 @@
+"""
+Settings of the test suite. `manage.py test` uses them by default; other test runners can
+point DJANGO_SETTINGS_MODULE here.
+"""
+
+from accounts.hashers import password_hashers
+from write_and_shine.settings import *  # noqa: F401,F403
+
+# A view running more queries than its budget fails the test
+QUERY_BUDGET_ACTION = 'raise'
+
+# MD5 keeps the many test logins and signups fast
+PASSWORD_HASHER_POLICY = 'fast'
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASHER_POLICY)
+
+# Jobs run in the caller, so their effects are visible when the request returns
+TASKS_BACKEND = 'immediate'
+
+# The tests run in one process, where local memory caches are enough
+SILENCED_SYSTEM_CHECKS = ['posts.W001']
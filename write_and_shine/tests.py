@@ -0,0 +1,237 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from interactions.services import InteractionRepository
+from posts.services import PostRepository
+from posts.tags import tag_cache
+from profiles.models import Profile
+from test_helpers import clear_caches
+from write_and_shine.caches import cache_profile
+from write_and_shine.db import database_profile
+from write_and_shine.instrumentation import QueryBudgetExceeded, view_stats
+from write_and_shine.page_cache import LAST_MODIFIED_KEY
+from write_and_shine.stats import percentile, summarize
+
+User = get_user_model()
+
+
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        """Set up an author with a profile and a post."""
+        clear_caches()
+        tag_cache.clear()
+        self.author = User.objects.create_user(email='author@ws.com', password='passwordTest!', name='Author')
+        Profile.objects.create(user=self.author)
+        self.post = PostRepository.create_post('Cached page', 'Body', self.author, ['Ai'])
+
+    def test_pages_are_cached_for_anonymous_visitors(self):
+        """Test that the feed, a profile and the about page are served from the cache the second time."""
+        for url in (reverse('get_posts'), reverse('get_profile', args=[self.author.id]), reverse('about')):
+            first = self.client.get(url)
+            self.assertEqual(first['X-Page-Cache'], 'miss')
+            self.assertNotIn('csrftoken', first.cookies)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(second['X-Page-Cache'], 'hit')
+            self.assertEqual(second.content, first.content)
+            self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_get(self):
+        """Test that a matching ETag or Last-Modified is answered with 304 Not Modified."""
+        response = self.client.get(reverse('get_posts'))
+        self.assertEqual(self.client.get(reverse('get_posts'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(
+            self.client.get(reverse('get_posts'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    def test_changes_invalidate_pages(self):
+        """Test that comments, likes and profile edits give the pages a new ETag and content."""
+        url = reverse('get_posts')
+        changes = [
+            lambda: InteractionRepository.add_comment(self.author, self.post.id, 'A fresh comment'),
+            lambda: InteractionRepository.toggle_like(self.author, self.post.id),
+            lambda: Profile.objects.get(user=self.author).save(),
+        ]
+        for change in changes:
+            etag = self.client.get(url)['ETag']
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'A fresh comment')
+
+    def test_evicted_stamp_does_not_revive_pages(self):
+        """Test that a stamp evicted after a like restarts later, not at the latest post or comment."""
+        url = reverse('get_posts')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            InteractionRepository.toggle_like(self.author, self.post.id)
+        caches[settings.PAGE_CACHE_ALIAS].delete(LAST_MODIFIED_KEY)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_logged_in_and_flash_message_requests_are_not_cached(self):
+        """Test that pages of logged-in users, or carrying flash messages, bypass the cache."""
+        self.client.cookies['messages'] = 'pending'
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('get_posts')))
+        del self.client.cookies['messages']
+
+        self.client.force_login(self.author)
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('get_posts')))
+
+    def test_file_based_cache(self):
+        """Test that the page cache works with the file-based backend."""
+        with tempfile.TemporaryDirectory() as location:
+            backends = {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'post_cards': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'pages': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+            }
+            with override_settings(CACHES=backends, PAGE_CACHE_ALIAS='pages'):
+                self.assertEqual(self.client.get(reverse('about'))['X-Page-Cache'], 'miss')
+                self.assertEqual(self.client.get(reverse('about'))['X-Page-Cache'], 'hit')
+                caches['pages'].clear()
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_profile(self):
+        """Test that SQLite is the default, tuned with pragmas and immediate transactions."""
+        profile = database_profile(Path('/srv'), {'SQLITE_BUSY_TIMEOUT_MS': '250'})
+        self.assertEqual(profile['NAME'], Path('/srv/db.sqlite3'))
+        self.assertEqual(profile['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA journal_mode=WAL', profile['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA busy_timeout=250', profile['OPTIONS']['init_command'])
+
+    def test_pragmas_are_applied_on_connect(self):
+        """Test that the test database connection runs the configured pragmas."""
+        with connection.cursor() as cursor:
+            self.assertEqual(cursor.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+            self.assertEqual(cursor.execute('PRAGMA busy_timeout').fetchone()[0], 5000)
+
+    def test_postgresql_profile(self):
+        """Test that PostgreSQL uses persistent connections, or the pool when enabled."""
+        environ = {'DB_ENGINE': 'postgresql', 'DB_NAME': 'ws', 'DB_CONN_MAX_AGE': '300'}
+        profile = database_profile(Path('/srv'), environ)
+        self.assertEqual(profile['CONN_MAX_AGE'], 300)
+        self.assertTrue(profile['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('OPTIONS', profile)
+
+        profile = database_profile(Path('/srv'), {**environ, 'DB_POOL': '1'})
+        self.assertEqual(profile['CONN_MAX_AGE'], 0)
+        self.assertEqual(profile['OPTIONS']['pool'], {'min_size': 2, 'max_size': 10})
+
+    def test_unsupported_engine(self):
+        """Test that an unknown engine is rejected."""
+        with self.assertRaises(ValueError):
+            database_profile(Path('/srv'), {'DB_ENGINE': 'oracle'})
+
+
+class CacheProfileTests(SimpleTestCase):
+    def test_local_memory_profile(self):
+        """Test that local memory is the default, sized by the caller or the environment."""
+        profile = cache_profile('POST_CARD_CACHE', max_entries=20000, environ={})
+        self.assertEqual(profile['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertEqual(profile['OPTIONS'], {'MAX_ENTRIES': 20000})
+
+        profile = cache_profile('POST_CARD_CACHE', max_entries=20000, environ={'POST_CARD_CACHE_MAX_ENTRIES': '500'})
+        self.assertEqual(profile['OPTIONS'], {'MAX_ENTRIES': 500})
+
+    def test_shared_profile(self):
+        """Test that a shared backend falls back to the common settings and prefixes its keys."""
+        environ = {'CACHE_BACKEND': 'redis', 'CACHE_LOCATION': 'redis://cache:6379/0'}
+        profile = cache_profile('POST_CARD_CACHE', max_entries=20000, environ=environ)
+        self.assertEqual(profile, {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://cache:6379/0',
+            'KEY_PREFIX': 'post_card_cache',
+        })
+
+        with self.assertRaises(ValueError):
+            cache_profile('CACHE', max_entries=5000, environ={'CACHE_BACKEND': 'disk'})
+
+
+class StatsTests(SimpleTestCase):
+    def test_percentile_interpolates(self):
+        """Test that percentiles interpolate between the closest ranks."""
+        samples = [4, 1, 3, 2]
+        self.assertEqual(percentile(samples, 0), 1)
+        self.assertEqual(percentile(samples, 50), 2.5)
+        self.assertEqual(percentile(samples, 100), 4)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize_in_milliseconds(self):
+        """Test that latencies are summarized in milliseconds."""
+        summary = summarize([0.001, 0.003])
+        self.assertEqual(summary['count'], 2)
+        self.assertAlmostEqual(summary['mean_ms'], 2.0)
+        self.assertAlmostEqual(summary['max_ms'], 3.0)
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        """Set up users with profiles, and posts commented by each of them."""
+        clear_caches()
+        tag_cache.clear()
+        view_stats.clear()
+        self.users = [
+            User.objects.create_user(email=f'user{i}@ws.com', password='passwordTest!', name=f'User {i}')
+            for i in range(4)
+        ]
+        for user in self.users:
+            Profile.objects.create(user=user)
+        for index in range(12):
+            self.post = PostRepository.create_post(f'Post {index}', 'Body', self.users[index % 4], ['Ai'])
+            for user in self.users:
+                InteractionRepository.add_comment(user, self.post.id, 'Comment')
+
+    def test_server_timing_header(self):
+        """Test that responses report their queries, SQL, template and total times."""
+        response = self.client.get(reverse('about'))
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, total;dur=[\d.]+$'
+        )
+        self.assertGreater(view_stats.snapshot()['about']['template_ms']['p50'], 0)
+
+    def test_hot_views_stay_within_budget(self):
+        """Test that the hot views run within their query budgets, which raise under tests."""
+        self.client.force_login(self.users[0])
+        self.client.get(reverse('get_posts'))
+        self.client.get(reverse('get_posts_page'))
+        self.client.get(reverse('get_profile', args=[self.users[1].id]))
+        self.client.get(reverse('get_comments', args=[self.post.id]))
+        self.client.get(reverse('search_post'), {'q': 'post'})
+        self.client.get(reverse('like_post', args=[self.post.id]))
+        self.client.post(reverse('comment_post', args=[self.post.id]), {'body': 'Another'})
+        self.assertEqual(len(view_stats.snapshot()), 7)
+
+    def test_budget_exceeded(self):
+        """Test that exceeding a budget raises, or logs when configured to."""
+        with self.settings(QUERY_BUDGETS={'get_posts': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('get_posts'))
+            with self.settings(QUERY_BUDGET_ACTION='log'), self.assertLogs('write_and_shine.instrumentation'):
+                cache.clear()
+                self.client.get(reverse('get_posts'))
+
+    def test_stats_endpoint_is_for_staff(self):
+        """Test that the rolling stats are only served to staff users."""
+        self.client.get(reverse('get_posts'))
+        self.assertEqual(self.client.get(reverse('instrumentation_stats')).status_code, 302)
+
+        staff = User.objects.create_user(email='staff@ws.com', password='passwordTest!', name='Staff', is_staff=True)
+        self.client.force_login(staff)
+        stats = self.client.get(reverse('instrumentation_stats')).json()
+        self.assertEqual(stats['views']['get_posts']['requests'], 1)
+        self.assertEqual(set(stats['views']['get_posts']['queries']), {'p50', 'p95', 'p99'})
+        self.assertEqual(set(stats['post_card_cache']), {'hits', 'misses', 'hit_rate'})
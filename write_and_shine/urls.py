@@ -15,13 +15,15 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import TemplateView, RedirectView
 from django.conf import settings
-from django.conf.urls.static import static
+from uploads.views import serve_media
+from write_and_shine.instrumentation import instrumentation_stats
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('_stats/', instrumentation_stats, name='instrumentation_stats'),
     path('', RedirectView.as_view(url='posts/', permanent=False), name='home'),
     path('about/', TemplateView.as_view(template_name='about.html'), name='about'),
     path('accounts/', include('accounts.urls')),
@@ -29,4 +31,5 @@ urlpatterns = [
     path('posts/', include('posts.urls')),
     path('', include('search.urls')),
     path('', include('interactions.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', serve_media, name='media'),
+]